@@ -1,34 +1,29 @@
 """
 Smart Resume Enhancer - AI-powered resume improvement tool
 Uses Google Gemini AI to enhance, evaluate, and summarize resumes.
+
+Everything runs inside main(), and the Gemini SDK, PyMuPDF and python-docx
+are only imported when a request first needs them, so a new container
+serves its first page quickly.
 """
 
 import streamlit as st
-import google.generativeai as genai
-import re
-from typing import Dict, List, Optional
+import time
+from typing import Any, Callable, Dict, Optional
 import config
-from resume_utils import extract_resume_text, validate_file_size
-
-# Validate configuration on startup
-is_valid, error_msg = config.validate_config()
-if not is_valid:
-    st.error(error_msg)
-    st.stop()
-
-# Configure Gemini API
-genai.configure(api_key=config.GEMINI_API_KEY)
-
-# Page configuration
-st.set_page_config(
-    page_title="Smart Resume Enhancer",
-    page_icon="📄",
-    layout="centered",
-    initial_sidebar_state="collapsed"
-)
+import jobs
+import metrics
+import resume_ai
+from chunking import chunk_resume
+from memory import get_session_ledger
+from pdf_build import PDFBuildError, get_pdf_builder
+from resume_render import RENDERERS, generate_latex, render
+from resume_utils import file_digest, validate_file_size
+from text_normalize import fingerprint
+from upload_store import get_upload_store
 
 # Custom CSS for better UI
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main-header {
         text-align: center;
@@ -59,298 +54,294 @@ st.markdown("""
         margin: 0.5rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
-
-st.markdown('<h1 class="main-header">📄 Smart Resume Enhancer</h1>', unsafe_allow_html=True)
-st.markdown("---")
+"""
 
 
 # --- Helper Functions ---
 
-def convert_bold_markdown_to_latex(text: str) -> str:
-    """Convert markdown bold syntax to LaTeX bold commands."""
-    text = re.sub(r'\*\*\*(.+?)\*\*\*', r'\\textbf{\1}', text)
-    text = re.sub(r'\*\*(.+?)\*\*', r'\\textbf{\1}', text)
-    return text
-
-
-def escape_latex(text: str) -> str:
-    """Escape special LaTeX characters."""
-    replacements = {
-        '&': r'\&', '%': r'\%', '$': r'\$', '#': r'\#', '_': r'\_',
-        '{': r'\{', '}': r'\}', '~': r'\textasciitilde{}', '^': r'\^{}'
-    }
-    for key, val in replacements.items():
-        text = text.replace(key, val)
-    return text
-
-
-def lines_to_latex_items(text: str) -> str:
-    """Convert text lines to LaTeX itemize format."""
-    lines = text.split('\n')
-    latex_lines = []
-    for line in lines:
-        line = line.strip()
-        if line.startswith('* ') or line.startswith('- '):
-            latex_lines.append(r'  \item ' + line[2:].strip())
-        elif line:
-            latex_lines.append(r'  \item ' + line.strip())
-    return '\n'.join(latex_lines)
-
-
-def process_section_content(text: str, use_list: bool = False) -> str:
-    """Process section content for LaTeX output."""
-    text = convert_bold_markdown_to_latex(text)
-    text = escape_latex(text)
-    if use_list:
-        return lines_to_latex_items(text)
-    return text
-
-
-def section_block(title: str, content: str, use_list: bool = False) -> str:
-    """Generate a LaTeX section block."""
-    body = process_section_content(content, use_list)
-    if use_list:
-        return f"\\section*{{{title}}}\n\\begin{{itemize}}\n{body}\n\\end{{itemize}}\n"
-    else:
-        return f"\\section*{{{title}}}\n{body}\n"
-
-
-def parse_sections(text: str) -> Dict[str, str]:
-    """Parse improved resume text into sections."""
-    sections = {section: "No relevant data found" for section in config.RESUME_SECTIONS}
-    current_section = None
-    collected = []
-
-    for line in text.split('\n'):
-        line = line.strip()
-        if not line:
-            continue
-        
-        # Check if line is a section heading
-        if any(heading.lower() in line.lower() for heading in sections):
-            if current_section and collected:
-                sections[current_section] = '\n'.join(collected)
-                collected = []
-            for key in sections:
-                if key.lower() in line.lower():
-                    current_section = key
-                    break
-        elif current_section:
-            collected.append(line)
-
-    if current_section and collected:
-        sections[current_section] = '\n'.join(collected)
-
-    return sections
-
-
-@st.cache_data(show_spinner=False)
-def get_quality_scores(text: str) -> Dict[str, int]:
+def wait_for_job(job_id: str, label: str, on_progress: Optional[Callable[[jobs.Job], None]] = None) -> Optional[jobs.Job]:
     """
-    Evaluate resume quality using AI.
-    Cached to avoid redundant API calls.
+    Show a background job's progress until it finishes.
+    A rerun only abandons this loop; the job keeps running in the worker pool
+    and the next run picks it up again by id.
     """
-    try:
-        model = genai.GenerativeModel(config.GEMINI_MODEL)
-        prompt = (
-            "Evaluate the following resume based on these 5 criteria. "
-            "Return ONLY scores (0 to 100) for each in this exact format:\n\n"
-            "Grammar & Spelling: [score]\n"
-            "Clarity & Conciseness: [score]\n"
-            "Structure & Formatting: [score]\n"
-            "Keyword Optimization: [score]\n"
-            "Completeness of Sections: [score]\n\n"
-            "Resume:\n" + text
-        )
-        response = model.generate_content(prompt).text
-
-        scores = {}
-        for line in response.splitlines():
-            parts = line.split(":")
-            if len(parts) == 2:
-                label = parts[0].strip()
-                try:
-                    score = int(parts[1].strip().replace('%', '').split()[0])
-                    scores[label] = max(0, min(score, 100))
-                except:
-                    pass
-        return scores
-    except Exception as e:
-        st.error(f"Failed to get quality scores: {str(e)}")
-        return {}
-
-
-def parse_corrections(text: str) -> List[str]:
-    """Extract corrections from AI response."""
-    lines = text.split('\n')
-    corrections = []
-    capture = False
-    
-    for line in lines:
-        if "corrections" in line.lower() or "changes" in line.lower():
-            capture = True
-            continue
-        if capture:
-            if line.startswith("-") or line.startswith("*") or line.startswith("•"):
-                corrections.append(line.lstrip("-*• ").strip())
-            elif line.strip() == "":
-                if corrections:  # Stop if we have corrections and hit empty line
-                    break
-            elif line.strip():
-                corrections.append(line.strip())
-    
-    return corrections if corrections else ["General improvements applied to grammar, structure, and clarity"]
+    queue = jobs.get_job_queue()
+    bar = st.empty()
+    while True:
+        job = queue.get(job_id)
+        if job is None or job.finished:
+            bar.empty()
+            return job
+        bar.progress(job.progress, text=f"{label} ({job.message})")
+        if on_progress:
+            on_progress(job)
+        time.sleep(config.JOB_POLL_SECONDS)
+
+
+def stage_job(resume_text: str, stage: str, clicked: bool) -> Optional[jobs.Job]:
+    """
+    Submit a stage when its button was clicked, and return the stage's job
+    for this text if one was ever submitted (so earlier results survive reruns).
+    Prefetched jobs only show once their button is clicked.
+    """
+    queue = jobs.get_job_queue()
+    if clicked:
+        queue.submit_text(resume_text, [stage], tenant=session_id())
+    job = queue.find_text(resume_text, [stage])
+    return None if job is None or job.prefetched else job
 
 
-@st.cache_data(show_spinner=False)
-def get_resume_summary(text: str) -> str:
+def prefetch(resume_text: str) -> None:
     """
-    Generate AI summary of resume.
-    Cached to avoid redundant API calls.
+    Start the PREFETCH_STAGES jobs in the background once per resume, so the
+    tab buttons usually find their result ready.
     """
-    try:
-        model = genai.GenerativeModel(config.GEMINI_MODEL)
-        prompt = (
-            "Summarize the following resume in 2-3 concise paragraphs. "
-            "Highlight key skills, experience, education, and notable achievements. "
-            "Be specific and professional:\n\n" + text
-        )
-        response = model.generate_content(prompt).text
-        return response.strip()
-    except Exception as e:
-        st.error(f"Failed to generate summary: {str(e)}")
-        return ""
-
-
-@st.cache_data(show_spinner=False)
-def enhance_resume(resume_text: str) -> tuple[str, List[str]]:
+    if not config.PREFETCH:
+        return
+    key = fingerprint(resume_text)
+    if st.session_state.get("prefetched") != key:
+        st.session_state["prefetched"] = key
+        jobs.get_job_queue().prefetch(resume_text, config.PREFETCH_STAGES, tenant=session_id())
+
+
+def job_result(job: jobs.Job, stage: str, label: str,
+               on_progress: Optional[Callable[[jobs.Job], None]] = None) -> Optional[Any]:
+    """Wait for a stage job and return its result, showing an error if it failed."""
+    if not job.finished:
+        job = wait_for_job(job.id, label, on_progress)
+    if job is None:
+        st.error("❌ This result has expired, please run it again.")
+        return None
+    if job.status == jobs.ERROR:
+        st.error(f"❌ {job.error}")
+        return None
+    return job.result.get(stage)
+
+
+def section_view() -> Callable[[Dict[str, str]], None]:
+    """Placeholders that render enhanced sections as they arrive."""
+    st.markdown("### 📄 Enhanced Sections")
+    placeholders = {name: st.empty() for name in config.RESUME_SECTIONS}
+
+    def show(sections: Dict[str, str]) -> None:
+        for name, content in sections.items():
+            if name in placeholders and content != resume_ai.NO_DATA:
+                placeholders[name].markdown(f"**{name}**\n\n{content}")
+
+    return show
+
+
+def upload_digest(uploaded_file: Any) -> str:
     """
-    Enhance resume using AI.
-    Cached to avoid redundant API calls.
+    Hash of the uploaded bytes, computed once per upload instead of on every
+    rerun. Only the current upload's hash is kept in the session.
     """
-    try:
-        model = genai.GenerativeModel(config.GEMINI_MODEL)
-        prompt = (
-            "You are an expert resume writer. Enhance the following resume by:\n"
-            "1. Fixing all grammar and spelling errors\n"
-            "2. Improving clarity and conciseness\n"
-            "3. Enhancing word choice and professional tone\n"
-            "4. Optimizing structure and formatting\n"
-            "5. Adding impactful action verbs where appropriate\n\n"
-            "Return your response in this EXACT format:\n\n"
-            "IMPROVED RESUME:\n"
-            "[Enhanced resume organized into sections: Objective, Education, Experience, Skills, Projects, Certifications, Extracurricular Activities, Declaration]\n\n"
-            "CORRECTIONS MADE:\n"
-            "- Correction 1\n"
-            "- Correction 2\n"
-            "...\n\n"
-            "Original Resume:\n" + resume_text
-        )
-        
-        response = model.generate_content(prompt)
-        response_text = response.text
-
-        # Parse response
-        if "CORRECTIONS" in response_text.upper():
-            parts = re.split(r'CORRECTIONS?\s*(?:MADE)?:', response_text, flags=re.IGNORECASE)
-            improved_resume = parts[0].replace("IMPROVED RESUME:", "").strip()
-            corrections_text = parts[1].strip() if len(parts) > 1 else ""
-        else:
-            improved_resume = response_text.strip()
-            corrections_text = ""
-
-        sections = parse_sections(improved_resume)
-        corrections = parse_corrections(corrections_text)
-
-        return sections, corrections
-    except Exception as e:
-        st.error(f"Failed to enhance resume: {str(e)}")
-        return {}, []
-
-
-def generate_latex(sections: Dict[str, str]) -> str:
-    """Generate LaTeX document from sections."""
-    latex_code = (
-        "\\documentclass[11pt]{article}\n"
-        "\\usepackage[margin=0.75in]{geometry}\n"
-        "\\usepackage[utf8]{inputenc}\n"
-        "\\usepackage{enumitem}\n"
-        "\\usepackage{titlesec}\n"
-        "\\usepackage{hyperref}\n"
-        "\\titleformat{\\section}{\\large\\bfseries}{}{0em}{}\n"
-        "\\setlist[itemize]{leftmargin=*, itemsep=2pt}\n\n"
-        "\\title{\\textbf{Enhanced Resume}}\n"
-        "\\author{}\n"
-        "\\date{}\n\n"
-        "\\begin{document}\n"
-        "\\maketitle\n\n"
-    )
-    
-    # Add sections
-    latex_code += section_block("Objective", sections.get("Objective", ""), use_list=False)
-    latex_code += section_block("Education", sections.get("Education", ""), use_list=True)
-    latex_code += section_block("Experience", sections.get("Experience", ""), use_list=True)
-    latex_code += section_block("Skills", sections.get("Skills", ""), use_list=True)
-    latex_code += section_block("Projects", sections.get("Projects", ""), use_list=True)
-    latex_code += section_block("Certifications", sections.get("Certifications", ""), use_list=True)
-    latex_code += section_block("Extracurricular Activities", sections.get("Extracurricular Activities", ""), use_list=True)
-    latex_code += section_block("Declaration", sections.get("Declaration", ""), use_list=False)
-    latex_code += "\\end{document}"
-    
-    return latex_code
+    cached = st.session_state.get("upload_digest")
+    if not cached or cached[0] != uploaded_file.file_id:
+        cached = st.session_state["upload_digest"] = (uploaded_file.file_id, file_digest(uploaded_file))
+    return cached[1]
 
 
-def generate_markdown(sections: Dict[str, str]) -> str:
-    """Generate Markdown document from sections."""
-    markdown = "# Enhanced Resume\n\n"
-    
-    for section_name in config.RESUME_SECTIONS:
-        content = sections.get(section_name, "")
-        if content and content != "No relevant data found":
-            markdown += f"## {section_name}\n\n{content}\n\n"
-    
-    return markdown
+def session_id() -> str:
+    """Id of the current browser session, for memory accounting."""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else "local"
+
+
+def release_upload() -> None:
+    """
+    Drop the uploader's copy of the file once its text is stored.
+
+    The text stays reachable through the file hash in session_state. Rendering the
+    uploader under a new key makes Streamlit discard the old widget and the
+    bytes it holds.
+    """
+    st.session_state["upload_generation"] = st.session_state.get("upload_generation", 0) + 1
+    st.session_state.pop("upload_digest", None)
+    get_session_ledger().release(session_id(), "upload")
+    st.rerun()
 
 
 # --- Main UI ---
 
-st.markdown("### 📤 Upload Your Resume")
-uploaded_file = st.file_uploader(
-    "Choose a PDF or DOCX file",
-    type=config.SUPPORTED_FORMATS,
-    help=f"Maximum file size: {config.MAX_FILE_SIZE_MB}MB"
-)
-
-if uploaded_file:
-    # Validate file size
-    is_valid_size, size_error = validate_file_size(uploaded_file, config.MAX_FILE_SIZE_BYTES)
-    if not is_valid_size:
-        st.error(size_error)
-        st.stop()
+def load_resume() -> Optional[str]:
+    """Upload and extract a resume, showing file info; returns its text once available."""
+    st.markdown("### 📤 Upload Your Resume")
+    uploaded_file = st.file_uploader(
+        "Choose a PDF or DOCX file",
+        type=config.SUPPORTED_FORMATS,
+        help=f"Maximum file size: {config.MAX_FILE_SIZE_MB}MB",
+        key=f"resume_upload_{st.session_state.get('upload_generation', 0)}"
+    )
+    ledger = get_session_ledger()
+
+    if uploaded_file:
+        # Validate file size
+        is_valid_size, size_error = validate_file_size(uploaded_file, config.MAX_FILE_SIZE_BYTES)
+        if not is_valid_size:
+            st.error(size_error)
+            st.stop()
     
-    # Extract text
-    with st.spinner("📖 Reading your resume..."):
-        resume_text = extract_resume_text(uploaded_file, uploaded_file.name)
+        # The file hash is kept in session_state (not the URL, which would hand
+        # the resume to anyone the link is shared with), so reruns after the
+        # uploader is cleared still find the extracted text
+        digest = upload_digest(uploaded_file)
+        ledger.record(session_id(), "upload", uploaded_file.size)
+        if st.session_state.get("resume_digest") != digest:
+            metrics.UPLOAD_BYTES.observe(uploaded_file.size)
+            st.session_state["resume_digest"] = digest
+    else:
+        digest = st.session_state.get("resume_digest")
+
+    if digest:
+        # Reruns and repeat uploads are a lookup by file hash; only new files are extracted
+        upload = get_upload_store().get(digest)
+        # After release_upload() the fresh extraction is found in the store too
+        reused = upload is not None and st.session_state.get("extracted_digest") != digest
+        if upload is None and uploaded_file:
+            job_id = jobs.get_job_queue().submit_file(uploaded_file.getvalue(), uploaded_file.name)
+            extract_job = wait_for_job(job_id, "📖 Reading your resume...")
+            if extract_job is None or extract_job.status == jobs.ERROR:
+                error = extract_job.error if extract_job else "Extraction was interrupted, please upload again"
+                st.error(f"❌ {error}")
+                st.stop()
+            upload = extract_job.result
+            st.session_state["extracted_digest"] = digest
+        elif upload is None:
+            del st.session_state["resume_digest"]
+            st.info("👆 This resume is no longer stored, please upload it again")
+            st.stop()
     
-    if not resume_text:
-        st.stop()
+        if uploaded_file and config.RELEASE_UPLOADS:
+            release_upload()
+
+        resume_text = upload["text"]
+        normalization = upload["normalization"]
+        ledger.record(session_id(), "resume_text", len(resume_text))
     
-    # Show file info
-    st.success(f"✅ Successfully loaded **{uploaded_file.name}** ({len(resume_text)} characters)")
+        # Show file info
+        filename = uploaded_file.name if uploaded_file else upload["filename"]
+        st.success(f"✅ Successfully loaded **{filename}** ({len(resume_text)} characters)")
+        if reused:
+            st.caption(f"♻️ Reused the earlier extraction of this file (saved {upload['extract_seconds']:.2f}s)")
+        if normalization["chars_saved"] > 0:
+            st.caption(
+                f"🧹 Cleanup removed {normalization['chars_saved']} characters "
+                f"(~{normalization['tokens_saved']} tokens per AI request)"
+            )
+        if upload["truncated"]:
+            st.warning(
+                f"⚠️ This resume is longer than {config.MAX_RESUME_TOKENS} tokens; "
+                "only the first part will be analyzed."
+            )
+        chunk_count = len(chunk_resume(resume_text))
+        if chunk_count > 1:
+            st.caption(f"📚 Long resume: enhancement runs in {chunk_count} parallel chunks")
     
-    st.markdown("---")
+        return resume_text
+    return None
+
+
+def show_downloads(sections: Dict[str, str], key: str) -> None:
+    """Download buttons for enhanced sections, one per registered output format."""
+    st.markdown("### 📥 Download Options")
+    columns = st.columns(2)
+    for index, renderer in enumerate(RENDERERS.values()):
+        with columns[index % 2]:
+            st.download_button(
+                f"Download {renderer.label} (.{renderer.extension})",
+                render(sections, renderer.name),
+                file_name=f"enhanced_resume.{renderer.extension}",
+                mime=renderer.mime,
+                use_container_width=True,
+                key=f"{key}_{renderer.name}"
+            )
+
+    builder = get_pdf_builder()
+    if builder:
+        try:
+            with st.spinner("🖨️ Compiling PDF..."):
+                pdf_bytes = builder.build(generate_latex(sections))
+            st.download_button(
+                "📕 Download PDF (.pdf)",
+                pdf_bytes,
+                file_name="enhanced_resume.pdf",
+                mime="application/pdf",
+                type="primary",
+                use_container_width=True,
+                key=f"{key}_pdf"
+            )
+        except PDFBuildError as e:
+            st.warning(f"PDF build failed, download the LaTeX instead: {e}")
+    else:
+        st.info("💡 **Tip:** Use [Overleaf](https://www.overleaf.com) to compile your LaTeX resume to PDF")
+
+
+def show_revision(revision: Dict[str, Any]) -> None:
+    """Sections from an incremental run, each with its changes."""
+    sent, reused = revision["enhanced"], revision["reused"]
+    st.caption(f"🔁 Re-enhanced {len(sent)} section(s); reused {len(reused)} unchanged section(s)")
+    for name, content in revision["sections"].items():
+        if content == resume_ai.NO_DATA:
+            continue
+        st.markdown(f"**{name}**{' (updated)' if name in sent else ''}\n\n{content}")
+        for change in revision["diffs"].get(name, []):
+            before = f"~~{change['before']}~~" if change["before"] else ""
+            after = f"**{change['after']}**" if change["after"] else ""
+            st.caption(" → ".join(part for part in (before, after) if part))
+    show_downloads(revision["sections"], "revised")
+
+
+def revise_sections(resume_text: str) -> None:
+    """Edit the original sections and re-enhance only the ones that changed."""
+    original = resume_ai.parse_sections(resume_text)
+    present = {name: content for name, content in original.items() if content != resume_ai.NO_DATA}
+    if not present:
+        return
+    with st.expander("✏️ Edit sections and enhance again"):
+        st.caption("Only the sections you change are sent to the AI again; the others are reused.")
+        edited = {name: st.text_area(name, content, key=f"edit_{name}") for name, content in present.items()}
+        edited_text = "\n\n".join(f"{name}\n{content}" for name, content in edited.items() if content.strip())
+        clicked = st.button("🔁 Enhance Changed Sections", use_container_width=True)
+        job = stage_job(edited_text, "incremental", clicked)
+        if job:
+            revision = job_result(job, "incremental", "🤖 AI is enhancing the changed sections...")
+            if revision:
+                show_revision(revision)
+
+
+def show_results(resume_text: str) -> None:
+    """Analyze button and the enhance, quality and summary tabs."""
+    # One combined request fills all three tabs
+    clicked = st.button("⚡ Analyze Everything (one request)", use_container_width=True)
+    analysis_job = stage_job(resume_text, "analysis", clicked)
+    analysis = None
+    if analysis_job:
+        analysis = job_result(analysis_job, "analysis", "🤖 AI is enhancing, scoring and summarizing your resume...")
     
     # Tabbed interface
-    tab1, tab2, tab3 = st.tabs(["🚀 Enhance Resume", "📊 Quality Analysis", "📝 Quick Summary"])
+    tab1, tab2, tab3, tab4 = st.tabs(["🚀 Enhance Resume", "📊 Quality Analysis", "📝 Quick Summary", "🎯 Job Match"])
     
     with tab1:
         st.markdown("### ✨ AI-Powered Resume Enhancement")
         st.info("Click the button below to improve your resume with AI suggestions")
         
-        if st.button("🎯 Enhance My Resume", type="primary", use_container_width=True):
-            with st.spinner("🤖 AI is analyzing and enhancing your resume..."):
-                sections, corrections = enhance_resume(resume_text)
+        clicked = st.button("🎯 Enhance My Resume", type="primary", use_container_width=True)
+        job = None if analysis else stage_job(resume_text, "enhance", clicked)
+        if analysis or job:
+            show_sections = section_view() if config.STREAM_ENHANCEMENT else None
+            if analysis:
+                sections, corrections = analysis["sections"], analysis["corrections"]
+            else:
+                on_progress = None
+                if show_sections:
+                    on_progress = lambda running: show_sections(running.result.get("partial_sections", {}))
+                enhancement = job_result(job, "enhance", "🤖 AI is enhancing your resume...", on_progress) or {}
+                sections, corrections = enhancement.get("sections", {}), enhancement.get("corrections", [])
+            if show_sections:
+                show_sections(sections)
             
             if sections and corrections:
                 st.success("✅ Resume enhanced successfully!")
@@ -362,41 +353,23 @@ if uploaded_file:
                 
                 st.markdown("---")
                 
-                # Generate outputs
-                latex_code = generate_latex(sections)
-                markdown_code = generate_markdown(sections)
-                
-                # Download options
-                st.markdown("### 📥 Download Options")
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.download_button(
-                        "📄 Download LaTeX (.tex)",
-                        latex_code,
-                        file_name="enhanced_resume.tex",
-                        mime="text/plain",
-                        use_container_width=True
-                    )
-                
-                with col2:
-                    st.download_button(
-                        "📝 Download Markdown (.md)",
-                        markdown_code,
-                        file_name="enhanced_resume.md",
-                        mime="text/markdown",
-                        use_container_width=True
-                    )
+                # Download options, one per registered output format
+                show_downloads(sections, "enhanced")
                 
-                st.info("💡 **Tip:** Use [Overleaf](https://www.overleaf.com) to compile your LaTeX resume to PDF")
+                st.markdown("---")
+                revise_sections(resume_text)
     
     with tab2:
         st.markdown("### 📊 Resume Quality Evaluation")
         st.info("Get detailed quality metrics for your resume")
         
-        if st.button("📈 Analyze Quality", type="primary", use_container_width=True):
-            with st.spinner("🔍 Analyzing resume quality..."):
-                quality_scores = get_quality_scores(resume_text)
+        clicked = st.button("📈 Analyze Quality", type="primary", use_container_width=True)
+        job = None if analysis else stage_job(resume_text, "scores", clicked)
+        if analysis or job:
+            if analysis:
+                quality_scores = analysis["scores"]
+            else:
+                quality_scores = job_result(job, "scores", "🔍 Analyzing resume quality...")
             
             if quality_scores:
                 st.markdown("### 📊 Quality Metrics")
@@ -427,9 +400,13 @@ if uploaded_file:
         st.markdown("### 📝 AI-Generated Summary")
         st.info("Get a concise professional summary of your resume")
         
-        if st.button("✍️ Generate Summary", type="primary", use_container_width=True):
-            with st.spinner("✨ Generating summary..."):
-                summary = get_resume_summary(resume_text)
+        clicked = st.button("✍️ Generate Summary", type="primary", use_container_width=True)
+        job = None if analysis else stage_job(resume_text, "summary", clicked)
+        if analysis or job:
+            if analysis:
+                summary = analysis["summary"]
+            else:
+                summary = job_result(job, "summary", "✨ Generating summary...")
             
             if summary:
                 st.markdown("### 📄 Resume Summary")
@@ -442,7 +419,47 @@ if uploaded_file:
                     mime="text/plain"
                 )
 
-else:
+    with tab4:
+        st.markdown("### 🎯 Job Description Match")
+        st.info("Paste a job description to see how well your resume matches it (no AI request needed)")
+
+        jd_text = st.text_area("Job description", height=200)
+        get_session_ledger().record(session_id(), "job_description", len(jd_text))
+        if jd_text.strip():
+            from matching import get_match_index  # NumPy/SciPy load only when matching is used
+
+            index = get_match_index()
+            doc_id = fingerprint(resume_text)
+            if doc_id not in index:
+                index.add(doc_id, resume_text)
+            try:
+                score = index.score_doc(doc_id, jd_text)
+            except KeyError:  # evicted by other sessions' resumes since the check above
+                index.add(doc_id, resume_text)
+                score = index.score_doc(doc_id, jd_text)
+            gap = index.keyword_gap(resume_text, jd_text)
+
+            st.metric("Match Score", f"{score * 100:.0f}%")
+            if gap.missing:
+                st.markdown("### 🔑 Missing Keywords")
+                st.markdown(", ".join(f"`{keyword}`" for keyword in gap.missing))
+            else:
+                st.success("✅ Your resume covers all of the job's key terms")
+
+            # Keywords the resume has, but not in every section where they would help
+            elsewhere = {
+                section: [keyword for keyword in missing if keyword not in gap.missing]
+                for section, missing in gap.by_section.items()
+            }
+            if any(elsewhere.values()):
+                with st.expander("Keywords missing from individual sections"):
+                    for section, keywords in elsewhere.items():
+                        if keywords:
+                            st.markdown(f"**{section}:** {', '.join(keywords)}")
+
+
+def show_help() -> None:
+    """Shown until a resume is uploaded."""
     st.info("👆 Please upload a resume (PDF or DOCX) to get started")
     
     # Help section
@@ -455,15 +472,50 @@ else:
            - **Quick Summary**: Generate a professional summary
         3. Download your enhanced resume in LaTeX or Markdown format
         
-        **Note:** All processing happens securely. Your resume is not stored.
+        **Note:** All processing happens securely. Results are kept on this server only so you can refresh the page, and expire automatically.
         """)
 
-# Footer
-st.markdown("---")
-st.markdown(
-    "<div style='text-align: center; color: #666;'>"
-    "Powered by Google Gemini AI | "
-    "<a href='https://github.com/chukkaladhanya/resume-enhancer' target='_blank'>View on GitHub</a>"
-    "</div>",
-    unsafe_allow_html=True
-)
+
+def main() -> None:
+    """Render the page; Streamlit runs this on every interaction."""
+    # Validate configuration on startup
+    is_valid, error_msg = config.validate_config()
+    if not is_valid:
+        st.error(error_msg)
+        st.stop()
+    
+    # Local /metrics endpoint (no-op unless METRICS_PORT is set; started once per process)
+    metrics.start_metrics_server()
+    
+    # Page configuration
+    st.set_page_config(
+        page_title="Smart Resume Enhancer",
+        page_icon="📄",
+        layout="centered",
+        initial_sidebar_state="collapsed"
+    )
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+    st.markdown('<h1 class="main-header">📄 Smart Resume Enhancer</h1>', unsafe_allow_html=True)
+    st.markdown("---")
+    
+    resume_text = load_resume()
+    if resume_text:
+        prefetch(resume_text)
+        st.markdown("---")
+        show_results(resume_text)
+    else:
+        show_help()
+    
+    # Footer
+    st.markdown("---")
+    st.markdown(
+        "<div style='text-align: center; color: #666;'>"
+        "Powered by Google Gemini AI | "
+        "<a href='https://github.com/chukkaladhanya/resume-enhancer' target='_blank'>View on GitHub</a>"
+        "</div>",
+        unsafe_allow_html=True
+    )
+
+
+if __name__ == "__main__":
+    main()
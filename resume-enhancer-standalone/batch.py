@@ -0,0 +1,361 @@
+"""
+Headless batch driver for Resume Enhancer.
+Extracts text from many resumes across a process pool, runs the Gemini stages
+with bounded concurrency, and appends one JSON record per resume to a JSONL file.
+
+Usage:
+    python batch.py resumes/ --output results.jsonl
+    python batch.py manifest.txt --output results.jsonl --stages enhance,scores
+    python batch.py resumes/ --bulk --output results.jsonl
+    python resume_model.py export results.jsonl corpus.parquet
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import IO, Dict, Iterable, List, Optional, Set, Tuple
+
+import config
+import metrics
+import resume_ai
+from chunking import apply_token_budget
+from response_cache import get_response_cache
+from resume_model import parse_contact
+from resume_utils import extract_text_from_docx, extract_text_from_pdf, file_digest
+from scheduler import BATCH, request_context
+from text_normalize import normalize_resume_text
+from upload_store import get_upload_store, make_record
+
+STAGES: List[str] = ["enhance", "scores", "summary"]
+
+
+# --- Input Discovery ---
+
+def _is_supported(path: str) -> bool:
+    """Check whether a path has a supported resume extension."""
+    return path.rsplit('.', 1)[-1].lower() in config.SUPPORTED_FORMATS
+
+
+def discover_inputs(sources: Iterable[str]) -> List[str]:
+    """
+    Expand directories and manifest files into a sorted list of resume paths.
+
+    Args:
+        sources: Directories (scanned recursively), resume files, or manifest
+            files listing one resume path per line
+
+    Returns:
+        list: Absolute paths of supported resume files, without duplicates
+    """
+    found: Set[str] = set()
+    for source in sources:
+        if os.path.isdir(source):
+            for root, _, files in os.walk(source):
+                for name in files:
+                    if _is_supported(name):
+                        found.add(os.path.abspath(os.path.join(root, name)))
+        elif _is_supported(source):
+            found.add(os.path.abspath(source))
+        else:
+            base = os.path.dirname(os.path.abspath(source))
+            with open(source, encoding="utf-8") as manifest:
+                for line in manifest:
+                    line = line.strip()
+                    if line and not line.startswith("#") and _is_supported(line):
+                        found.add(os.path.abspath(os.path.join(base, line)))
+    return sorted(found)
+
+
+# --- Checkpointing ---
+
+def load_checkpoint(path: str) -> Set[str]:
+    """Return the set of resume paths already recorded as finished."""
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+# --- Pipeline Stages ---
+
+def extract_file(path: str) -> Tuple[str, Optional[str], Optional[str], Dict]:
+    """
+    Extract and normalize text from a resume on disk. Runs inside a worker process.
+
+    Files whose bytes were extracted before (by the app or an earlier batch)
+    are read from the upload store instead.
+
+    Returns:
+        tuple: (path, text, error, normalization stats) where exactly one of
+            text/error is set
+    """
+    started = time.perf_counter()
+    try:
+        if os.path.getsize(path) > config.MAX_FILE_SIZE_BYTES:
+            return path, None, f"File exceeds limit of {config.MAX_FILE_SIZE_MB}MB", {}
+        with open(path, "rb") as f:
+            data = io.BytesIO(f.read())
+        store = get_upload_store()
+        digest = file_digest(data)
+        stored = store.get(digest)
+        if stored is not None:
+            stats = dict(stored["normalization"], extract_seconds=round(time.perf_counter() - started, 4),
+                         extract_seconds_saved=stored["extract_seconds"])
+            return path, stored["text"], None, stats
+        if path.lower().endswith(".pdf"):
+            # Already inside a pool worker, so don't fan pages out again
+            raw = extract_text_from_pdf(data, workers=1)
+        else:
+            raw = extract_text_from_docx(data)
+        normalized = normalize_resume_text(raw)
+        text, truncated = apply_token_budget(normalized.text)
+        record = make_record(os.path.basename(path), normalized, text, truncated,
+                             time.perf_counter() - started)
+        store.put(digest, len(data.getbuffer()), record)
+        return path, text, None, dict(record["normalization"], extract_seconds=record["extract_seconds"])
+    except Exception as e:
+        return path, None, str(e), {}
+
+
+async def analyze_text(path: str, text: str, stages: List[str], combined: bool = False,
+                       enhancement: Optional[Tuple[Dict[str, str], List[str]]] = None) -> Dict:
+    """
+    Run the requested Gemini stages for one resume, concurrently.
+
+    Args:
+        path: Resume path, recorded in the output
+        text: Extracted resume text
+        stages: Stages to include in the record
+        combined: Use one structured request for all stages instead of one each
+        enhancement: (sections, corrections) already obtained elsewhere (bulk
+            mode); the enhance stage then makes no request
+
+    Returns:
+        dict: JSONL record for the resume
+    """
+    record: Dict = {"file": path, "characters": len(text), "status": "ok",
+                    "contact": asdict(parse_contact(text))}
+    started = time.perf_counter()
+    try:
+        if enhancement is not None:
+            calls = {
+                "scores": resume_ai.get_quality_scores_async,
+                "summary": resume_ai.get_resume_summary_async,
+            }
+            remaining = [stage for stage in stages if stage in calls]
+            values = await asyncio.gather(*(calls[stage](text) for stage in remaining))
+            results = dict(zip(remaining, values), enhance=enhancement)
+        elif combined:
+            analysis = await resume_ai.analyze_resume_async(text)
+            results = {
+                "enhance": (analysis.sections, analysis.corrections),
+                "scores": analysis.scores,
+                "summary": analysis.summary,
+            }
+        else:
+            calls = {
+                "enhance": resume_ai.enhance_resume_async,
+                "scores": resume_ai.get_quality_scores_async,
+                "summary": resume_ai.get_resume_summary_async,
+            }
+            values = await asyncio.gather(*(calls[stage](text) for stage in stages))
+            results = dict(zip(stages, values))
+        if "enhance" in stages:
+            record["sections"], record["corrections"] = results["enhance"]
+        if "scores" in stages:
+            record["scores"] = results["scores"]
+        if "summary" in stages:
+            record["summary"] = results["summary"]
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = str(e)
+    record["llm_seconds"] = round(time.perf_counter() - started, 3)
+    return record
+
+
+async def _run_batch(
+    pending: List[str],
+    out: IO[str],
+    ckpt: IO[str],
+    stats: Dict[str, int],
+    stages: List[str],
+    extract_workers: int,
+    llm_concurrency: int,
+    combined: bool,
+    bulk: bool = False,
+) -> None:
+    """
+    Extract in a process pool and analyze on the event loop, writing records as they finish.
+
+    In bulk mode every resume is extracted first, then enhanced with packed
+    requests (see bulk.py) before the remaining stages run per resume.
+    """
+    loop = asyncio.get_running_loop()
+    llm_slots = asyncio.Semaphore(llm_concurrency)
+    extracted: List[Tuple[str, str, Dict]] = []
+
+    def write(record: Dict) -> None:
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+        if record["status"] == "ok":
+            ckpt.write(record["file"] + "\n")
+            ckpt.flush()
+            stats["processed"] += 1
+        else:
+            stats["failed"] += 1
+        print(f"[{record['status']}] {record['file']}", file=sys.stderr)
+
+    with ProcessPoolExecutor(max_workers=extract_workers) as extract_pool:
+
+        async def process(path: str) -> None:
+            path, text, error, normalization = await loop.run_in_executor(
+                extract_pool, extract_file, path
+            )
+            if error is not None:
+                metrics.STAGE_ERRORS.inc(stage="extract", error="ExtractionError")
+                write({"file": path, "status": "error", "error": error})
+                return
+            # Extraction ran in another process, so its registry is not ours
+            metrics.STAGE_SECONDS.observe(normalization["extract_seconds"], stage="extract")
+            if "extract_seconds_saved" in normalization:
+                metrics.CACHE_LOOKUPS.inc(kind="upload", result="hit")
+                metrics.EXTRACT_SECONDS_SAVED.inc(normalization["extract_seconds_saved"])
+                stats["reused_uploads"] += 1
+            if bulk:
+                extracted.append((path, text, normalization))
+                return
+            async with llm_slots:
+                with metrics.span("resume", file=path, fingerprint=normalization["fingerprint"]):
+                    record = await analyze_text(path, text, stages, combined)
+            record["normalization"] = normalization
+            write(record)
+
+        await asyncio.gather(*(process(p) for p in pending))
+
+    if not bulk or not extracted:
+        return
+    from bulk import enhance_many_async
+
+    enhanced = None
+    if "enhance" in stages:
+        enhanced = await enhance_many_async({path: text for path, text, _ in extracted},
+                                            concurrency=llm_concurrency)
+        stats["bulk"] = enhanced.stats
+
+    async def finish(path: str, text: str, normalization: Dict) -> None:
+        if enhanced is not None and path in enhanced.errors:
+            record = {"file": path, "characters": len(text), "status": "error", "error": enhanced.errors[path]}
+        else:
+            async with llm_slots:
+                with metrics.span("resume", file=path, fingerprint=normalization["fingerprint"]):
+                    record = await analyze_text(path, text, stages,
+                                                enhancement=enhanced.results[path] if enhanced else None)
+        record["normalization"] = normalization
+        write(record)
+
+    await asyncio.gather(*(finish(*item) for item in extracted))
+
+
+def run_batch(
+    paths: List[str],
+    output_path: str,
+    checkpoint_path: str,
+    stages: List[str],
+    extract_workers: int,
+    llm_concurrency: int,
+    combined: bool = False,
+    bulk: bool = False,
+    tenant: str = "batch",
+) -> Dict[str, int]:
+    """
+    Process resumes and append results to the output JSONL file.
+
+    Each resume moves on to the Gemini stage as soon as its text is extracted,
+    so the two stages overlap (except in bulk mode, which packs several
+    resumes per enhancement request once all are extracted). Only successful records are checkpointed, so a
+    rerun retries failures and skips everything else. Gemini requests go in
+    the scheduler's batch lane under tenant, behind interactive requests.
+
+    Returns:
+        dict: Counts of processed, failed and skipped resumes, of resumes
+            whose text came from the upload store, and (in bulk mode) the
+            bulk request counts
+    """
+    done = load_checkpoint(checkpoint_path)
+    pending = [p for p in paths if p not in done]
+    stats = {"processed": 0, "failed": 0, "skipped": len(paths) - len(pending), "reused_uploads": 0}
+
+    with open(output_path, "a", encoding="utf-8") as out, \
+            open(checkpoint_path, "a", encoding="utf-8") as ckpt, \
+            request_context(tenant=tenant, lane=BATCH):
+        asyncio.run(_run_batch(
+            pending, out, ckpt, stats, stages, extract_workers, llm_concurrency, combined, bulk
+        ))
+
+    return stats
+
+
+# --- CLI ---
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Batch-process resumes with Gemini.")
+    parser.add_argument("sources", nargs="+", help="Resume files, directories, or manifest files")
+    parser.add_argument("-o", "--output", default="results.jsonl", help="JSONL output file (appended)")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.done)")
+    parser.add_argument("--stages", default=",".join(STAGES),
+                        help=f"Comma-separated stages to run (default: {','.join(STAGES)})")
+    parser.add_argument("--extract-workers", type=int, default=config.BATCH_EXTRACT_WORKERS,
+                        help="Processes used for PDF/DOCX extraction")
+    parser.add_argument("--llm-concurrency", type=int, default=config.BATCH_LLM_CONCURRENCY,
+                        help="Maximum concurrent resumes in the Gemini stage")
+    parser.add_argument("--combined", action="store_true",
+                        help="Send one structured request per resume covering all stages")
+    parser.add_argument("--bulk", action="store_true",
+                        help="Pack several resumes into each enhancement request (overnight runs)")
+    parser.add_argument("--tenant", default="batch",
+                        help="Name this run is scheduled under, fairly against other tenants")
+    parser.add_argument("--metrics-port", type=int, default=config.METRICS_PORT,
+                        help="Serve Prometheus metrics on this port while running (0 = off)")
+    args = parser.parse_args(argv)
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"Unknown stages: {', '.join(sorted(unknown))}")
+    if args.bulk and args.combined:
+        parser.error("--bulk and --combined cannot be used together")
+
+    is_valid, error_msg = config.validate_config()
+    if not is_valid:
+        print(error_msg, file=sys.stderr)
+        return 2
+
+    metrics.start_metrics_server(args.metrics_port)
+    paths = discover_inputs(args.sources)
+    stats = run_batch(
+        paths,
+        output_path=args.output,
+        checkpoint_path=args.checkpoint or args.output + ".done",
+        stages=stages,
+        extract_workers=max(1, args.extract_workers),
+        llm_concurrency=max(1, args.llm_concurrency),
+        combined=args.combined,
+        bulk=args.bulk,
+        tenant=args.tenant,
+    )
+    stats["cache"] = get_response_cache().stats()
+    stats["uploads"] = get_upload_store().stats()
+    stats["metrics"] = metrics.REGISTRY.snapshot()
+    print(json.dumps(stats), file=sys.stderr)
+    return 0 if stats["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
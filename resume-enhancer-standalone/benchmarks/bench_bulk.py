@@ -0,0 +1,107 @@
+"""
+Benchmark bulk (packed) enhancement against one request per resume.
+
+Enhances a synthetic corpus through the fake Gemini backend, once with
+resume_ai.enhance_resume_async per resume and once with bulk.enhance_many_async,
+and reports requests, prompt tokens and wall time for each. --drop-rate makes
+the fake omit that fraction of results from packed responses, exercising the
+partial retries.
+
+Usage:
+    python benchmarks/bench_bulk.py --resumes 200 --latency 1.0
+    python benchmarks/bench_bulk.py --drop-rate 0.2 --json bulk.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import time
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+from fake_gemini import FakeGemini, canned_response, install  # noqa: E402
+from run_benchmarks import make_resume_text  # noqa: E402
+
+_RESULT_BLOCK = re.compile(r"=== RESULT \S+ ===.*?=== END \S+ ===\n\n", re.DOTALL)
+
+
+def make_corpus(count: int, seed: int) -> Dict[str, str]:
+    """Distinct synthetic resumes of varying length, keyed by a fake file name."""
+    rng = random.Random(seed)
+    return {f"resume-{index}.pdf": f"Candidate {index}\n" + make_resume_text(rng.randint(2, 6))
+            for index in range(count)}
+
+
+def run(mode: str, corpus: Dict[str, str], args: argparse.Namespace) -> Dict[str, Any]:
+    """Enhance the corpus in one mode and return request, token and time counts."""
+    import resume_ai
+    from bulk import enhance_many_async
+
+    rng = random.Random(args.seed)
+    tokens = {"prompt": 0}
+
+    def responder(prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+        tokens["prompt"] += len(prompt) // 4
+        text = canned_response(prompt, generation_config)
+        if args.drop_rate:
+            blocks = _RESULT_BLOCK.findall(text)
+            if blocks:
+                text = "".join(block for block in blocks if rng.random() >= args.drop_rate)
+        return text
+
+    fake = install(FakeGemini(latency=args.latency, responder=responder))
+    started = time.perf_counter()
+    extra: Dict[str, Any] = {}
+    if mode == "single":
+        slots = asyncio.Semaphore(args.concurrency)
+
+        async def one(text: str) -> None:
+            async with slots:
+                await resume_ai.enhance_resume_async(text)
+
+        async def run_all() -> None:
+            await asyncio.gather(*(one(text) for text in corpus.values()))
+
+        asyncio.run(run_all())
+    else:
+        result = asyncio.run(enhance_many_async(corpus, concurrency=args.concurrency))
+        extra = {"bulk": result.stats, "errors": len(result.errors)}
+    return dict({
+        "requests": fake.calls,
+        "prompt_tokens": tokens["prompt"],
+        "wall_s": round(time.perf_counter() - started, 3),
+    }, **extra)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--resumes", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.5, help="Fake Gemini latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=config.BATCH_LLM_CONCURRENCY)
+    parser.add_argument("--drop-rate", type=float, default=0.0,
+                        help="Fraction of packed results the fake leaves out")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.resumes, args.seed)
+    results = {mode: run(mode, corpus, args) for mode in ("single", "bulk")}
+    single, packed = results["single"], results["bulk"]
+    results["reduction"] = {
+        name: round(1 - packed[name] / single[name], 3) for name in ("requests", "prompt_tokens", "wall_s")
+    }
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Benchmark DOCX text extraction against the original python-docx approach.
+
+Builds synthetic resumes mixing paragraphs and tables, then measures the
+original paragraph-only join and the streaming docx_extract pass. Every
+measurement runs in a fresh process so peak RSS is attributable to one mode.
+The "chars" column shows how much text each mode recovers.
+
+Usage:
+    python benchmarks/bench_docx_extract.py
+    python benchmarks/bench_docx_extract.py --blocks 10 1000 --json docx.json
+"""
+
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import docx  # noqa: E402
+
+from docx_extract import extract_docx_text  # noqa: E402
+
+LINE = "Designed and shipped a resume parsing service handling 10k documents per day."
+
+
+def make_docx(blocks: int) -> bytes:
+    """Build a DOCX with `blocks` groups of a heading, two bullets and a 3x2 table."""
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = "Jane Doe | jane@example.com"
+    for number in range(blocks):
+        document.add_paragraph(f"Experience {number}")
+        document.add_paragraph(f"- {LINE}")
+        document.add_paragraph(f"- {LINE}")
+        table = document.add_table(rows=3, cols=2)
+        for row in range(3):
+            table.cell(row, 0).text = f"Skill {number}.{row}"
+            table.cell(row, 1).text = "Python, SQL, Docker"
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def legacy_extract(data: bytes) -> str:
+    """The original extract_text_from_docx body, for comparison."""
+    document = docx.Document(io.BytesIO(data))
+    return "\n".join([para.text for para in document.paragraphs]).strip()
+
+
+MODES = {
+    "legacy": legacy_extract,
+    "streaming": lambda data: extract_docx_text(io.BytesIO(data)).strip(),
+}
+
+
+def _measure(mode: str, data: bytes, repeats: int, queue: multiprocessing.Queue) -> None:
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    chars = len(MODES[mode](data))
+    started = time.perf_counter()
+    for _ in range(repeats):
+        MODES[mode](data)
+    elapsed = (time.perf_counter() - started) / repeats
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((elapsed, peak, peak - baseline, chars))
+
+
+def run(block_counts: List[int], repeats: int) -> List[Dict]:
+    """Measure every mode for every document size."""
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    for blocks in block_counts:
+        data = make_docx(blocks)
+        for mode in MODES:
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_measure, args=(mode, data, repeats, queue))
+            proc.start()
+            elapsed, peak, growth, chars = queue.get()
+            proc.join()
+            results.append({
+                "blocks": blocks,
+                "bytes": len(data),
+                "mode": mode,
+                "seconds": round(elapsed, 5),
+                "chars": chars,
+                "peak_rss_mb": round(peak / 1024, 1),
+                "rss_growth_mb": round(growth / 1024, 1),
+            })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--blocks", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.blocks, args.repeats)
+    print(f"{'blocks':>6}  {'mode':<10} {'seconds':>9} {'chars':>9} {'rss MB':>8} {'growth MB':>9}")
+    for row in results:
+        print(f"{row['blocks']:>6}  {row['mode']:<10} {row['seconds']:>9.4f} {row['chars']:>9} "
+              f"{row['peak_rss_mb']:>8.1f} {row['rss_growth_mb']:>9.1f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark cold import time of the core library.
+
+Imports the extraction, LLM, render and job modules in a fresh interpreter
+with `python -X importtime`, reports the cumulative time per module and the
+slowest dependencies, and fails if the total exceeds the budget or if any
+heavy dependency (Streamlit, the Gemini SDK, PyMuPDF, python-docx) is
+imported eagerly. Those are only meant to load on first use.
+
+Usage:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --budget-ms 150 --repeats 5 --json imports.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CORE_MODULES: List[str] = [
+    "config", "metrics", "text_normalize", "section_parser", "chunking",
+    "pdf_extract", "docx_extract", "resume_utils", "llm_client", "response_cache",
+    "local_scoring", "resume_ai", "resume_render", "pdf_build", "upload_store", "jobs", "batch",
+]
+HEAVY_MODULES: List[str] = ["streamlit", "google.generativeai", "fitz", "docx"]
+
+
+def measure() -> Tuple[Dict[str, float], List[Tuple[str, float]], List[str]]:
+    """
+    Import the core modules once in a fresh interpreter.
+
+    Returns:
+        tuple: (cumulative ms per core module, (name, self ms) for every
+            imported module, heavy modules that were imported)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(CORE_MODULES)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    per_module: Dict[str, float] = {}
+    imported: List[Tuple[str, float]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imported.append((name.strip(), int(self_us) / 1000))
+        # Top-level entries are the modules requested by the -c statement
+        if name.startswith(" ") and not name.startswith("  ") and name.strip() in CORE_MODULES:
+            per_module[name.strip()] = int(cumulative_us) / 1000
+    names = {name for name, _ in imported}
+    heavy = [module for module in HEAVY_MODULES if module in names]
+    return per_module, imported, heavy
+
+
+def run(repeats: int) -> Dict:
+    """Measure repeatedly and keep the fastest run (the least disturbed by noise)."""
+    best = None
+    for _ in range(repeats):
+        per_module, imported, heavy = measure()
+        total = sum(per_module.values())
+        if best is None or total < best["total_ms"]:
+            slowest = sorted(imported, key=lambda item: item[1], reverse=True)[:10]
+            best = {
+                "total_ms": round(total, 1),
+                "modules_ms": {name: round(ms, 1) for name, ms in per_module.items()},
+                "slowest_self_ms": [[name, round(ms, 1)] for name, ms in slowest],
+                "heavy_imports": heavy,
+            }
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=150.0,
+                        help="Maximum cumulative import time for the core modules")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    result = run(max(1, args.repeats))
+    result["budget_ms"] = args.budget_ms
+    print(f"{'module':<16} {'cumulative ms':>14}")
+    for name, ms in result["modules_ms"].items():
+        print(f"{name:<16} {ms:>14.1f}")
+    print(f"{'total':<16} {result['total_ms']:>14.1f}  (budget {args.budget_ms:.0f})")
+    print("slowest imports (self ms): " + ", ".join(f"{name} {ms}" for name, ms in result["slowest_self_ms"]))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    failed = False
+    if result["heavy_imports"]:
+        print(f"FAIL: imported eagerly: {', '.join(result['heavy_imports'])}", file=sys.stderr)
+        failed = True
+    if result["total_ms"] > args.budget_ms:
+        print(f"FAIL: {result['total_ms']:.1f}ms exceeds the {args.budget_ms:.0f}ms budget", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
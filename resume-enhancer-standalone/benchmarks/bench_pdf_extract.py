@@ -0,0 +1,117 @@
+"""
+Benchmark PDF text extraction on synthetic 1-200 page documents.
+
+Compares the original concatenation loop with the sequential and parallel
+modes of pdf_extract.extract_pdf_text. Every measurement runs in a fresh
+process so peak RSS is attributable to a single mode.
+
+Usage:
+    python benchmarks/bench_pdf_extract.py
+    python benchmarks/bench_pdf_extract.py --pages 1 50 200 --json results.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF  # noqa: E402
+
+import config  # noqa: E402
+from pdf_extract import extract_pdf_text, shutdown_pool  # noqa: E402
+
+LINE = "Led a team of engineers delivering data pipelines, improving throughput by 35%."
+
+
+def make_pdf(pages: int) -> bytes:
+    """Build a text-only PDF with roughly a resume page's worth of text per page."""
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        body = "\n".join(f"{number}.{row} {LINE}" for row in range(45))
+        page.insert_textbox(fitz.Rect(36, 36, 576, 806), body, fontsize=8)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def legacy_extract(data: bytes) -> str:
+    """The original extract_text_from_pdf loop, for comparison."""
+    doc = fitz.open(stream=data, filetype="pdf")
+    text = ""
+    for page in doc:
+        text += page.get_text()
+    doc.close()
+    return text.strip()
+
+
+MODES = {
+    "legacy": legacy_extract,
+    "sequential": lambda data: extract_pdf_text(data, workers=1, max_pages=0),
+    "parallel": lambda data: extract_pdf_text(data, max_pages=0),
+}
+
+
+def _measure(mode: str, data: bytes, repeats: int, workers: int, queue: multiprocessing.Queue) -> None:
+    config.PDF_EXTRACT_WORKERS = workers
+    MODES[mode](data)  # warm up imports and the worker pool
+    started = time.perf_counter()
+    for _ in range(repeats):
+        MODES[mode](data)
+    elapsed = (time.perf_counter() - started) / repeats
+    shutdown_pool()
+    self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    queue.put((elapsed, self_rss, child_rss))
+
+
+def run(page_counts: List[int], repeats: int, workers: int) -> List[Dict]:
+    """Measure every mode for every page count."""
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    for pages in page_counts:
+        data = make_pdf(pages)
+        for mode in MODES:
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_measure, args=(mode, data, repeats, workers, queue))
+            proc.start()
+            elapsed, self_rss, child_rss = queue.get()
+            proc.join()
+            results.append({
+                "pages": pages,
+                "mode": mode,
+                "seconds": round(elapsed, 5),
+                "pages_per_second": round(pages / elapsed, 1),
+                "peak_rss_mb": round(self_rss / 1024, 1),
+                "peak_worker_rss_mb": round(child_rss / 1024, 1),
+            })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 50, 100, 200])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=config.PDF_EXTRACT_WORKERS,
+                        help="Worker processes for the parallel mode")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.pages, args.repeats, max(2, args.workers))
+    print(f"{'pages':>5}  {'mode':<10} {'seconds':>9} {'pages/s':>9} {'rss MB':>8} {'workers MB':>10}")
+    for row in results:
+        print(f"{row['pages']:>5}  {row['mode']:<10} {row['seconds']:>9.4f} "
+              f"{row['pages_per_second']:>9.1f} {row['peak_rss_mb']:>8.1f} {row['peak_worker_rss_mb']:>10.1f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark speculative prefetch: click latency against wasted Gemini calls.
+
+Simulated sessions each read a resume, then go through the enhance, scores
+and summary tabs in order, pausing --think seconds before each and clicking
+it with probability --click-rate. Every click is a submit_text on the job
+queue followed by a wait for the result, as in app.py. The run is repeated
+without and with prefetch (JobQueue.prefetch right after the resume is
+read), against the fake Gemini backend with the response cache off.
+
+Reports click-to-result latency, Gemini calls per click, and for prefetch
+the share of prefetched jobs that were used (hit or still running when
+clicked) and the calls spent on jobs nobody clicked. Lower click rates make
+prefetch more wasteful; use this to choose PREFETCH_STAGES and the limits.
+
+Usage:
+    python benchmarks/bench_prefetch.py --sessions 40 --click-rate 0.7
+    python benchmarks/bench_prefetch.py --click-rate 0.3 --json prefetch.json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+import jobs  # noqa: E402
+import metrics  # noqa: E402
+from fake_gemini import FakeGemini, install  # noqa: E402
+from run_benchmarks import make_resume_text  # noqa: E402
+
+STAGES = ["enhance", "scores", "summary"]
+
+
+def percentile(values: List[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(share * (len(ordered) - 1)))]
+
+
+def outcomes() -> Dict[str, float]:
+    """Current prefetch_jobs_total values by outcome."""
+    counts = metrics.REGISTRY.snapshot().get("prefetch_jobs_total", {})
+    return {key.split('"')[1]: value for key, value in counts.items()}
+
+
+def run(prefetch: bool, args: argparse.Namespace, tmp: str) -> Dict[str, Any]:
+    """Run every session once with or without prefetch."""
+    fake = install(FakeGemini(latency=args.latency, jitter=args.jitter, seed=args.seed), disable_cache=True)
+    store = jobs.JobStore(os.path.join(tmp, f"jobs-{prefetch}.sqlite3"))
+    queue = jobs.JobQueue(store, workers=args.workers, poll_seconds=0.05,
+                          max_prefetch_running=args.max_running, max_prefetch_pending=args.max_pending)
+    before = outcomes()
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def session(index: int) -> None:
+        rng = random.Random(args.seed * 1000 + index)
+        tenant = f"session-{index}"
+        text = f"Candidate {index}\n" + make_resume_text(rng.randint(2, 5))
+        if prefetch:
+            queue.prefetch(text, STAGES, tenant)
+        for stage in STAGES:
+            time.sleep(rng.uniform(0.5, 1.5) * args.think)
+            if rng.random() >= args.click_rate:
+                continue
+            started = time.perf_counter()
+            queue.wait(queue.submit_text(text, [stage], tenant), timeout=120, interval=0.01)
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    threads = []
+    for index in range(args.sessions):
+        threads.append(threading.Thread(target=session, args=(index,), daemon=True))
+        threads[-1].start()
+        time.sleep(args.arrival)
+    for thread in threads:
+        thread.join()
+    # Let unclicked prefetches finish so the calls they spend are counted
+    while store.pending_prefetches():
+        time.sleep(0.05)
+
+    result: Dict[str, Any] = {
+        "clicks": len(latencies),
+        "click_p50_s": round(statistics.median(latencies), 3) if latencies else None,
+        "click_p95_s": round(percentile(latencies, 0.95), 3) if latencies else None,
+        "gemini_calls": fake.calls,
+        "calls_per_click": round(fake.calls / len(latencies), 2) if latencies else None,
+    }
+    if prefetch:
+        after = outcomes()
+        delta = {name: after.get(name, 0) - before.get(name, 0) for name in after}
+        submitted = delta.get("submitted", 0)
+        used = delta.get("hit", 0) + delta.get("partial", 0)
+        result.update({
+            "prefetch_outcomes": delta,
+            "prefetch_hit_rate": round(used / submitted, 3) if submitted else None,
+            "prefetch_unused": int(submitted - used - delta.get("cancelled", 0)),
+        })
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=40)
+    parser.add_argument("--arrival", type=float, default=1.0, help="Seconds between session starts")
+    parser.add_argument("--think", type=float, default=3.0, help="Mean pause before each tab")
+    parser.add_argument("--click-rate", type=float, default=0.7, help="Chance a user opens each tab")
+    parser.add_argument("--workers", type=int, default=config.JOB_WORKERS)
+    parser.add_argument("--max-running", type=int, default=config.PREFETCH_MAX_RUNNING)
+    parser.add_argument("--max-pending", type=int, default=config.PREFETCH_MAX_PENDING)
+    parser.add_argument("--latency", type=float, default=1.0, help="Fake Gemini latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {"off": run(False, args, tmp), "on": run(True, args, tmp)}
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
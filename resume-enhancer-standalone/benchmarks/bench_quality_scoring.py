@@ -0,0 +1,135 @@
+"""
+Benchmark quality scoring in each QUALITY_SCORING_MODE.
+
+Scores a resume corpus (files on disk, or synthetic resumes with varying
+sections and lengths) through resume_ai.get_quality_scores against the fake
+Gemini backend in "llm", "hybrid" and "fast" modes, and reports per-resume
+latency, Gemini calls and tokens per mode, with the reduction relative to
+"llm". The response cache is disabled so every resume is scored afresh.
+
+Usage:
+    python benchmarks/bench_quality_scoring.py --resumes 200 --latency 0.3
+    python benchmarks/bench_quality_scoring.py resumes/ --json scoring.json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+import local_scoring  # noqa: E402
+from fake_gemini import FakeGemini, canned_response, install  # noqa: E402
+
+MODES = ["llm", "hybrid", "fast"]
+BULLETS = [
+    "Led a team of engineers delivering data pipelines, improving throughput by 35%.",
+    "responsible for various backend tasks and helped with deployments etc.",
+    "Built dashboards in Tableau used by 200 analysts across three regions.",
+    "Worked on the the migration of legacy services , which took a long time.",
+    "Reduced infrastructure cost by $40k per year by rightsizing clusters.",
+]
+
+
+def make_corpus(count: int, seed: int) -> List[str]:
+    """Synthetic resumes with random subsets of sections and bullet counts."""
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(count):
+        parts = [f"Candidate {index}\ncandidate{index}@example.com"]
+        for section in config.RESUME_SECTIONS:
+            if rng.random() < 0.75:
+                lines = "\n".join(f"- {rng.choice(BULLETS)}" for _ in range(rng.randint(1, 8)))
+                parts.append(f"{section}\n{lines}")
+        corpus.append("\n\n".join(parts))
+    return corpus
+
+
+def load_corpus(sources: List[str]) -> List[str]:
+    """Extract every resume found in files, directories or manifests."""
+    from batch import discover_inputs, extract_file
+
+    texts = []
+    for path in discover_inputs(sources):
+        path, text, error, _ = extract_file(path)
+        if error is None:
+            texts.append(text)
+        else:
+            print(f"[error] {path}: {error}", file=sys.stderr)
+    return texts
+
+
+def run_mode(mode: str, corpus: List[str], latency: float) -> Dict[str, Any]:
+    """Score the corpus in one mode and collect latency, call and token counts."""
+    import resume_ai
+
+    tokens = {"prompt": 0, "response": 0}
+
+    def responder(prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+        text = canned_response(prompt, generation_config)
+        tokens["prompt"] += len(prompt) // 4
+        tokens["response"] += len(text) // 4
+        return text
+
+    fake = install(FakeGemini(latency=latency, responder=responder))
+    config.QUALITY_SCORING_MODE = mode
+    latencies = []
+    for text in corpus:
+        started = time.perf_counter()
+        resume_ai.get_quality_scores(text)
+        latencies.append(time.perf_counter() - started)
+    ordered = sorted(latencies)
+    return {
+        "mean_ms": round(statistics.mean(latencies) * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))] * 1000, 3),
+        "total_s": round(sum(latencies), 3),
+        "llm_calls": fake.calls,
+        "prompt_tokens": tokens["prompt"],
+        "response_tokens": tokens["response"],
+        "local_criteria": len(local_scoring.local_criteria(mode)),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("sources", nargs="*", help="Resume files, directories or manifests (default: synthetic)")
+    parser.add_argument("--resumes", type=int, default=100, help="Synthetic corpus size")
+    parser.add_argument("--latency", type=float, default=0.3, help="Fake Gemini latency in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.sources) if args.sources else make_corpus(args.resumes, args.seed)
+    if not corpus:
+        print("No resumes to score", file=sys.stderr)
+        return 1
+    results = {mode: run_mode(mode, corpus, args.latency) for mode in MODES}
+    baseline = results["llm"]
+    for result in results.values():
+        result["latency_reduction"] = round(1 - result["total_s"] / baseline["total_s"], 3)
+        result["call_reduction"] = round(1 - result["llm_calls"] / baseline["llm_calls"], 3)
+        result["token_reduction"] = round(
+            1 - (result["prompt_tokens"] + result["response_tokens"])
+            / (baseline["prompt_tokens"] + baseline["response_tokens"]), 3)
+
+    print(f"{len(corpus)} resumes, fake latency {args.latency}s")
+    print(f"{'mode':<8} {'mean ms':>9} {'p95 ms':>9} {'calls':>6} {'tokens':>8} {'latency -':>10} {'calls -':>8} {'tokens -':>9}")
+    for mode, result in results.items():
+        print(f"{mode:<8} {result['mean_ms']:>9.1f} {result['p95_ms']:>9.1f} {result['llm_calls']:>6}"
+              f" {result['prompt_tokens'] + result['response_tokens']:>8}"
+              f" {result['latency_reduction']:>10.0%} {result['call_reduction']:>8.0%}"
+              f" {result['token_reduction']:>9.0%}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"resumes": len(corpus), "latency": args.latency, "modes": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Simulate interactive users sharing the Gemini client with a bulk batch run.
+
+One batch tenant keeps --batch-concurrency requests queued in the batch lane
+while --users interactive tenants each send a request, wait for it, pause for
+--think seconds and repeat. Every request goes through the fake Gemini backend
+and the shared client's scheduler, once with LLM_SCHEDULING=fifo (arrival
+order, as before the scheduler) and once with "fair". Reports interactive
+latency percentiles, batch throughput, drops and the largest queue position
+an interactive user was shown.
+
+Before the runs it checks that waits ending in an exception (a cancelled
+asyncio caller, a failing on_wait callback) give their slot back.
+
+Usage:
+    python benchmarks/bench_scheduler.py --seconds 20 --users 8 --batch-concurrency 64
+    python benchmarks/bench_scheduler.py --json scheduler.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+import llm_client  # noqa: E402
+from fake_gemini import FakeGemini, install  # noqa: E402
+from scheduler import BATCH, INTERACTIVE, FairScheduler, RequestDropped, request_context  # noqa: E402
+
+
+def percentile(values: List[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(share * (len(ordered) - 1)))]
+
+
+def check_cancellation() -> None:
+    """Assert that abandoned waits leave no slot in flight and nothing queued."""
+    def idle(scheduler: FairScheduler) -> bool:
+        return all(lane["in_flight"] == 0 and lane["queued"] == 0 for lane in scheduler.snapshot().values())
+
+    async def cancel_waiter(scheduler: FairScheduler, wait: Any) -> None:
+        task = asyncio.ensure_future(wait())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    # Cancelled while queued behind the only slot
+    scheduler = FairScheduler(1)
+    scheduler.acquire()
+    asyncio.run(cancel_waiter(scheduler, scheduler.acquire_async))
+    scheduler.release()
+    assert idle(scheduler), scheduler.snapshot()
+
+    # on_wait raising in the blocking path
+    scheduler = FairScheduler(1)
+    scheduler.acquire()
+
+    def fail(position: int) -> None:
+        raise RuntimeError("on_wait failed")
+
+    with request_context(on_wait=fail):
+        try:
+            scheduler.acquire()
+        except RuntimeError:
+            pass
+    scheduler.release()
+    assert idle(scheduler), scheduler.snapshot()
+
+    # Cancelled in the client's rate-limit wait, after the slot was granted
+    client = llm_client.LLMClient("fake", max_concurrency=1, requests_per_minute=1, max_retries=0, timeout=1)
+    client.rate_limiter.reserve()
+    asyncio.run(cancel_waiter(client.scheduler, lambda: client.generate_content_async("prompt")))
+    assert idle(client.scheduler), client.scheduler.snapshot()
+
+
+def run(mode: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Run the mixed load under one scheduling mode."""
+    config.LLM_SCHEDULING = mode
+    config.LLM_MAX_CONCURRENCY = args.capacity
+    config.LLM_INTERACTIVE_RESERVED_SLOTS = args.reserved
+    config.LLM_INTERACTIVE_MAX_WAIT_SECONDS = args.max_wait
+    install(FakeGemini(latency=args.latency, jitter=args.jitter, seed=args.seed))
+    client = llm_client.get_client()
+    stop = threading.Event()
+    latencies: List[float] = []
+    counts = {"batch_done": 0, "dropped": 0, "max_position": 0}
+    lock = threading.Lock()
+
+    def batch_worker() -> None:
+        with request_context(tenant="bulk-run", lane=BATCH):
+            while not stop.is_set():
+                client.generate_content("Original Resume:\nbatch resume")
+                with lock:
+                    counts["batch_done"] += 1
+
+    def user(index: int) -> None:
+        def on_wait(position: int) -> None:
+            with lock:
+                counts["max_position"] = max(counts["max_position"], position)
+
+        with request_context(tenant=f"user-{index}", lane=INTERACTIVE, on_wait=on_wait):
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    client.generate_content("Original Resume:\ninteractive resume")
+                    with lock:
+                        latencies.append(time.perf_counter() - started)
+                except RequestDropped:
+                    with lock:
+                        counts["dropped"] += 1
+                stop.wait(args.think)
+
+    threads = [threading.Thread(target=batch_worker, daemon=True) for _ in range(args.batch_concurrency)]
+    # Let the batch fill the queue before users arrive
+    for thread in threads:
+        thread.start()
+    time.sleep(args.latency)
+    users = [threading.Thread(target=user, args=(index,), daemon=True) for index in range(args.users)]
+    for thread in users:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads + users:
+        thread.join()
+
+    return {
+        "interactive_requests": len(latencies),
+        "interactive_p50_s": round(statistics.median(latencies), 3) if latencies else None,
+        "interactive_p95_s": round(percentile(latencies, 0.95), 3) if latencies else None,
+        "interactive_p99_s": round(percentile(latencies, 0.99), 3) if latencies else None,
+        "batch_requests_per_s": round(counts["batch_done"] / args.seconds, 2),
+        "dropped": counts["dropped"],
+        "max_queue_position": counts["max_position"],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=15.0)
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--batch-concurrency", type=int, default=64)
+    parser.add_argument("--capacity", type=int, default=config.LLM_MAX_CONCURRENCY,
+                        help="Gemini requests in flight (LLM_MAX_CONCURRENCY)")
+    parser.add_argument("--reserved", type=int, default=config.LLM_INTERACTIVE_RESERVED_SLOTS)
+    parser.add_argument("--max-wait", type=float, default=0.0,
+                        help="Interactive queue deadline in seconds (0 = never drop)")
+    parser.add_argument("--latency", type=float, default=0.3, help="Fake Gemini latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--think", type=float, default=0.5, help="Pause between a user's requests")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    check_cancellation()
+    results = {mode: run(mode, args) for mode in ("fifo", "fair")}
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
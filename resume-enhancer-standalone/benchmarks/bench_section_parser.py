@@ -0,0 +1,140 @@
+"""
+Benchmark section parsing on large synthetic resumes.
+
+Compares the original substring scan (every heading checked against every
+line, twice) with section_parser's single compiled regex, both as a one-shot
+parse and through the incremental stream parser. The "headings" column counts
+lines classified as headings; the synthetic text has exactly one per block, so
+anything above that is a body line misread as a heading.
+
+Usage:
+    python benchmarks/bench_section_parser.py
+    python benchmarks/bench_section_parser.py --lines 1000 100000 --json sections.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+from resume_ai import NO_DATA, SectionStreamParser, parse_sections  # noqa: E402
+from section_parser import find_sections  # noqa: E402
+
+BODY = [
+    "- Built data pipelines in Python and SQL for 3 product teams",
+    "- Mentored interns, improving their communication skills",
+    "- Gained experience running A/B tests at scale",
+    "- Presented projects at two internal conferences",
+    "- Reduced cloud spend by 20% through query tuning",
+]
+
+
+def make_text(lines: int) -> Tuple[str, int]:
+    """
+    Build resume text of roughly `lines` lines, one heading per section with
+    long bodies (like an academic CV); returns (text, heading count).
+    """
+    out: List[str] = ["IMPROVED RESUME:", "Jane Doe"]
+    per_section = max(1, lines // len(config.RESUME_SECTIONS) - 1)
+    for number, section in enumerate(config.RESUME_SECTIONS):
+        out.append(f"**{section}**")
+        out.extend(BODY[(number + row) % len(BODY)] for row in range(per_section))
+    return "\n".join(out), len(config.RESUME_SECTIONS)
+
+
+def legacy_parse(text: str) -> Tuple[Dict[str, str], int]:
+    """The original parse_sections loop, returning (sections, headings seen)."""
+    sections = {section: NO_DATA for section in config.RESUME_SECTIONS}
+    current_section = None
+    collected: List[str] = []
+    headings = 0
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        if any(heading.lower() in line.lower() for heading in sections):
+            headings += 1
+            if current_section and collected:
+                sections[current_section] = '\n'.join(collected)
+                collected = []
+            for key in sections:
+                if key.lower() in line.lower():
+                    current_section = key
+                    break
+        elif current_section:
+            collected.append(line)
+    if current_section and collected:
+        sections[current_section] = '\n'.join(collected)
+    return sections, headings
+
+
+def stream_parse(text: str) -> Tuple[Dict[str, str], int]:
+    parser = SectionStreamParser()
+    for start in range(0, len(text), 64):
+        parser.feed(text[start:start + 64])
+    parser.close()
+    return parser.sections, len(find_sections(text))
+
+
+MODES: Dict[str, Callable[[str], Tuple[Dict[str, str], int]]] = {
+    "legacy": legacy_parse,
+    "compiled": lambda text: (parse_sections(text), len(find_sections(text))),
+    "stream": stream_parse,
+}
+
+
+def _time(func: Callable[[], object], repeats: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - started) / repeats
+
+
+def run(line_counts: List[int], repeats: int) -> List[Dict]:
+    """Measure every mode for every input size."""
+    results = []
+    for lines in line_counts:
+        text, expected = make_text(lines)
+        legacy_seconds = None
+        for mode, parse in MODES.items():
+            _, headings = parse(text)
+            if mode == "compiled":
+                seconds = _time(lambda: parse_sections(text), repeats)
+            else:
+                seconds = _time(lambda: parse(text), repeats)
+            legacy_seconds = legacy_seconds or seconds
+            results.append({
+                "lines": lines,
+                "mode": mode,
+                "seconds": round(seconds, 6),
+                "speedup": round(legacy_seconds / seconds, 2),
+                "headings": headings,
+                "expected_headings": expected,
+            })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.lines, args.repeats)
+    print(f"{'lines':>7}  {'mode':<9} {'seconds':>9} {'speedup':>8} {'headings':>9} {'expected':>9}")
+    for row in results:
+        print(f"{row['lines']:>7}  {row['mode']:<9} {row['seconds']:>9.4f} {row['speedup']:>7.1f}x "
+              f"{row['headings']:>9} {row['expected_headings']:>9}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
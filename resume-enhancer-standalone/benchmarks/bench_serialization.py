@@ -0,0 +1,138 @@
+"""
+Benchmark the compact resume serialization and the Parquet export.
+
+Builds a synthetic corpus of enhanced resumes (random wording, so compression
+is not flattered by repeated lines) and compares, per resume, the JSON value
+resume_ai used to cache with Resume.pack(): size and encode/decode time.
+Then writes the corpus as batch.py JSONL records and as Parquet and compares
+file sizes and write time. The Parquet part is skipped without pyarrow.
+
+Usage:
+    python benchmarks/bench_serialization.py --resumes 2000
+    python benchmarks/bench_serialization.py --json serialization.json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+import resume_model  # noqa: E402
+from resume_model import ContactInfo, Resume, Scores  # noqa: E402
+
+WORDS = ("built designed led migrated reduced latency costs service pipeline team platform customers "
+         "python kafka kubernetes sql dashboards api data model tests release on-call 30% 2x million "
+         "users across regions weekly reports analytics cloud security onboarding mentoring").split()
+
+
+def make_record(index: int, rng: random.Random) -> Dict[str, Any]:
+    """A batch.py-style record with randomly worded sections."""
+    def line() -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 16))).capitalize()
+
+    sections = {name: resume_model.NO_DATA for name in config.RESUME_SECTIONS}
+    for name in rng.sample(config.RESUME_SECTIONS, rng.randint(4, len(config.RESUME_SECTIONS))):
+        entries = []
+        for _ in range(rng.randint(1, 3)):
+            bullets = "\n".join(f"- {line()}" for _ in range(rng.randint(1, 5)))
+            entries.append(f"{line()}\n{bullets}")
+        sections[name] = "\n\n".join(entries)
+    return {
+        "file": f"resume-{index}.pdf",
+        "status": "ok",
+        "contact": {"name": f"Candidate {index}", "email": f"c{index}@example.com", "phone": "", "links": []},
+        "sections": sections,
+        "corrections": [line() for _ in range(rng.randint(2, 6))],
+        "scores": {criterion: rng.randint(40, 95) for criterion in config.QUALITY_CRITERIA},
+        "summary": " ".join(line() for _ in range(4)),
+    }
+
+
+def per_resume(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Cache value sizes and encode/decode times: JSON [sections, corrections] vs pack()."""
+    sizes = {"json": [], "packed": []}
+    seconds = {"json_encode": 0.0, "json_decode": 0.0, "pack": 0.0, "unpack": 0.0}
+    for record in records:
+        value = [record["sections"], record["corrections"]]
+        started = time.perf_counter()
+        encoded = json.dumps(value)
+        seconds["json_encode"] += time.perf_counter() - started
+        started = time.perf_counter()
+        json.loads(encoded)
+        seconds["json_decode"] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        packed = Resume.from_sections(record["sections"], record["corrections"]).pack()
+        seconds["pack"] += time.perf_counter() - started
+        started = time.perf_counter()
+        unpacked = Resume.unpack(packed)
+        seconds["unpack"] += time.perf_counter() - started
+        assert unpacked.sections_dict() == record["sections"]
+        sizes["json"].append(len(encoded.encode("utf-8")))
+        sizes["packed"].append(len(packed))
+    return {
+        "codec": resume_model.codec(),
+        "json_bytes_mean": round(statistics.mean(sizes["json"])),
+        "packed_bytes_mean": round(statistics.mean(sizes["packed"])),
+        "size_ratio": round(sum(sizes["packed"]) / sum(sizes["json"]), 3),
+        **{f"{name}_us": round(total / len(records) * 1e6, 1) for name, total in seconds.items()},
+    }
+
+
+def corpus_files(records: List[Dict[str, Any]], batch_size: int) -> Dict[str, Any]:
+    """JSONL vs Parquet for the whole corpus."""
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl_path, parquet_path = os.path.join(tmp, "results.jsonl"), os.path.join(tmp, "corpus.parquet")
+        with open(jsonl_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        result: Dict[str, Any] = {"jsonl_bytes": os.path.getsize(jsonl_path)}
+        started = time.perf_counter()
+        try:
+            rows = resume_model.write_parquet(resume_model.read_records(jsonl_path), parquet_path, batch_size)
+        except ImportError:
+            result["parquet"] = "skipped (pyarrow not installed)"
+            return result
+        elapsed = time.perf_counter() - started
+        result.update({
+            "parquet_bytes": os.path.getsize(parquet_path),
+            "parquet_rows": rows,
+            "parquet_rows_per_s": round(rows / elapsed),
+        })
+        return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--resumes", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=1000, help="Parquet rows per row group")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    records = [make_record(index, rng) for index in range(args.resumes)]
+    # Contact and scores only travel in the model, so check they survive too
+    sample = Resume.from_sections(records[0]["sections"], records[0]["corrections"],
+                                  contact=ContactInfo(**records[0]["contact"]), scores=Scores(records[0]["scores"]))
+    assert Resume.unpack(sample.pack()) == sample
+
+    results = {"resumes": args.resumes, "per_resume": per_resume(records),
+               "corpus": corpus_files(records, args.batch_size)}
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
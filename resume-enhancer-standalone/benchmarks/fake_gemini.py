@@ -0,0 +1,235 @@
+"""
+Deterministic local stand-in for google.generativeai.
+
+Answers the app's prompts with canned responses after a configurable latency
+and fails a configurable fraction of requests with a retryable 429, so the full
+pipeline can be measured without a GEMINI_API_KEY or network access.
+
+Usage:
+    from benchmarks.fake_gemini import FakeGemini, install
+    fake = install(FakeGemini(latency=0.2, error_rate=0.05))
+"""
+
+import asyncio
+import json
+import random
+import re
+import sys
+import threading
+import time
+import types
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import config
+
+ENHANCE_MARKER = "IMPROVED RESUME:"
+SECTION_MARKER = "Original Section:\n"
+BULK_RESUME = re.compile(r"^=== RESUME (\S+) ===\n(.*?)\n=== END \1 ===$", re.MULTILINE | re.DOTALL)
+SCORES_MARKER = "Return ONLY scores"
+RESUME_MARKERS = ("Original Resume:\n", "\nResume:\n", "professional:\n\n")
+
+
+class FakeAPIError(Exception):
+    """Retryable error raised for injected failures; mirrors google.api_core's ``code``."""
+
+    def __init__(self, code: int = 429, message: str = "Resource exhausted (fake)") -> None:
+        super().__init__(message)
+        self.code = code
+
+
+class FakeUsage:
+    """Token counts in the shape of GenerateContentResponse.usage_metadata."""
+
+    def __init__(self, prompt: str, text: str) -> None:
+        self.prompt_token_count = len(prompt) // 4
+        self.candidates_token_count = len(text) // 4
+        self.total_token_count = self.prompt_token_count + self.candidates_token_count
+
+
+class FakeResponse:
+    """Minimal GenerateContentResponse: ``text`` plus ``usage_metadata``."""
+
+    def __init__(self, prompt: str, text: str) -> None:
+        self.text = text
+        self.usage_metadata = FakeUsage(prompt, text)
+
+
+class FakeTokenCount:
+    """Minimal CountTokensResponse."""
+
+    def __init__(self, total_tokens: int) -> None:
+        self.total_tokens = total_tokens
+
+
+def _resume_text(prompt: str) -> str:
+    """Return the resume embedded at the end of one of resume_ai's prompts."""
+    for marker in RESUME_MARKERS:
+        index = prompt.rfind(marker)
+        if index >= 0:
+            return prompt[index + len(marker):]
+    return prompt
+
+
+def canned_response(prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build a deterministic answer for a resume_ai prompt.
+
+    Enhancement echoes the resume under the expected headings (once per
+    delimited resume for bulk prompts), a single section comes back with
+    full stops added, scores (for
+    the requested criteria) are derived from the resume length, and the
+    combined request returns JSON.
+    """
+    resume = _resume_text(prompt)
+    score = 60 + len(resume) % 40
+    if generation_config and generation_config.get("response_mime_type") == "application/json":
+        return json.dumps({
+            "sections": [{"name": name, "content": f"- {name} details"} for name in config.RESUME_SECTIONS],
+            "corrections": ["Fixed grammar", "Tightened wording"],
+            "scores": [{"criterion": c, "score": score} for c in config.QUALITY_CRITERIA],
+            "summary": resume[:400],
+        })
+    bulk = BULK_RESUME.findall(prompt)
+    if bulk:
+        return "".join(
+            f"=== RESULT {item_id} ===\n{ENHANCE_MARKER}\n{text}\n\nCORRECTIONS MADE:\n- Fixed grammar\n"
+            f"=== END {item_id} ===\n\n"
+            for item_id, text in bulk
+        )
+    if SECTION_MARKER in prompt:
+        # Drop the heading and end every line with a full stop, so diffs are non-empty
+        lines = prompt[prompt.rfind(SECTION_MARKER) + len(SECTION_MARKER):].split("\n")[1:]
+        return "\n".join(line if line.endswith(".") else line + "." for line in lines if line.strip())
+    if ENHANCE_MARKER in prompt:
+        return f"{ENHANCE_MARKER}\n{resume}\n\nCORRECTIONS MADE:\n- Fixed grammar\n- Tightened wording\n"
+    if SCORES_MARKER in prompt:
+        # Answer only the criteria the prompt asks for (hybrid scoring sends a subset)
+        criteria = [c for c in config.QUALITY_CRITERIA if f"{c}: [score]" in prompt]
+        return "".join(f"{criterion}: {score}\n" for criterion in criteria)
+    return resume[:400]
+
+
+class FakeGemini:
+    """
+    Behaviour shared by every fake model: latency, failures and responses.
+
+    Args:
+        latency: Seconds before a response (or the first streamed chunk)
+        jitter: Extra uniformly random latency in seconds
+        error_rate: Fraction of requests failing with FakeAPIError (0-1)
+        responder: Callable (prompt, generation_config) -> response text
+        stream_chunks: Number of chunks a streamed response is split into
+        seed: Seed for latency jitter and error injection
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        responder: Callable[[str, Optional[Dict[str, Any]]], str] = canned_response,
+        stream_chunks: int = 8,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.responder = responder
+        self.stream_chunks = max(1, stream_chunks)
+        self.calls = 0
+        self.failures = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _next(self) -> tuple:
+        """Draw this request's delay and whether it fails."""
+        with self._lock:
+            self.calls += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            fail = self._random.random() < self.error_rate
+            if fail:
+                self.failures += 1
+        return delay, fail
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "failures": self.failures}
+
+
+class FakeGenerativeModel:
+    """Drop-in for genai.GenerativeModel backed by a FakeGemini."""
+
+    def __init__(self, model_name: str, backend: FakeGemini) -> None:
+        self.model_name = model_name
+        self.backend = backend
+
+    def generate_content(self, prompt: str, stream: bool = False,
+                         generation_config: Optional[Dict[str, Any]] = None, **kwargs: Any) -> Any:
+        delay, fail = self.backend._next()
+        time.sleep(delay)
+        if fail:
+            raise FakeAPIError()
+        text = self.backend.responder(prompt, generation_config)
+        if stream:
+            return self._stream(prompt, text)
+        return FakeResponse(prompt, text)
+
+    def _stream(self, prompt: str, text: str) -> Iterator[FakeResponse]:
+        size = max(1, -(-len(text) // self.backend.stream_chunks))
+        for start in range(0, len(text), size):
+            yield FakeResponse(prompt, text[start:start + size])
+
+    async def generate_content_async(self, prompt: str,
+                                     generation_config: Optional[Dict[str, Any]] = None,
+                                     **kwargs: Any) -> FakeResponse:
+        delay, fail = self.backend._next()
+        await asyncio.sleep(delay)
+        if fail:
+            raise FakeAPIError()
+        return FakeResponse(prompt, self.backend.responder(prompt, generation_config))
+
+    def count_tokens(self, contents: str, **kwargs: Any) -> FakeTokenCount:
+        return FakeTokenCount(len(contents) // 4)
+
+
+def make_module(backend: FakeGemini) -> types.ModuleType:
+    """Build a module object exposing the parts of google.generativeai the app uses."""
+    module = types.ModuleType("google.generativeai")
+    module.configure = lambda **kwargs: None
+    module.GenerativeModel = lambda model_name, **kwargs: FakeGenerativeModel(model_name, backend)
+    return module
+
+
+def install(backend: Optional[FakeGemini] = None, disable_cache: bool = True) -> FakeGemini:
+    """
+    Route all Gemini traffic in this process to a fake backend.
+
+    Replaces google.generativeai in sys.modules and in llm_client, resets the
+    shared client, sets a placeholder API key so config.validate_config passes,
+    disables the client-side rate limit, and (by default) the response cache so
+    every request reaches the fake.
+
+    Args:
+        backend: Fake to install (a zero-latency FakeGemini if omitted)
+        disable_cache: Use the no-op response cache
+
+    Returns:
+        FakeGemini: The installed backend, for inspecting call counts
+    """
+    backend = backend or FakeGemini()
+    module = make_module(backend)
+    sys.modules["google.generativeai"] = module
+
+    config.GEMINI_API_KEY = config.GEMINI_API_KEY or "fake-key"
+    config.GEMINI_API_ENDPOINT = ""
+    config.LLM_REQUESTS_PER_MINUTE = 0
+
+    import llm_client
+    llm_client.genai = module
+    llm_client._client = None
+    llm_client._configured = False
+
+    if disable_cache:
+        import response_cache
+        config.RESPONSE_CACHE_BACKEND = "none"
+        response_cache._cache = None
+    return backend
@@ -0,0 +1,170 @@
+"""
+Memory load test: process RSS across thousands of simulated sessions.
+
+Each simulated session does what a browser session does in app.py: upload a
+distinct PDF, hash it and look it up in the upload store, extract it through
+the job queue, run the combined Gemini analysis job (against the fake
+backend), score it locally, and match it against a job description. Sessions
+stay open for a while (holding their upload and text like a live Streamlit
+session) and are then closed. All stores live in a temporary directory with
+the configured limits scaled down, so eviction actually happens during the run.
+
+RSS is sampled as sessions complete. After a warm-up share of the run, growth
+beyond --max-growth-mb fails the test. --unbounded turns the limits off for
+comparison.
+
+Usage:
+    python benchmarks/load_test_memory.py --sessions 3000
+    python benchmarks/load_test_memory.py --sessions 3000 --unbounded
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def configure(tmp: str, args: argparse.Namespace) -> None:
+    """Point every store at tmp and set (or lift) the memory limits before config is imported."""
+    limit = "0" if args.unbounded else str(args.limit)
+    os.environ.update({
+        "UPLOAD_STORE_PATH": os.path.join(tmp, "uploads.sqlite3"),
+        "JOB_STORE_PATH": os.path.join(tmp, "jobs.sqlite3"),
+        "RESPONSE_CACHE_PATH": os.path.join(tmp, "responses.sqlite3"),
+        "UPLOAD_STORE_MAX_ENTRIES": limit,
+        "RESPONSE_CACHE_MAX_ENTRIES": limit,
+        "JOB_MAX_FINISHED": limit,
+        "MATCH_INDEX_MAX_DOCS": limit,
+        "RELEASE_UPLOADS": "false" if args.unbounded else "true",
+        "SESSION_IDLE_SECONDS": "60",
+    })
+
+
+def resume_for(index: int) -> str:
+    """A distinct resume per session, so every cache sees new keys."""
+    from run_benchmarks import make_resume_text
+
+    skills = ", ".join(f"skill{(index * 7 + k) % 5000}" for k in range(12))
+    return f"Candidate {index}\ncandidate{index}@example.com\n" + make_resume_text(3) + f"\n\nSkills\n{skills}"
+
+
+def run_session(index: int, jd_text: str) -> Tuple[str, Dict[str, Any]]:
+    """One browser session's work; returns its id and what it keeps holding."""
+    import io
+
+    import config
+    import jobs
+    import resume_ai
+    from matching import get_match_index
+    from memory import get_session_ledger
+    from resume_utils import file_digest
+    from run_benchmarks import make_pdf
+    from text_normalize import fingerprint
+    from upload_store import get_upload_store
+
+    session_id = f"session-{index}"
+    ledger = get_session_ledger()
+    queue = jobs.get_job_queue()
+    data = make_pdf(resume_for(index))
+    held: Dict[str, Any] = {"upload": data}
+    ledger.record(session_id, "upload", len(data))
+
+    digest = file_digest(io.BytesIO(data))
+    upload = get_upload_store().get(digest)
+    if upload is None:
+        job = queue.wait(queue.submit_file(data, f"resume-{index}.pdf"), timeout=60, interval=0.005)
+        upload = job.result
+    if config.RELEASE_UPLOADS:
+        held.pop("upload")
+        ledger.release(session_id, "upload")
+    text = upload["text"]
+    held["text"] = text
+    ledger.record(session_id, "resume_text", len(text))
+
+    queue.wait(queue.submit_text(text, ["analysis"]), timeout=60, interval=0.005)
+    resume_ai.get_quality_scores(text)
+    index_ = get_match_index()
+    doc_id = fingerprint(text)
+    if doc_id not in index_:
+        index_.add(doc_id, text)
+    if doc_id in index_:
+        index_.score_doc(doc_id, jd_text)
+    index_.keyword_gap(text, jd_text)
+    ledger.record(session_id, "job_description", len(jd_text))
+    return session_id, held
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--open-sessions", type=int, default=50,
+                        help="Sessions kept open at once (older ones are closed)")
+    parser.add_argument("--limit", type=int, default=300,
+                        help="Entry limit applied to every cache and the match index")
+    parser.add_argument("--samples", type=int, default=20)
+    parser.add_argument("--warmup", type=float, default=0.25,
+                        help="Share of sessions before the RSS baseline is taken")
+    parser.add_argument("--max-growth-mb", type=float, default=25.0)
+    parser.add_argument("--unbounded", action="store_true", help="Disable the limits for comparison")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure(tmp, args)
+        from fake_gemini import install
+        from memory import get_session_ledger, rss_bytes
+
+        install(disable_cache=False)
+        jd_text = "Backend engineer: Python, Kafka, Kubernetes, SQL, machine learning. " * 3
+        ledger = get_session_ledger()
+        open_sessions: Deque[Tuple[str, Dict[str, Any]]] = deque()
+        samples: List[Dict[str, float]] = []
+        every = max(1, args.sessions // args.samples)
+        started = time.perf_counter()
+        for index in range(args.sessions):
+            open_sessions.append(run_session(index, jd_text))
+            while len(open_sessions) > args.open_sessions:
+                ledger.forget(open_sessions.popleft()[0])
+            if (index + 1) % every == 0:
+                gc.collect()
+                snapshot = ledger.snapshot()
+                samples.append({
+                    "sessions_done": index + 1,
+                    "rss_mb": round(rss_bytes() / 1e6, 1),
+                    "open_sessions": snapshot["sessions"],
+                    "session_kb": round(snapshot["session_bytes"] / 1e3, 1),
+                })
+                print(json.dumps(samples[-1]), file=sys.stderr)
+        elapsed = time.perf_counter() - started
+
+    baseline = next(s for s in samples if s["sessions_done"] >= args.warmup * args.sessions)
+    growth = samples[-1]["rss_mb"] - baseline["rss_mb"]
+    result = {
+        "sessions": args.sessions,
+        "unbounded": args.unbounded,
+        "seconds": round(elapsed, 1),
+        "baseline_rss_mb": baseline["rss_mb"],
+        "final_rss_mb": samples[-1]["rss_mb"],
+        "growth_after_warmup_mb": round(growth, 1),
+        "samples": samples,
+    }
+    print(json.dumps({k: v for k, v in result.items() if k != "samples"}, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    if not args.unbounded and growth > args.max_growth_mb:
+        print(f"FAIL: RSS grew {growth:.1f}MB after warm-up (limit {args.max_growth_mb:.0f}MB)", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""
+End-to-end benchmark suite running against the local fake Gemini backend.
+
+Measures extraction time per page, parse/render cost, per-resume latency of
+the full pipeline (extract, normalize, enhance, score, summarize, render) and
+throughput at N concurrent sessions. No API key or network access is needed.
+Metrics are flat "name": value pairs; --baseline compares against an earlier
+--json file and exits non-zero on regressions beyond --tolerance.
+
+Usage:
+    python benchmarks/run_benchmarks.py --json bench.json
+    python benchmarks/run_benchmarks.py --latency 0.5 --error-rate 0.05 --sessions 1 8 32
+    python benchmarks/run_benchmarks.py --baseline bench.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF  # noqa: E402
+
+import config  # noqa: E402
+from fake_gemini import FakeGemini, install  # noqa: E402
+from pdf_extract import shutdown_pool  # noqa: E402
+
+LINE = "Led a team of engineers delivering data pipelines, improving throughput by 35%."
+
+# Metrics where a larger value is better; everything else is a duration or cost
+HIGHER_IS_BETTER = ("resumes_per_s",)
+
+
+def make_resume_text(bullets: int = 6) -> str:
+    """Build a resume with every configured section and `bullets` lines in each."""
+    parts = ["Jane Doe\njane@example.com | +1 555 0100"]
+    for section in config.RESUME_SECTIONS:
+        lines = "\n".join(f"- {section} {row}: {LINE}" for row in range(bullets))
+        parts.append(f"{section}\n{lines}")
+    return "\n\n".join(parts)
+
+
+def make_pdf(text: str, pages: int = 1) -> bytes:
+    """Render text onto `pages` PDF pages (the same text on each page)."""
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(36, 36, 576, 806), text, fontsize=7)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _time_per_call(func: Callable[[], object], repeats: int) -> float:
+    func()
+    started = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - started) / repeats
+
+
+def bench_extraction(page_counts: List[int], repeats: int) -> Dict[str, float]:
+    """Seconds per page for PDF extraction plus normalization."""
+    from pdf_extract import extract_pdf_text
+    from text_normalize import normalize_resume_text
+
+    text = make_resume_text()
+    metrics = {}
+    for pages in page_counts:
+        data = make_pdf(text, pages)
+        elapsed = _time_per_call(lambda: normalize_resume_text(extract_pdf_text(data, max_pages=0)), repeats)
+        metrics[f"extract.{pages}p.s_per_page"] = elapsed / pages
+    return metrics
+
+
+def bench_parse_render(repeats: int) -> Dict[str, float]:
+    """Cost of parsing an enhancement response and rendering LaTeX/Markdown."""
+    import resume_ai
+    from resume_render import generate_latex, generate_markdown
+
+    metrics = {}
+    for bullets in (6, 60):
+        improved = make_resume_text(bullets)
+        sections = resume_ai.parse_sections(improved)
+        label = f"{bullets}b"
+        metrics[f"parse.sections.{label}.ms"] = _time_per_call(lambda: resume_ai.parse_sections(improved), repeats) * 1000
+        metrics[f"render.latex.{label}.ms"] = _time_per_call(lambda: generate_latex(sections), repeats) * 1000
+        metrics[f"render.markdown.{label}.ms"] = _time_per_call(lambda: generate_markdown(sections), repeats) * 1000
+    return metrics
+
+
+def run_session(pdf: bytes) -> float:
+    """Run one resume through the whole pipeline and return its latency."""
+    import resume_ai
+    from pdf_extract import extract_pdf_text
+    from resume_render import generate_latex, generate_markdown
+    from text_normalize import normalize_resume_text
+
+    started = time.perf_counter()
+    text = normalize_resume_text(extract_pdf_text(pdf)).text
+    sections, _ = resume_ai.enhance_resume(text)
+    resume_ai.get_quality_scores(text)
+    resume_ai.get_resume_summary(text)
+    generate_latex(sections)
+    generate_markdown(sections)
+    return time.perf_counter() - started
+
+
+def bench_sessions(session_counts: List[int], resumes: int) -> Dict[str, float]:
+    """Per-resume latency and throughput with N concurrent sessions."""
+    pdf = make_pdf(make_resume_text())
+    run_session(pdf)  # warm up imports and the client
+    metrics = {}
+    for sessions in session_counts:
+        total = max(resumes, sessions)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=sessions) as pool:
+            latencies = list(pool.map(lambda _: run_session(pdf), range(total)))
+        wall = time.perf_counter() - started
+        prefix = f"e2e.{sessions}x"
+        metrics[f"{prefix}.p50_s"] = statistics.median(latencies)
+        metrics[f"{prefix}.p95_s"] = _percentile(latencies, 95)
+        metrics[f"{prefix}.resumes_per_s"] = total / wall
+    return metrics
+
+
+def compare(baseline: Dict[str, float], current: Dict[str, float], tolerance: float) -> List[str]:
+    """
+    List metrics that got worse than baseline by more than tolerance.
+
+    Args:
+        baseline: Metrics from an earlier run
+        current: Metrics from this run
+        tolerance: Allowed relative change (0.2 = 20%)
+
+    Returns:
+        list: One human-readable line per regression
+    """
+    regressions = []
+    for name, value in current.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        change = (value - before) / before
+        if name.endswith(HIGHER_IS_BETTER):
+            change = -change
+        if change > tolerance:
+            regressions.append(f"{name}: {before:.6g} -> {value:.6g} ({change:+.0%})")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake Gemini latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 429")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--resumes", type=int, default=16, help="Resumes per concurrency level")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against an earlier --json file")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    fake = install(FakeGemini(latency=args.latency, jitter=args.jitter,
+                              error_rate=args.error_rate, seed=args.seed))
+    from llm_client import get_client
+    get_client().backoff_base = 0.05  # keep injected 429s from dominating the run
+
+    metrics: Dict[str, float] = {}
+    metrics.update(bench_extraction(args.pages, max(1, args.repeats // 4)))
+    metrics.update(bench_parse_render(args.repeats))
+    metrics.update(bench_sessions(args.sessions, args.resumes))
+    shutdown_pool()
+    metrics = {name: round(value, 6) for name, value in metrics.items()}
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "error_rate": args.error_rate,
+            "llm_max_concurrency": config.LLM_MAX_CONCURRENCY,
+            "fake_calls": fake.stats(),
+        },
+        "metrics": metrics,
+    }
+    width = max(len(name) for name in metrics)
+    for name, value in metrics.items():
+        print(f"{name:<{width}}  {value:>12.6f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(json.load(f)["metrics"], metrics, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
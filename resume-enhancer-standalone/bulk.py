@@ -0,0 +1,178 @@
+"""
+Bulk enhancement for overnight runs: several resumes per Gemini request.
+Resumes are packed greedily into requests up to config.BULK_PACK_TOKENS and
+config.BULK_MAX_ITEMS, each wrapped in id-tagged delimiters, so the
+instructions are sent once per pack instead of once per resume and far fewer
+requests are made. Responses are split back per id and parsed with the same
+parse_sections/parse_corrections as single requests.
+
+Items missing from a response (or a whole failed request) are repacked into
+smaller packs and retried; after config.BULK_MAX_ATTEMPTS the remaining items
+fall back to one request each. Results land in the response cache under the
+regular "enhance" key, so the app and later runs reuse them.
+
+Usage:
+    python batch.py resumes/ --bulk --output results.jsonl
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import config
+import metrics
+import resume_ai
+from chunking import apply_token_budget, chunk_resume, count_tokens
+from llm_client import get_client
+
+
+@dataclass
+class BulkResult:
+    """Outcome of a bulk run: results and errors per key, plus request counts."""
+    results: Dict[str, Tuple[Dict[str, str], List[str]]] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    stats: Dict[str, int] = field(default_factory=lambda: {
+        "items": 0, "cached": 0, "packed_requests": 0, "packed_items": 0,
+        "retried_items": 0, "single_items": 0,
+    })
+
+
+def pack(items: List[Tuple[str, str]], max_tokens: int, max_items: int) -> List[List[Tuple[str, str]]]:
+    """
+    Greedily group (id, text) items into packs within a token and item budget.
+
+    Items keep their order; an item larger than max_tokens gets a pack of its own.
+
+    Args:
+        items: (id, resume text) pairs
+        max_tokens: Resume tokens allowed per pack
+        max_items: Resumes allowed per pack
+
+    Returns:
+        list: Packs of (id, text) pairs
+    """
+    packs: List[List[Tuple[str, str]]] = []
+    current: List[Tuple[str, str]] = []
+    used = 0
+    for item in items:
+        tokens = count_tokens(item[1])
+        if current and (used + tokens > max_tokens or len(current) >= max_items):
+            packs.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += tokens
+    if current:
+        packs.append(current)
+    return packs
+
+
+async def _send_pack(items: List[Tuple[str, str]], result: BulkResult) -> Dict[str, List[Any]]:
+    """Send one packed request and return the parsed results it contained."""
+    result.stats["packed_requests"] += 1
+    result.stats["packed_items"] += len(items)
+    with metrics.timed("bulk_enhance"):
+        response = await get_client().generate_content_async(resume_ai.build_bulk_enhance_prompt(items))
+    return resume_ai.split_bulk_response(response.text)
+
+
+async def _enhance_single(key: str, text: str, result: BulkResult) -> None:
+    """Enhance one resume with the regular request(s), recording its result or error."""
+    result.stats["single_items"] += 1
+    try:
+        result.results[key] = await resume_ai.enhance_resume_async(text)
+    except Exception as e:
+        result.errors[key] = str(e)
+
+
+async def enhance_many_async(
+    texts: Dict[str, str],
+    max_tokens: Optional[int] = None,
+    max_items: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    max_attempts: Optional[int] = None,
+) -> BulkResult:
+    """
+    Enhance many resumes with packed requests.
+
+    Cached resumes are returned without a request, and resumes long enough to
+    need chunking are enhanced on their own (see resume_ai.enhance_resume).
+
+    Args:
+        texts: Caller key (e.g. file path) mapped to extracted resume text
+        max_tokens: Resume tokens per pack (defaults to config.BULK_PACK_TOKENS)
+        max_items: Resumes per pack (defaults to config.BULK_MAX_ITEMS)
+        concurrency: Packs in flight (defaults to config.BATCH_LLM_CONCURRENCY)
+        max_attempts: Packed attempts before single-request fallback
+            (defaults to config.BULK_MAX_ATTEMPTS)
+
+    Returns:
+        BulkResult: (sections, corrections) per key, errors per key, and counts
+    """
+    max_tokens = max_tokens or config.BULK_PACK_TOKENS
+    max_items = max_items or config.BULK_MAX_ITEMS
+    slots = asyncio.Semaphore(concurrency or config.BATCH_LLM_CONCURRENCY)
+    max_attempts = config.BULK_MAX_ATTEMPTS if max_attempts is None else max_attempts
+    result = BulkResult()
+    result.stats["items"] = len(texts)
+
+    # Short positional ids keep the delimiters unambiguous whatever the keys are
+    pending: List[Tuple[str, str]] = []
+    keys: Dict[str, str] = {}
+    budgeted: Dict[str, str] = {}
+    singles: List[str] = []
+    for index, (key, text) in enumerate(texts.items()):
+        try:
+            text, _ = apply_token_budget(text)
+        except Exception as e:
+            result.errors[key] = str(e)
+            continue
+        cached = resume_ai.cached_enhancement(text)
+        if cached is not None:
+            result.results[key] = cached
+            result.stats["cached"] += 1
+        elif len(chunk_resume(text)) > 1:
+            singles.append(key)
+        else:
+            item_id = f"r{index}"
+            keys[item_id] = key
+            pending.append((item_id, text))
+        budgeted[key] = text
+
+    async def run_pack(items: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Send a pack; return the items it did not answer."""
+        async with slots:
+            try:
+                parsed = await _send_pack(items, result)
+            except Exception:
+                parsed = {}
+        for item_id, text in items:
+            if item_id in parsed:
+                sections, corrections = parsed[item_id]
+                resume_ai.store_enhancement(text, sections, corrections)
+                result.results[keys[item_id]] = (sections, corrections)
+        return [item for item in items if item[0] not in parsed]
+
+    for attempt in range(max_attempts):
+        if not pending:
+            break
+        if attempt:
+            result.stats["retried_items"] += len(pending)
+            # Smaller packs on each retry, down to one resume per request
+            max_items = max(1, max_items // 2)
+        packs = pack(pending, max_tokens, max_items)
+        missing = await asyncio.gather(*(run_pack(p) for p in packs))
+        pending = [item for items in missing for item in items]
+
+    singles.extend(keys[item_id] for item_id, _ in pending)
+
+    async def run_single(key: str) -> None:
+        async with slots:
+            await _enhance_single(key, budgeted[key], result)
+
+    await asyncio.gather(*(run_single(key) for key in singles))
+    return result
+
+
+def enhance_many(texts: Dict[str, str], **kwargs: Any) -> BulkResult:
+    """Blocking version of enhance_many_async."""
+    return asyncio.run(enhance_many_async(texts, **kwargs))
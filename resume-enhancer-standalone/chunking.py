@@ -0,0 +1,129 @@
+"""
+Token budgeting and section-aware chunking for long resumes and CVs.
+Long texts are split on config.RESUME_SECTIONS headings and packed into
+chunks that fit config.CHUNK_TOKENS, so each can be enhanced concurrently.
+Texts above config.MAX_RESUME_TOKENS are truncated or refused.
+"""
+
+from typing import List, Optional, Tuple
+
+import config
+from section_parser import match_heading
+from text_normalize import estimate_tokens
+
+CHARS_PER_TOKEN = 4
+
+
+class ResumeTooLongError(ValueError):
+    """Raised when a resume exceeds the token ceiling and the policy is "refuse"."""
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count prompt tokens for text.
+
+    Uses the character-based estimate unless config.TOKEN_COUNT_EXACT is set,
+    in which case the Gemini count_tokens endpoint is asked through the shared
+    client, so the call is scheduled and rate limited like any other request.
+    If the scheduler drops it, the estimate is used instead.
+    """
+    if config.TOKEN_COUNT_EXACT:
+        from llm_client import get_client
+        from scheduler import RequestDropped
+
+        try:
+            return get_client().count_tokens(text)
+        except RequestDropped:
+            return estimate_tokens(text)
+    return estimate_tokens(text)
+
+
+def apply_token_budget(text: str, max_tokens: Optional[int] = None) -> Tuple[str, bool]:
+    """
+    Enforce the resume token ceiling.
+
+    Args:
+        text: Resume text
+        max_tokens: Ceiling (defaults to config.MAX_RESUME_TOKENS; 0 disables it)
+
+    Returns:
+        tuple: (text, truncated) where text is cut at a line boundary if the
+            policy is "truncate" and the ceiling was exceeded
+
+    Raises:
+        ResumeTooLongError: If the ceiling is exceeded and the policy is "refuse"
+    """
+    max_tokens = config.MAX_RESUME_TOKENS if max_tokens is None else max_tokens
+    tokens = count_tokens(text)
+    if not max_tokens or tokens <= max_tokens:
+        return text, False
+    if config.TOKEN_CEILING_POLICY == "refuse":
+        raise ResumeTooLongError(
+            f"Resume is about {tokens} tokens, above the limit of {max_tokens}"
+        )
+    cut = text[:max_tokens * CHARS_PER_TOKEN]
+    newline = cut.rfind("\n")
+    return (cut[:newline] if newline > 0 else cut).rstrip(), True
+
+
+def split_sections(text: str) -> List[str]:
+    """
+    Split text into blocks that each start at a section heading line.
+
+    Text before the first heading (usually name and contact details) becomes
+    its own block.
+    """
+    blocks: List[List[str]] = [[]]
+    for line in text.split("\n"):
+        if any(blocks[-1]) and match_heading(line):
+            blocks.append([])
+        blocks[-1].append(line)
+    return ["\n".join(block).strip() for block in blocks if any(block)]
+
+
+def _split_block(block: str, max_tokens: int) -> List[str]:
+    """Split one oversized section by lines, repeating its heading on each piece."""
+    lines = block.split("\n")
+    heading = lines[0] if match_heading(lines[0]) else ""
+    body = lines[1:] if heading else lines
+    pieces: List[str] = []
+    current: List[str] = [heading] if heading else []
+    for line in body:
+        if current and current != [heading] and estimate_tokens("\n".join(current + [line])) > max_tokens:
+            pieces.append("\n".join(current))
+            current = [heading] if heading else []
+        current.append(line)
+    if current and current != [heading]:
+        pieces.append("\n".join(current))
+    return pieces
+
+
+def chunk_resume(text: str, max_tokens: Optional[int] = None) -> List[str]:
+    """
+    Pack section blocks into chunks of at most max_tokens.
+
+    Args:
+        text: Resume text
+        max_tokens: Chunk size (defaults to config.CHUNK_TOKENS)
+
+    Returns:
+        list: One chunk for texts that already fit, otherwise several
+            chunks that break only at section (or, if needed, line) boundaries
+    """
+    max_tokens = max_tokens or config.CHUNK_TOKENS
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+    chunks: List[str] = []
+    current = ""
+    for block in split_sections(text):
+        pieces = [block] if estimate_tokens(block) <= max_tokens else _split_block(block, max_tokens)
+        for piece in pieces:
+            candidate = f"{current}\n\n{piece}" if current else piece
+            if current and estimate_tokens(candidate) > max_tokens:
+                chunks.append(current)
+                current = piece
+            else:
+                current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
@@ -3,9 +3,10 @@ Configuration management for Resume Enhancer application.
 Handles environment variables and application settings.
 """
 
+import json
 import os
 from dotenv import load_dotenv
-from typing import List
+from typing import Dict, List
 
 # Load environment variables from .env file
 load_dotenv()
@@ -13,6 +14,17 @@ load_dotenv()
 # API Configuration
 GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
 GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+GEMINI_API_ENDPOINT: str = os.getenv("GEMINI_API_ENDPOINT", "")  # e.g. localhost:8080 for a fake server
+
+# LLM Client Configuration
+LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_REQUESTS_PER_MINUTE: float = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))
+LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "120"))
+LLM_SCHEDULING: str = os.getenv("LLM_SCHEDULING", "fair").lower()  # "fair" or "fifo"
+LLM_INTERACTIVE_RESERVED_SLOTS: int = int(os.getenv("LLM_INTERACTIVE_RESERVED_SLOTS", "2"))  # never used by batch requests
+LLM_INTERACTIVE_MAX_WAIT_SECONDS: float = float(os.getenv("LLM_INTERACTIVE_MAX_WAIT_SECONDS", "60"))  # then dropped; 0 = no limit
+LLM_BATCH_MAX_WAIT_SECONDS: float = float(os.getenv("LLM_BATCH_MAX_WAIT_SECONDS", "0"))
 
 # File Upload Configuration
 MAX_FILE_SIZE_MB: int = int(os.getenv("MAX_FILE_SIZE_MB", "10"))
@@ -20,6 +32,94 @@ MAX_FILE_SIZE_BYTES: int = MAX_FILE_SIZE_MB * 1024 * 1024
 
 SUPPORTED_FORMATS: List[str] = ["pdf", "docx"]
 
+# PDF Extraction Configuration
+PDF_EXTRACT_WORKERS: int = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_PARALLEL_MIN_PAGES: int = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "32"))  # smaller PDFs are read sequentially
+PDF_MAX_PAGES: int = int(os.getenv("PDF_MAX_PAGES", "0"))  # 0 = no page budget
+PDF_EMPTY_PAGE_BUDGET: int = int(os.getenv("PDF_EMPTY_PAGE_BUDGET", "3"))  # leading text-less pages before giving up
+
+# OCR Configuration (scanned PDFs; needs Tesseract)
+OCR_ENGINE: str = os.getenv("OCR_ENGINE", "auto").lower()  # "auto", "tesseract" (pytesseract), "pymupdf" or "none"
+OCR_LANGUAGE: str = os.getenv("OCR_LANGUAGE", "eng")
+OCR_WORKERS: int = int(os.getenv("OCR_WORKERS", "2"))  # separate from PDF_EXTRACT_WORKERS
+OCR_MAX_DOCUMENTS: int = int(os.getenv("OCR_MAX_DOCUMENTS", "2"))  # scanned PDFs read at once
+OCR_DPI: int = int(os.getenv("OCR_DPI", "200"))
+OCR_MAX_PAGES: int = int(os.getenv("OCR_MAX_PAGES", "5"))  # 0 = no page budget
+OCR_PAGE_TIMEOUT_SECONDS: float = float(os.getenv("OCR_PAGE_TIMEOUT_SECONDS", "30"))
+OCR_TIMEOUT_SECONDS: float = float(os.getenv("OCR_TIMEOUT_SECONDS", "90"))  # whole document
+OCR_CACHE_DIR: str = os.getenv("OCR_CACHE_DIR", os.path.join(".cache", "ocr"))  # "" disables the cache
+
+# Show enhanced sections as they stream in instead of waiting for the full response
+STREAM_ENHANCEMENT: bool = os.getenv("STREAM_ENHANCEMENT", "true").lower() in ("1", "true", "yes")
+
+# PDF Build Configuration (optional local LaTeX engine)
+PDF_BUILD_ENGINE: str = os.getenv("PDF_BUILD_ENGINE", "auto").lower()  # "auto", "tectonic", "pdflatex" or "none"
+PDF_BUILD_WORKERS: int = int(os.getenv("PDF_BUILD_WORKERS", "2"))
+PDF_BUILD_TIMEOUT_SECONDS: int = int(os.getenv("PDF_BUILD_TIMEOUT_SECONDS", "60"))
+PDF_BUILD_CACHE_DIR: str = os.getenv("PDF_BUILD_CACHE_DIR", os.path.join(".cache", "pdf"))
+
+# Token Budget Configuration
+MAX_RESUME_TOKENS: int = int(os.getenv("MAX_RESUME_TOKENS", "32000"))  # 0 = no ceiling
+TOKEN_CEILING_POLICY: str = os.getenv("TOKEN_CEILING_POLICY", "truncate").lower()  # "truncate" or "refuse"
+CHUNK_TOKENS: int = int(os.getenv("CHUNK_TOKENS", "6000"))  # longer resumes are enhanced in chunks
+TOKEN_COUNT_EXACT: bool = os.getenv("TOKEN_COUNT_EXACT", "false").lower() in ("1", "true", "yes")
+
+# Observability Configuration
+METRICS_PORT: int = int(os.getenv("METRICS_PORT", "0"))  # 0 = no /metrics endpoint
+TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "false").lower() in ("1", "true", "yes")  # needs opentelemetry
+
+# Response Cache Configuration
+RESPONSE_CACHE_BACKEND: str = os.getenv("RESPONSE_CACHE_BACKEND", "sqlite").lower()  # "sqlite" or "none"
+RESPONSE_CACHE_PATH: str = os.getenv("RESPONSE_CACHE_PATH", os.path.join(".cache", "responses.sqlite3"))
+RESPONSE_CACHE_TTL_SECONDS: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "10000"))
+
+# Job Matching Configuration (optional local embeddings need sentence-transformers)
+MATCH_EMBEDDING_MODEL: str = os.getenv("MATCH_EMBEDDING_MODEL", "")  # e.g. "all-MiniLM-L6-v2"; empty = TF-IDF only
+MATCH_EMBEDDING_WEIGHT: float = float(os.getenv("MATCH_EMBEDDING_WEIGHT", "0.5"))
+
+# Quality Scoring Configuration
+# "hybrid": structure, completeness and clarity are scored locally, only the subjective
+# criteria go to Gemini; "fast": everything is scored locally; "llm": Gemini scores all
+QUALITY_SCORING_MODE: str = os.getenv("QUALITY_SCORING_MODE", "hybrid").lower()
+LOCAL_SPELLCHECK: bool = os.getenv("LOCAL_SPELLCHECK", "true").lower() in ("1", "true", "yes")  # needs pyspellchecker
+
+# Upload Store Configuration (extracted text per file hash)
+UPLOAD_STORE_PATH: str = os.getenv("UPLOAD_STORE_PATH", os.path.join(".cache", "uploads.sqlite3"))
+UPLOAD_STORE_TTL_SECONDS: int = int(os.getenv("UPLOAD_STORE_TTL_SECONDS", str(30 * 24 * 3600)))  # 0 = keep forever
+UPLOAD_STORE_MAX_ENTRIES: int = int(os.getenv("UPLOAD_STORE_MAX_ENTRIES", "10000"))  # least recently used dropped first
+
+# Background Job Configuration
+JOB_STORE_PATH: str = os.getenv("JOB_STORE_PATH", os.path.join(".cache", "jobs.sqlite3"))
+JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "4"))
+JOB_POLL_SECONDS: float = float(os.getenv("JOB_POLL_SECONDS", "0.5"))  # UI progress refresh interval
+JOB_TTL_SECONDS: int = int(os.getenv("JOB_TTL_SECONDS", str(7 * 24 * 3600)))  # finished jobs kept this long
+JOB_STALE_SECONDS: int = int(os.getenv("JOB_STALE_SECONDS", "600"))  # silent running jobs are requeued on startup
+JOB_MAX_FINISHED: int = int(os.getenv("JOB_MAX_FINISHED", "20000"))  # oldest finished jobs beyond this are purged
+
+# Speculative Prefetch (stages started in the background as soon as a resume is read)
+PREFETCH: bool = os.getenv("PREFETCH", "false").lower() in ("1", "true", "yes")
+PREFETCH_STAGES: List[str] = [
+    stage.strip() for stage in os.getenv("PREFETCH_STAGES", "enhance,scores,summary").split(",") if stage.strip()
+]
+PREFETCH_MAX_RUNNING: int = int(os.getenv("PREFETCH_MAX_RUNNING", "2"))  # across sessions; requested jobs always go first
+PREFETCH_MAX_PENDING: int = int(os.getenv("PREFETCH_MAX_PENDING", "30"))  # queued or running; further prefetches are skipped
+
+# Memory Governance
+SQLITE_CACHE_KB: int = int(os.getenv("SQLITE_CACHE_KB", "2048"))  # page cache per SQLite connection
+SESSION_IDLE_SECONDS: int = int(os.getenv("SESSION_IDLE_SECONDS", "3600"))  # idle sessions drop out of memory accounting
+RELEASE_UPLOADS: bool = os.getenv("RELEASE_UPLOADS", "true").lower() in ("1", "true", "yes")  # free upload buffers after extraction
+MATCH_INDEX_MAX_DOCS: int = int(os.getenv("MATCH_INDEX_MAX_DOCS", "5000"))  # oldest resumes leave the in-memory match index
+
+# Batch Processing Configuration
+BATCH_EXTRACT_WORKERS: int = int(os.getenv("BATCH_EXTRACT_WORKERS", str(os.cpu_count() or 1)))
+BATCH_LLM_CONCURRENCY: int = int(os.getenv("BATCH_LLM_CONCURRENCY", "4"))
+# Bulk mode (batch.py --bulk) packs several resumes into one request; keep the
+# pack small enough that all enhanced resumes fit in the model's output limit
+BULK_PACK_TOKENS: int = int(os.getenv("BULK_PACK_TOKENS", "6000"))
+BULK_MAX_ITEMS: int = int(os.getenv("BULK_MAX_ITEMS", "6"))
+BULK_MAX_ATTEMPTS: int = int(os.getenv("BULK_MAX_ATTEMPTS", "3"))  # packed attempts before one request per resume
+
 # Resume Sections
 RESUME_SECTIONS: List[str] = [
     "Objective",
@@ -32,6 +132,32 @@ RESUME_SECTIONS: List[str] = [
     "Declaration"
 ]
 
+# Alternative headings recognized for each section when parsing resume text.
+# Extend via SECTION_ALIASES='{"Skills": ["Toolbox"]}' in .env.
+SECTION_ALIASES: Dict[str, List[str]] = {
+    "Objective": ["Career Objective", "Professional Summary", "Summary", "Profile"],
+    "Education": ["Academic Background", "Academic Qualifications", "Educational Qualifications"],
+    "Experience": ["Work Experience", "Professional Experience", "Work History",
+                   "Employment History", "Employment", "Internships"],
+    "Skills": ["Technical Skills", "Key Skills", "Core Competencies", "Skill Set"],
+    "Projects": ["Academic Projects", "Personal Projects", "Key Projects"],
+    "Certifications": ["Certificates", "Licenses & Certifications", "Licenses and Certifications"],
+    "Extracurricular Activities": ["Extracurriculars", "Extra-Curricular Activities",
+                                   "Activities", "Volunteering"],
+    "Declaration": [],
+}
+for _section, _aliases in json.loads(os.getenv("SECTION_ALIASES", "{}")).items():
+    SECTION_ALIASES.setdefault(_section, []).extend(_aliases)
+
+# Quality Criteria (scored 0-100 by the quality analysis)
+QUALITY_CRITERIA: List[str] = [
+    "Grammar & Spelling",
+    "Clarity & Conciseness",
+    "Structure & Formatting",
+    "Keyword Optimization",
+    "Completeness of Sections"
+]
+
 # Validation
 def validate_config() -> tuple[bool, str]:
     """
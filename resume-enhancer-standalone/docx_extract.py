@@ -0,0 +1,128 @@
+"""
+Streaming DOCX text extraction.
+Reads word/document.xml with a single iterparse pass instead of building a
+python-docx object graph, keeping body order and including tables, text boxes,
+and header/footer parts.
+"""
+
+import re
+import zipfile
+from typing import BinaryIO, Iterator, List, Union
+from xml.etree.ElementTree import iterparse
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+
+DOCUMENT_PART = "word/document.xml"
+HEADER_FOOTER_PART = re.compile(r"^word/(header|footer)\d*\.xml$")
+
+# Containers whose paragraphs are collected separately and flushed as a unit
+_TABLE_CELL = W + "tc"
+_TABLE_ROW = W + "tr"
+_TEXT_BOX = W + "txbxContent"
+
+
+def iter_part_lines(stream: BinaryIO) -> Iterator[str]:
+    """
+    Yield the non-empty text lines of one WordprocessingML part, in order.
+
+    Paragraphs become lines, table rows become one line with cells separated
+    by " | ", and text-box paragraphs are emitted in place. Fallback copies
+    of text boxes (mc:Fallback) are skipped so they are not read twice.
+
+    Args:
+        stream: Readable XML part (e.g. word/document.xml)
+
+    Yields:
+        str: One line of text
+    """
+    paragraphs: List[List[str]] = []   # open paragraphs (text boxes nest them)
+    containers: List[List[str]] = []   # open cells and text boxes
+    rows: List[List[str]] = []         # open table rows
+    pending: List[str] = []            # finished top-level lines not yet yielded
+    open_elements: List = []           # ancestors of the current element
+    fallback_depth = 0
+
+    def emit(line: str) -> None:
+        if not line.strip():
+            return
+        (containers[-1] if containers else pending).append(line)
+
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            open_elements.append(elem)
+            if tag == MC + "Fallback":
+                fallback_depth += 1
+            elif fallback_depth:
+                continue
+            elif tag == W + "p":
+                paragraphs.append([])
+            elif tag in (_TABLE_CELL, _TEXT_BOX):
+                containers.append([])
+            elif tag == _TABLE_ROW:
+                rows.append([])
+            continue
+
+        open_elements.pop()
+        if tag == MC + "Fallback":
+            fallback_depth -= 1
+        elif fallback_depth:
+            pass
+        elif tag == W + "t":
+            if paragraphs and elem.text:
+                paragraphs[-1].append(elem.text)
+        elif tag == W + "tab":
+            if paragraphs:
+                paragraphs[-1].append("\t")
+        elif tag in (W + "br", W + "cr"):
+            if paragraphs:
+                paragraphs[-1].append("\n")
+        elif tag == W + "p":
+            emit("".join(paragraphs.pop()))
+        elif tag == _TABLE_CELL:
+            cell = " ".join(line.strip() for line in containers.pop())
+            if rows:
+                rows[-1].append(cell)
+        elif tag == _TABLE_ROW:
+            emit(" | ".join(cell for cell in rows.pop() if cell))
+        elif tag == _TEXT_BOX:
+            for line in containers.pop():
+                emit(line)
+
+        # Drop finished top-level blocks so memory stays flat on large files
+        if len(open_elements) <= 2:
+            elem.clear()
+            if open_elements:
+                open_elements[-1].remove(elem)
+        if pending:
+            yield from pending
+            pending.clear()
+
+
+def extract_docx_text(file: Union[str, BinaryIO], include_headers: bool = True) -> str:
+    """
+    Extract all text from a DOCX file in reading order.
+
+    Args:
+        file: Path or binary file object
+        include_headers: Prepend header lines and append footer lines
+
+    Returns:
+        str: Extracted text, one paragraph or table row per line
+    """
+    with zipfile.ZipFile(file) as archive:
+        names = archive.namelist()
+        headers: List[str] = []
+        footers: List[str] = []
+        if include_headers:
+            for name in sorted(n for n in names if HEADER_FOOTER_PART.match(n)):
+                target = headers if "/header" in name else footers
+                with archive.open(name) as part:
+                    for line in iter_part_lines(part):
+                        # Default, first-page and even-page parts often repeat
+                        if line not in target:
+                            target.append(line)
+        with archive.open(DOCUMENT_PART) as part:
+            body = list(iter_part_lines(part))
+    return "\n".join(headers + body + footers)
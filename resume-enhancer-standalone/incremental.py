@@ -0,0 +1,187 @@
+"""
+Incremental re-enhancement: only sections whose content changed are sent.
+The resume is split with parse_sections and every section is looked up in the
+response cache by its heading and content. Full enhancements seed those
+entries (see resume_ai._store), so after editing one section of an enhanced
+resume only that section goes to Gemini; the rest is reused.
+
+Each section comes back with a structured diff between its original and
+improved text, and the corrections list is derived from those diffs instead
+of being parsed from free text.
+
+Usage:
+    result = enhance_incremental(edited_text)
+    result.sections["Experience"], result.diffs["Experience"], result.enhanced
+"""
+
+import asyncio
+import difflib
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import config
+import resume_ai
+from chunking import apply_token_budget
+from scheduler import propagate
+
+MAX_FRAGMENT_CHARS = 80
+
+
+@dataclass
+class IncrementalEnhancement:
+    """
+    Result of an incremental run.
+
+    Attributes:
+        sections: Improved content per section (resume_ai.NO_DATA where absent)
+        corrections: One readable line per change, derived from the diffs
+        diffs: Section name mapped to its changes (see diff_section)
+        enhanced: Sections sent to Gemini in this run
+        reused: Sections whose improvement came from the cache
+    """
+    sections: Dict[str, str]
+    corrections: List[str]
+    diffs: Dict[str, List[Dict[str, str]]] = field(default_factory=dict)
+    enhanced: List[str] = field(default_factory=list)
+    reused: List[str] = field(default_factory=list)
+
+
+def _words(lines: List[str]) -> List[str]:
+    return " ".join(lines).split()
+
+
+def diff_section(original: str, improved: str) -> List[Dict[str, str]]:
+    """
+    Structured diff between two versions of a section.
+
+    Lines are aligned first; within replaced lines the change is narrowed
+    down to the differing words, so a reworded bullet yields just the
+    rewritten phrase.
+
+    Args:
+        original: Section content before enhancement
+        improved: Section content after enhancement
+
+    Returns:
+        list: Changes in order, each {"op": "replace" | "insert" | "delete",
+            "before": ..., "after": ...}
+    """
+    before_lines = [line.strip() for line in original.splitlines() if line.strip()]
+    after_lines = [line.strip() for line in improved.splitlines() if line.strip()]
+    changes: List[Dict[str, str]] = []
+    lines = difflib.SequenceMatcher(None, before_lines, after_lines, autojunk=False)
+    for op, i1, i2, j1, j2 in lines.get_opcodes():
+        if op in ("insert", "delete"):
+            changes.append({"op": op, "before": "\n".join(before_lines[i1:i2]),
+                            "after": "\n".join(after_lines[j1:j2])})
+        elif op == "replace":
+            before, after = _words(before_lines[i1:i2]), _words(after_lines[j1:j2])
+            words = difflib.SequenceMatcher(None, before, after, autojunk=False)
+            for word_op, w1, w2, v1, v2 in words.get_opcodes():
+                if word_op != "equal":
+                    changes.append({"op": word_op, "before": " ".join(before[w1:w2]),
+                                    "after": " ".join(after[v1:v2])})
+    return changes
+
+
+def describe_change(section: str, change: Dict[str, str]) -> str:
+    """One readable correction line for a diff_section change."""
+    before = textwrap.shorten(change["before"], MAX_FRAGMENT_CHARS, placeholder="…")
+    after = textwrap.shorten(change["after"], MAX_FRAGMENT_CHARS, placeholder="…")
+    if change["op"] == "insert":
+        return f"{section}: added \"{after}\""
+    if change["op"] == "delete":
+        return f"{section}: removed \"{before}\""
+    return f"{section}: \"{before}\" → \"{after}\""
+
+
+def _plan(resume_text: str) -> Optional[Dict[str, Optional[str]]]:
+    """
+    Original sections mapped to their cached improvement (None when not cached).
+    Returns None when the text needs a regular enhancement instead: it has no
+    recognizable sections, or nothing about it is cached yet (one full request
+    is cheaper than a request per section).
+    """
+    original = resume_ai.parse_sections(resume_text)
+    present = {name: content for name, content in original.items() if content != resume_ai.NO_DATA}
+    if not present:
+        return None
+    cached = {name: resume_ai.cached_section(name, content) for name, content in present.items()}
+    if all(value is None for value in cached.values()):
+        return None
+    return cached
+
+
+def _assemble(resume_text: str, improved: Dict[str, str], enhanced: List[str]) -> IncrementalEnhancement:
+    """Build the result for improved sections, diffing each against the original."""
+    original = resume_ai.parse_sections(resume_text)
+    result = IncrementalEnhancement(
+        sections={name: improved.get(name, resume_ai.NO_DATA) for name in config.RESUME_SECTIONS},
+        corrections=[],
+        enhanced=enhanced,
+        reused=[name for name in improved if name not in enhanced],
+    )
+    for name, content in improved.items():
+        if original.get(name, resume_ai.NO_DATA) == resume_ai.NO_DATA:
+            continue
+        changes = diff_section(original[name], content)
+        result.diffs[name] = changes
+        result.corrections.extend(describe_change(name, change) for change in changes)
+    return result
+
+
+def _from_full(resume_text: str, sections: Dict[str, str], corrections: List[str],
+               fresh: bool) -> IncrementalEnhancement:
+    """Result for a text that took a regular (whole-resume) enhancement."""
+    improved = {name: content for name, content in sections.items() if content != resume_ai.NO_DATA}
+    result = _assemble(resume_text, improved, list(improved) if fresh else [])
+    if not result.diffs:
+        # No recognizable sections to diff against: keep Gemini's own list
+        result.corrections = corrections
+    return result
+
+
+def enhance_incremental(resume_text: str) -> IncrementalEnhancement:
+    """
+    Enhance a resume, sending only sections that are not cached yet.
+
+    Args:
+        resume_text: Resume text, typically an edited version of an enhanced resume
+
+    Returns:
+        IncrementalEnhancement: Sections, per-section diffs and what was reused
+
+    Raises:
+        ResumeTooLongError: If the text exceeds the token ceiling and the policy is "refuse"
+        Exception: If a Gemini request fails
+    """
+    resume_text, _ = apply_token_budget(resume_text)
+    plan = _plan(resume_text)
+    if plan is None:
+        fresh = resume_ai.cached_enhancement(resume_text) is None
+        return _from_full(resume_text, *resume_ai.enhance_resume(resume_text), fresh)
+    original = resume_ai.parse_sections(resume_text)
+    changed = [name for name, value in plan.items() if value is None]
+    improved = {name: value for name, value in plan.items() if value is not None}
+    if changed:
+        with ThreadPoolExecutor(max_workers=min(len(changed), config.LLM_MAX_CONCURRENCY)) as pool:
+            results = pool.map(propagate(lambda name: resume_ai.enhance_section(name, original[name])), changed)
+            improved.update(zip(changed, results))
+    return _assemble(resume_text, {name: improved[name] for name in plan}, changed)
+
+
+async def enhance_incremental_async(resume_text: str) -> IncrementalEnhancement:
+    """Asyncio version of enhance_incremental."""
+    resume_text, _ = apply_token_budget(resume_text)
+    plan = _plan(resume_text)
+    if plan is None:
+        fresh = resume_ai.cached_enhancement(resume_text) is None
+        return _from_full(resume_text, *await resume_ai.enhance_resume_async(resume_text), fresh)
+    original = resume_ai.parse_sections(resume_text)
+    changed = [name for name, value in plan.items() if value is None]
+    improved = {name: value for name, value in plan.items() if value is not None}
+    results = await asyncio.gather(*(resume_ai.enhance_section_async(name, original[name]) for name in changed))
+    improved.update(zip(changed, results))
+    return _assemble(resume_text, {name: improved[name] for name in plan}, changed)
@@ -0,0 +1,541 @@
+"""
+Background job queue for extraction and Gemini stages.
+Jobs live in a SQLite file and are executed by a pool of worker threads, so a
+Streamlit rerun or page refresh never cancels or repeats work: the UI submits
+a job, keeps its id, and polls for progress and results.
+
+Job ids are derived from the input and the model/prompt versions, so
+submitting the same resume again returns the existing job (and its result)
+instead of queueing new work. The same holds for speculative (prefetched)
+jobs: a later submit_text for the same stage finds and promotes them.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import config
+import metrics
+
+QUEUED, RUNNING, DONE, ERROR = "queued", "running", "done", "error"
+
+# Job.prefetch values: asked for, speculative, speculative for a text the session moved on from
+REQUESTED, PREFETCHED, ABANDONED = 0, 1, 2
+
+# Stages a job can run on extracted text, in execution order
+STAGES: List[str] = ["analysis", "enhance", "incremental", "scores", "summary"]
+
+
+class JobCancelled(RuntimeError):
+    """Raised inside an abandoned prefetch to stop it at its next step or Gemini request."""
+
+
+@dataclass
+class Job:
+    """Snapshot of one job's state."""
+    id: str
+    kind: str
+    stages: List[str]
+    status: str
+    progress: float
+    message: str
+    result: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    created: float = 0.0
+    updated: float = 0.0
+    prefetch: int = REQUESTED
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, ERROR)
+
+    @property
+    def prefetched(self) -> bool:
+        """Started speculatively and not asked for (yet)."""
+        return self.prefetch != REQUESTED
+
+
+class JobStore:
+    """
+    SQLite-backed job table shared by every worker and app replica on a host.
+
+    Args:
+        path: Database file
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY,"
+                " kind TEXT NOT NULL,"
+                " stages TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " progress REAL NOT NULL DEFAULT 0,"
+                " message TEXT NOT NULL DEFAULT '',"
+                " payload BLOB,"
+                " filename TEXT,"
+                " result TEXT NOT NULL DEFAULT '{}',"
+                " error TEXT,"
+                " created REAL NOT NULL,"
+                " updated REAL NOT NULL,"
+                " tenant TEXT NOT NULL DEFAULT '',"
+                " prefetch INTEGER NOT NULL DEFAULT 0)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, created)")
+            # Job tables created before tenants and prefetching were recorded
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, definition in (("tenant", "TEXT NOT NULL DEFAULT ''"),
+                                       ("prefetch", "INTEGER NOT NULL DEFAULT 0")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA cache_size=-{config.SQLITE_CACHE_KB}")
+            self._local.conn = conn
+        return conn
+
+    def create(self, job_id: str, kind: str, stages: List[str], payload: bytes,
+               filename: Optional[str], tenant: str = "", prefetch: bool = False) -> bool:
+        """
+        Insert a queued job unless one with this id exists and has not failed.
+        tenant is who the job's Gemini requests are scheduled for; prefetch
+        marks a speculative job (see JobQueue.prefetch).
+
+        Returns:
+            bool: True if the job was (re)queued
+        """
+        now = time.time()
+        with self._connect() as conn:
+            # Check and insert in one write transaction, so concurrent submits queue one job
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is not None and row[0] != ERROR:
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, kind, stages, status, progress, message, payload,"
+                " filename, result, error, created, updated, tenant, prefetch)"
+                " VALUES (?, ?, ?, ?, 0, 'Queued', ?, ?, '{}', NULL, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(stages), QUEUED, payload, filename, now, now, tenant,
+                 PREFETCHED if prefetch else REQUESTED),
+            )
+        return True
+
+    def claim(self, max_prefetch_running: int = 0) -> Optional[tuple]:
+        """
+        Atomically take the oldest queued job, requested jobs before prefetched ones.
+
+        Args:
+            max_prefetch_running: Prefetched jobs are only taken while fewer
+                than this are running (0 = no limit)
+
+        Returns:
+            tuple: (id, kind, stages, payload, filename, tenant, prefetched),
+                or None if the queue is empty
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id, kind, stages, payload, filename, tenant, prefetch FROM jobs"
+                " WHERE status = ? AND (prefetch = ? OR ? = 0 OR"
+                "  (SELECT COUNT(*) FROM jobs WHERE status = ? AND prefetch != ?) < ?)"
+                " ORDER BY prefetch != ?, created LIMIT 1",
+                (QUEUED, REQUESTED, max_prefetch_running, RUNNING, REQUESTED, max_prefetch_running, REQUESTED),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, message = 'Starting', updated = ? WHERE id = ?",
+                (RUNNING, now, row[0]),
+            )
+        job_id, kind, stages, payload, filename, tenant, prefetch = row
+        return job_id, kind, json.loads(stages), payload, filename, tenant, prefetch != REQUESTED
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        """Set progress/message/result/status/error fields and bump updated."""
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"])
+        fields["updated"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return the job with this id, or None if unknown or purged."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, kind, stages, status, progress, message, result, error, created, updated, prefetch"
+                " FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return Job(row[0], row[1], json.loads(row[2]), row[3], row[4], row[5],
+                   json.loads(row[6]), row[7], row[8], row[9], row[10])
+
+    def promote(self, job_id: str) -> Optional[tuple]:
+        """
+        Mark a prefetched job as asked for.
+
+        Returns:
+            tuple: (status, prefetch) it had, or None if it was not prefetched
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT status, prefetch FROM jobs WHERE id = ? AND prefetch != ?",
+                               (job_id, REQUESTED)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE jobs SET prefetch = ? WHERE id = ?", (REQUESTED, job_id))
+        return row
+
+    def prefetch_state(self, job_id: str) -> Optional[int]:
+        """The job's prefetch value (REQUESTED, PREFETCHED or ABANDONED), or None if unknown."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT prefetch FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def pending_prefetches(self) -> int:
+        """Prefetched jobs queued or running, across all tenants."""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM jobs WHERE status IN (?, ?) AND prefetch = ?",
+                                (QUEUED, RUNNING, PREFETCHED)).fetchone()[0]
+
+    def cancel_prefetches(self, tenant: str, keep: List[str]) -> tuple:
+        """
+        Drop a tenant's prefetched jobs other than keep: queued ones are
+        deleted, started ones are marked abandoned and stop at their next
+        step or Gemini request (responses they already got stay cached).
+
+        Returns:
+            tuple: (cancelled, abandoned) job counts
+        """
+        others = f"tenant = ? AND prefetch = ? AND id NOT IN ({', '.join('?' * len(keep))})"
+        with self._connect() as conn:
+            cancelled = conn.execute(f"DELETE FROM jobs WHERE status = ? AND {others}",
+                                     (QUEUED, tenant, PREFETCHED, *keep)).rowcount
+            abandoned = conn.execute(f"UPDATE jobs SET prefetch = ? WHERE {others}",
+                                     (ABANDONED, tenant, PREFETCHED, *keep)).rowcount
+        return cancelled, abandoned
+
+    def requeue_stale(self, stale_seconds: float) -> int:
+        """Requeue running jobs whose worker stopped reporting (e.g. a killed replica)."""
+        with self._connect() as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = ?, message = 'Requeued' WHERE status = ? AND updated < ?",
+                (QUEUED, RUNNING, time.time() - stale_seconds),
+            ).rowcount
+
+    def purge(self, ttl_seconds: float, max_finished: int = 0) -> int:
+        """
+        Delete finished jobs last updated more than ttl_seconds ago (0 = no TTL),
+        then the oldest finished jobs beyond max_finished (0 = no limit).
+        Prefetched jobs purged without ever being asked for count as wasted.
+        """
+        removed = 0
+        with self._connect() as conn:
+            if ttl_seconds:
+                expired = "status IN (?, ?) AND updated < ?"
+                params = (DONE, ERROR, time.time() - ttl_seconds)
+                wasted = conn.execute(f"SELECT COUNT(*) FROM jobs WHERE {expired} AND prefetch = ?",
+                                      (*params, PREFETCHED)).fetchone()[0]
+                metrics.PREFETCH_JOBS.inc(wasted, outcome="wasted")
+                removed += conn.execute(f"DELETE FROM jobs WHERE {expired}", params).rowcount
+            if max_finished:
+                oldest = "SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY updated DESC LIMIT -1 OFFSET ?"
+                params = (DONE, ERROR, max_finished)
+                wasted = conn.execute(f"SELECT COUNT(*) FROM jobs WHERE id IN ({oldest}) AND prefetch = ?",
+                                      (*params, PREFETCHED)).fetchone()[0]
+                metrics.PREFETCH_JOBS.inc(wasted, outcome="wasted")
+                removed += conn.execute(f"DELETE FROM jobs WHERE id IN ({oldest})", params).rowcount
+        return removed
+
+
+def make_job_id(kind: str, stages: List[str], payload: bytes) -> str:
+    """
+    Deterministic job id for an input, so resubmissions map to the same job.
+
+    The model, prompt versions and scoring mode are part of the id, so
+    changing any of them produces fresh jobs instead of returning stale results.
+    """
+    import resume_ai
+
+    digest = hashlib.sha256()
+    for part in (kind, ",".join(stages), config.GEMINI_MODEL, config.QUALITY_SCORING_MODE,
+                 json.dumps(resume_ai.PROMPT_VERSIONS, sort_keys=True)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    digest.update(payload)
+    return digest.hexdigest()[:24]
+
+
+# --- Job Execution ---
+
+Report = Callable[..., None]
+
+
+def _run_extract(payload: bytes, filename: str, report: Report) -> Dict[str, Any]:
+    """Extract, normalize and budget an uploaded file, and store the result under its file hash."""
+    import io
+
+    from chunking import apply_token_budget
+    from resume_utils import extract_text, file_digest
+    from text_normalize import normalize_resume_text
+    from upload_store import get_upload_store, make_record
+
+    report(0.1, "Reading your resume")
+    started = time.perf_counter()
+    raw = extract_text(io.BytesIO(payload), filename)
+    report(0.7, "Cleaning up text")
+    with metrics.timed("normalize"):
+        normalized = normalize_resume_text(raw)
+    text, truncated = apply_token_budget(normalized.text)
+    record = make_record(filename, normalized, text, truncated, time.perf_counter() - started)
+    get_upload_store().put(file_digest(io.BytesIO(payload)), len(payload), record)
+    return record
+
+
+def _run_stages(text: str, stages: List[str], report: Report) -> Dict[str, Any]:
+    """Run Gemini stages on extracted text, reporting partial results as they land."""
+    from dataclasses import asdict
+
+    import resume_ai
+
+    result: Dict[str, Any] = {}
+    for index, stage in enumerate(stages):
+        base = index / len(stages)
+        report(base, f"Running {stage}", result)
+        if stage == "analysis":
+            result["analysis"] = asdict(resume_ai.analyze_resume(text))
+        elif stage == "enhance" and config.STREAM_ENHANCEMENT:
+            partial: Dict[str, str] = {}
+            for event in resume_ai.stream_enhance_resume(text):
+                if event[0] == "section":
+                    partial[event[1]] = event[2]
+                    result["partial_sections"] = dict(partial)
+                    report(base + 0.9 * len(partial) / len(config.RESUME_SECTIONS) / len(stages),
+                           f"Enhanced {event[1]}", result)
+                else:
+                    result.pop("partial_sections", None)
+                    result["enhance"] = {"sections": event[1], "corrections": event[2]}
+        elif stage == "enhance":
+            sections, corrections = resume_ai.enhance_resume(text)
+            result["enhance"] = {"sections": sections, "corrections": corrections}
+        elif stage == "incremental":
+            from incremental import enhance_incremental
+
+            result["incremental"] = asdict(enhance_incremental(text))
+        elif stage == "scores":
+            result["scores"] = resume_ai.get_quality_scores(text)
+        elif stage == "summary":
+            result["summary"] = resume_ai.get_resume_summary(text)
+    return result
+
+
+class JobQueue:
+    """
+    Submits jobs to a JobStore and runs them on daemon worker threads.
+
+    Args:
+        store: Job table
+        workers: Worker threads in this process
+        poll_seconds: How often idle workers check for jobs queued by other processes
+        ttl_seconds: Finished jobs older than this are purged (0 = keep)
+        max_finished: Oldest finished jobs beyond this count are purged (0 = no limit)
+        max_prefetch_running: Prefetched jobs running at once, store-wide (0 = no limit)
+        max_prefetch_pending: Prefetched jobs queued or running, store-wide;
+            prefetch() skips stages beyond it (0 = no limit)
+    """
+
+    def __init__(self, store: JobStore, workers: int, poll_seconds: float = 1.0,
+                 ttl_seconds: float = 0, max_finished: int = 0,
+                 max_prefetch_running: int = 0, max_prefetch_pending: int = 0) -> None:
+        self.store = store
+        self.poll_seconds = poll_seconds
+        self.ttl_seconds = ttl_seconds
+        self.max_finished = max_finished
+        self.max_prefetch_running = max_prefetch_running
+        self.max_prefetch_pending = max_prefetch_pending
+        self._next_purge = 0.0
+        self._wakeup = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"job-worker-{n}", daemon=True)
+            for n in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit_file(self, data: bytes, filename: str) -> str:
+        """Queue extraction of an uploaded file and return its job id."""
+        return self._submit("extract", [], data, filename)
+
+    def submit_text(self, text: str, stages: List[str], tenant: str = "") -> str:
+        """
+        Queue Gemini stages for extracted text and return the job id.
+        Their requests are scheduled fairly per tenant (e.g. a browser session).
+        A prefetched job for the same stages is promoted instead.
+        """
+        ordered = [stage for stage in STAGES if stage in stages]
+        payload = text.encode("utf-8")
+        promoted = self.store.promote(make_job_id("stages", ordered, payload))
+        if promoted is not None and promoted[1] == PREFETCHED:
+            # Ready, still under way, or failed (and queued again below)
+            outcome = {DONE: "hit", ERROR: "failed"}.get(promoted[0], "partial")
+            metrics.PREFETCH_JOBS.inc(outcome=outcome)
+        return self._submit("stages", ordered, payload, None, tenant)
+
+    def prefetch(self, text: str, stages: List[str], tenant: str) -> List[str]:
+        """
+        Speculatively queue one job per stage, before anyone asks for it.
+
+        The jobs stay hidden (Job.prefetched) until submit_text asks for the
+        same stage, run after requested jobs and in the scheduler's batch
+        lane (the interactive lane once asked for), and are limited by
+        max_prefetch_running and max_prefetch_pending. The tenant's prefetches
+        for another text are cancelled, running ones at their next step.
+
+        Args:
+            text: Extracted resume text
+            stages: Stages to prefetch (one job each)
+            tenant: Session the jobs are for
+
+        Returns:
+            list: Ids of the jobs queued
+        """
+        payload = text.encode("utf-8")
+        ordered = [stage for stage in STAGES if stage in stages]
+        ids = [make_job_id("stages", [stage], payload) for stage in ordered]
+        cancelled, abandoned = self.store.cancel_prefetches(tenant, keep=ids)
+        metrics.PREFETCH_JOBS.inc(cancelled, outcome="cancelled")
+        metrics.PREFETCH_JOBS.inc(abandoned, outcome="wasted")
+        queued = []
+        for job_id, stage in zip(ids, ordered):
+            if self.max_prefetch_pending and self.store.pending_prefetches() >= self.max_prefetch_pending:
+                metrics.PREFETCH_JOBS.inc(outcome="skipped")
+                continue
+            if self.store.create(job_id, "stages", [stage], payload, None, tenant, prefetch=True):
+                metrics.PREFETCH_JOBS.inc(outcome="submitted")
+                queued.append(job_id)
+        if queued:
+            self._wakeup.set()
+        return queued
+
+    def _submit(self, kind: str, stages: List[str], payload: bytes, filename: Optional[str],
+                tenant: str = "") -> str:
+        job_id = make_job_id(kind, stages, payload)
+        if self.store.create(job_id, kind, stages, payload, filename, tenant):
+            self._wakeup.set()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return the current state of a job."""
+        return self.store.get(job_id)
+
+    def find_text(self, text: str, stages: List[str]) -> Optional[Job]:
+        """Return the job submit_text would reuse for this text and stages, if any."""
+        ordered = [stage for stage in STAGES if stage in stages]
+        return self.get(make_job_id("stages", ordered, text.encode("utf-8")))
+
+    def wait(self, job_id: str, timeout: Optional[float] = None, interval: float = 0.2) -> Optional[Job]:
+        """Block until the job finishes or timeout elapses; returns its last state."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job.finished or (deadline and time.monotonic() >= deadline):
+                return job
+            time.sleep(interval)
+
+    def _work(self) -> None:
+        while True:
+            claimed = self.store.claim(self.max_prefetch_running)
+            if claimed is None:
+                self._purge_expired()
+                self._wakeup.wait(self.poll_seconds)
+                self._wakeup.clear()
+                continue
+            self._execute(*claimed)
+
+    def _purge_expired(self) -> None:
+        """Drop expired results, at most once an hour, from whichever worker is idle."""
+        if not (self.ttl_seconds or self.max_finished) or time.monotonic() < self._next_purge:
+            return
+        self._next_purge = time.monotonic() + 3600
+        self.store.purge(self.ttl_seconds, self.max_finished)
+
+    def _execute(self, job_id: str, kind: str, stages: List[str], payload: bytes,
+                 filename: Optional[str], tenant: str, prefetched: bool) -> None:
+        from scheduler import BATCH, DEFAULT_TENANT, INTERACTIVE, request_context
+
+        def lane() -> str:
+            """Lane for the next Gemini request, read from the row so a promoted prefetch moves up."""
+            state = self.store.prefetch_state(job_id)
+            if state == ABANDONED:
+                raise JobCancelled("Cancelled: the session moved on to another resume")
+            return BATCH if state == PREFETCHED else INTERACTIVE
+
+        def report(progress: float, message: str, result: Optional[Dict[str, Any]] = None) -> None:
+            if prefetched:
+                lane()  # stops an abandoned prefetch between steps
+            fields: Dict[str, Any] = {"progress": round(progress, 3), "message": message}
+            if result is not None:
+                fields["result"] = result
+            self.store.update(job_id, **fields)
+
+        def on_wait(position: int) -> None:
+            # Backpressure for the UI, which shows the job message next to its progress
+            self.store.update(job_id, message=f"position {position} in the Gemini queue")
+
+        try:
+            with metrics.span("job", id=job_id, kind=kind), metrics.timed(f"job_{kind}"), \
+                    request_context(tenant=tenant or DEFAULT_TENANT, lane=INTERACTIVE, on_wait=on_wait,
+                                    lane_source=lane if prefetched else None):
+                if kind == "extract":
+                    result = _run_extract(payload, filename or "", report)
+                else:
+                    result = _run_stages(payload.decode("utf-8"), stages, report)
+            # The input is no longer needed once the job has succeeded
+            self.store.update(job_id, status=DONE, progress=1.0, message="Done",
+                              result=result, payload=None)
+        except JobCancelled as e:
+            # Failed, so asking for this stage later queues it afresh
+            self.store.update(job_id, status=ERROR, message="Cancelled", error=str(e))
+        except Exception as e:
+            self.store.update(job_id, status=ERROR, message="Failed", error=str(e))
+        if prefetched:
+            # A prefetch slot is free again for workers idling on the limit
+            self._wakeup.set()
+
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Return the process-wide job queue configured in config.py.
+
+    The first call requeues jobs orphaned by a crashed process and starts
+    the worker threads, which also purge expired results while idle.
+    """
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            store = JobStore(config.JOB_STORE_PATH)
+            store.requeue_stale(config.JOB_STALE_SECONDS)
+            _queue = JobQueue(store, workers=config.JOB_WORKERS, ttl_seconds=config.JOB_TTL_SECONDS,
+                              max_finished=config.JOB_MAX_FINISHED,
+                              max_prefetch_running=config.PREFETCH_MAX_RUNNING,
+                              max_prefetch_pending=config.PREFETCH_MAX_PENDING)
+        return _queue
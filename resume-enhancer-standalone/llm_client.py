@@ -0,0 +1,375 @@
+"""
+Shared Gemini client.
+Reuses a single configured model instance and wraps every request with an
+in-flight limit (granted fairly between tenants, see scheduler.py), a
+token-bucket rate limiter and jittered exponential backoff, for both blocking
+callers (Streamlit) and asyncio callers (batch CLI).
+
+Point GEMINI_API_ENDPOINT at a local fake server to exercise the client
+without a real API key or quota.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Iterator, Optional
+
+import config
+import metrics
+from scheduler import BATCH, INTERACTIVE, FairScheduler
+
+# google.generativeai takes about a second to import, so it is loaded on first
+# request rather than with this module (see _sdk)
+genai: Any = None
+
+# HTTP status codes worth retrying: timeout, rate limit, transient server errors.
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+
+    Tokens refill continuously at rate_per_minute up to capacity. Each request
+    reserves one token; if none is available the caller is told how long to wait.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None) -> None:
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_minute / 60.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Reserve one token and return the number of seconds to wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Block until a token is available."""
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Wait without blocking the event loop until a token is available."""
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Decide whether a failed request should be retried.
+
+    google.api_core exceptions carry the HTTP status in ``code``; timeouts and
+    dropped connections are retried as well.
+    """
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    return getattr(error, "code", None) in RETRYABLE_STATUS_CODES
+
+
+def _chunk_text(chunk: Any) -> str:
+    """Return a streamed chunk's text, or "" for chunks without text parts."""
+    try:
+        return chunk.text
+    except ValueError:
+        return ""
+
+
+class LLMClient:
+    """
+    Gemini client with bounded concurrency, rate limiting and retries.
+
+    Args:
+        model_name: Gemini model to use
+        max_concurrency: Maximum requests in flight across all threads and event loops
+        requests_per_minute: Token-bucket refill rate (0 disables rate limiting)
+        max_retries: Retries after the first attempt for retryable errors
+        timeout: Per-request timeout in seconds
+        backoff_base: Initial backoff in seconds, doubled on each retry
+        backoff_max: Upper bound for a single backoff in seconds
+        scheduler: Grants in-flight slots (defaults to a fair scheduler with
+            max_concurrency slots)
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        max_concurrency: int,
+        requests_per_minute: float,
+        max_retries: int,
+        timeout: float,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        scheduler: Optional[FairScheduler] = None,
+    ) -> None:
+        self.model_name = model_name
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_limiter = TokenBucket(requests_per_minute)
+        self.scheduler = scheduler or FairScheduler(max_concurrency)
+        self._model = None
+        self._model_lock = threading.Lock()
+
+    @property
+    def model(self) -> Any:
+        """The shared GenerativeModel, created and configured on first use."""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    configure()
+                    self._model = _sdk().GenerativeModel(self.model_name)
+        return self._model
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry attempt (0-based)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _request_options(self, kwargs: dict) -> dict:
+        options = dict(kwargs.pop("request_options", None) or {})
+        options.setdefault("timeout", self.timeout)
+        return options
+
+    def _observe(self, started: float) -> None:
+        metrics.LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, model=self.model_name)
+
+    def _count_retry(self, error: BaseException) -> None:
+        reason = getattr(error, "code", None) or type(error).__name__
+        metrics.LLM_RETRIES.inc(stage=metrics.current_stage(), reason=reason)
+
+    def generate_content(self, prompt: Any, **kwargs: Any) -> Any:
+        """
+        Blocking generate_content with concurrency limit, rate limit and retries.
+
+        The request waits for a slot under the caller's request context
+        (scheduler.request_context); each retry queues again.
+
+        Args:
+            prompt: Prompt contents
+            **kwargs: Passed through to GenerativeModel.generate_content
+
+        Returns:
+            GenerateContentResponse: The model response
+
+        Raises:
+            RequestDropped: If the request is still queued at its deadline
+            Exception: The last error once retries are exhausted, or any
+                non-retryable error immediately
+        """
+        request_options = self._request_options(kwargs)
+        attempt = 0
+        while True:
+            # Take a slot first, so only requests about to start queue for rate tokens
+            with self.scheduler.slot():
+                self.rate_limiter.acquire()
+                started = time.perf_counter()
+                try:
+                    response = self.model.generate_content(
+                        prompt, request_options=request_options, **kwargs
+                    )
+                    metrics.record_usage(response)
+                    return response
+                except Exception as e:
+                    if attempt >= self.max_retries or not is_retryable(e):
+                        raise
+                    self._count_retry(e)
+                finally:
+                    self._observe(started)
+            time.sleep(self.backoff(attempt))
+            attempt += 1
+
+    def count_tokens(self, contents: Any, **kwargs: Any) -> int:
+        """
+        Blocking count_tokens with the same slot, rate limit and retries as generate_content.
+
+        Args:
+            contents: Prompt contents to count
+            **kwargs: Passed through to GenerativeModel.count_tokens
+
+        Returns:
+            int: Total prompt tokens
+
+        Raises:
+            RequestDropped: If the request is still queued at its deadline
+            Exception: The last error once retries are exhausted, or any
+                non-retryable error immediately
+        """
+        request_options = self._request_options(kwargs)
+        attempt = 0
+        while True:
+            with self.scheduler.slot():
+                self.rate_limiter.acquire()
+                try:
+                    return self.model.count_tokens(contents, request_options=request_options, **kwargs).total_tokens
+                except Exception as e:
+                    if attempt >= self.max_retries or not is_retryable(e):
+                        raise
+                    self._count_retry(e)
+            time.sleep(self.backoff(attempt))
+            attempt += 1
+
+    def generate_content_stream(self, prompt: Any, **kwargs: Any) -> Iterator[str]:
+        """
+        Streaming generate_content that yields response text chunks as they arrive.
+
+        The in-flight slot is held until the stream is exhausted or closed.
+        Retries only happen before the first chunk; once text has been yielded
+        an error is raised to the caller.
+
+        Args:
+            prompt: Prompt contents
+            **kwargs: Passed through to GenerativeModel.generate_content
+
+        Yields:
+            str: Text of each response chunk
+
+        Raises:
+            Exception: The last error once retries are exhausted, or any
+                non-retryable or mid-stream error immediately
+        """
+        request_options = self._request_options(kwargs)
+        attempt = 0
+        while True:
+            started = False
+            with self.scheduler.slot():
+                self.rate_limiter.acquire()
+                request_started = time.perf_counter()
+                try:
+                    chunk = None
+                    for chunk in self.model.generate_content(
+                        prompt, stream=True, request_options=request_options, **kwargs
+                    ):
+                        text = _chunk_text(chunk)
+                        if text:
+                            started = True
+                            yield text
+                    # Usage totals arrive with the final chunk
+                    metrics.record_usage(chunk)
+                    return
+                except Exception as e:
+                    if started or attempt >= self.max_retries or not is_retryable(e):
+                        raise
+                    self._count_retry(e)
+                finally:
+                    self._observe(request_started)
+            time.sleep(self.backoff(attempt))
+            attempt += 1
+
+    async def generate_content_async(self, prompt: Any, **kwargs: Any) -> Any:
+        """
+        Asyncio generate_content with concurrency limit, rate limit and retries.
+
+        Shares the scheduler and rate limiter with the blocking API.
+
+        Args:
+            prompt: Prompt contents
+            **kwargs: Passed through to GenerativeModel.generate_content_async
+
+        Returns:
+            AsyncGenerateContentResponse: The model response
+
+        Raises:
+            Exception: The last error once retries are exhausted, or any
+                non-retryable error immediately
+        """
+        request_options = self._request_options(kwargs)
+        attempt = 0
+        while True:
+            lane = await self.scheduler.acquire_async()
+            started = time.perf_counter()
+            try:
+                # Inside the try, so a cancelled rate-limit wait still releases the slot
+                await self.rate_limiter.acquire_async()
+                started = time.perf_counter()
+                response = await self.model.generate_content_async(
+                    prompt, request_options=request_options, **kwargs
+                )
+                metrics.record_usage(response)
+                return response
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                self._count_retry(e)
+            finally:
+                self._observe(started)
+                self.scheduler.release(lane)
+            await asyncio.sleep(self.backoff(attempt))
+            attempt += 1
+
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def _sdk() -> Any:
+    """Import the Gemini SDK on first use (tests may preset genai to a fake)."""
+    global genai
+    if genai is None:
+        import google.generativeai
+        genai = google.generativeai
+    return genai
+
+
+def configure() -> None:
+    """Configure the Gemini SDK once per process from config.py."""
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return
+        options: dict = {"api_key": config.GEMINI_API_KEY}
+        if config.GEMINI_API_ENDPOINT:
+            options["transport"] = "rest"
+            options["client_options"] = {"api_endpoint": config.GEMINI_API_ENDPOINT}
+        _sdk().configure(**options)
+        _configured = True
+
+
+_client: Optional[LLMClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> LLMClient:
+    """Return the process-wide LLM client configured in config.py."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            scheduler = FairScheduler(
+                config.LLM_MAX_CONCURRENCY,
+                interactive_reserved=config.LLM_INTERACTIVE_RESERVED_SLOTS,
+                fair=config.LLM_SCHEDULING == "fair",
+                max_wait={INTERACTIVE: config.LLM_INTERACTIVE_MAX_WAIT_SECONDS,
+                          BATCH: config.LLM_BATCH_MAX_WAIT_SECONDS},
+            )
+            _client = LLMClient(
+                config.GEMINI_MODEL,
+                max_concurrency=config.LLM_MAX_CONCURRENCY,
+                requests_per_minute=config.LLM_REQUESTS_PER_MINUTE,
+                max_retries=config.LLM_MAX_RETRIES,
+                timeout=config.LLM_TIMEOUT_SECONDS,
+                scheduler=scheduler,
+            )
+        return _client
+
+
+def _queue_depth() -> dict:
+    if _client is None:
+        return {}
+    return {(("lane", lane),): counts["queued"] for lane, counts in _client.scheduler.snapshot().items()}
+
+
+metrics.REGISTRY.register(metrics.Gauge(
+    "llm_queue_depth", "Gemini requests waiting for a slot, by lane", callback=_queue_depth))
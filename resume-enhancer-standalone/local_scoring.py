@@ -0,0 +1,278 @@
+"""
+Deterministic local scoring for the quality criteria.
+Completeness, structure and clarity follow from the parsed sections and
+simple text statistics, so they are computed here instead of asking Gemini.
+Grammar & Spelling is scored locally as well when pyspellchecker is
+installed. Keyword Optimization always has a heuristic score for "fast"
+mode, but in "hybrid" mode it (like any criterion without a trusted local
+scorer) is left to Gemini.
+
+Usage:
+    scores = score_locally(resume_text)                  # every criterion
+    scores = score_locally(resume_text, local_criteria())  # only the trusted ones
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import config
+from section_parser import DEFAULT_MATCHER, find_sections
+
+# Credit for each section having content; contact details make up the rest
+SECTION_WEIGHTS: Dict[str, int] = {
+    "Objective": 10,
+    "Education": 20,
+    "Experience": 25,
+    "Skills": 20,
+    "Projects": 10,
+    "Certifications": 5,
+    "Extracurricular Activities": 5,
+    "Declaration": 0,
+}
+CONTACT_WEIGHT = 5
+
+ACTION_VERBS = frozenset("""
+achieved analyzed architected automated built collaborated conducted configured
+coordinated created delivered deployed designed developed drove engineered
+established evaluated executed expanded implemented improved increased initiated
+integrated launched led maintained managed mentored migrated optimized organized
+oversaw planned presented produced reduced redesigned refactored researched
+resolved scaled shipped simplified spearheaded streamlined supervised tested
+trained transformed upgraded won wrote
+""".split())
+
+# Phrases that add words without adding information
+FILLER = re.compile(
+    r"\b(?:responsible for|duties included|in order to|worked on|helped with|various|"
+    r"successfully|etc\.?|a number of|was involved in|hard[- ]working|team player)\b",
+    re.IGNORECASE,
+)
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE = re.compile(r"\+?\d[\d ()-]{7,}\d")
+_BULLET = re.compile(r"^\s*(?:[-*•▪●–>]|\d{1,2}[.)])\s+")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+|\n")
+_WORD = re.compile(r"[A-Za-z][A-Za-z'-]*")
+_NUMBER = re.compile(r"\d|%|\$")
+
+# Mechanical errors a regex can find without a dictionary
+_MECHANICAL = [
+    re.compile(r"\b(\w+)\s+\1\b", re.IGNORECASE),   # repeated word
+    re.compile(r"(?:^|[.!?]\s+)i\b"),                 # lowercase "i" as a word
+    re.compile(r"\s[,.;:!?](?!\d)"),                  # space before punctuation
+    re.compile(r"[,;](?=[A-Za-z])"),                  # missing space after comma
+    re.compile(r"[.!?]\s+[a-z]"),                      # sentence starting lowercase
+    re.compile(r"([!?.,])\1"),                         # doubled punctuation
+]
+
+
+@dataclass
+class ResumeFeatures:
+    """Text statistics shared by the local scorers (computed once per resume)."""
+    sections: Dict[str, str]
+    heading_count: int
+    duplicate_headings: int
+    has_contact: bool
+    lines: List[str]
+    bullets: List[str]
+    sentences: List[str]
+    words: List[str]
+    text: str
+
+
+def extract_features(text: str) -> ResumeFeatures:
+    """
+    Parse a resume once into the statistics every scorer needs.
+
+    Args:
+        text: Resume text
+
+    Returns:
+        ResumeFeatures: Sections, headings, lines, bullets, sentences and words
+    """
+    spans = find_sections(text)
+    names = [span.name for span in spans]
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    head = "\n".join(lines[:10])
+    return ResumeFeatures(
+        sections=DEFAULT_MATCHER.parse(text, ""),
+        heading_count=len(set(names)),
+        duplicate_headings=len(names) - len(set(names)),
+        has_contact=bool(_EMAIL.search(head) or _PHONE.search(head)),
+        lines=lines,
+        bullets=[_BULLET.sub("", line) for line in lines if _BULLET.match(line)],
+        sentences=[s.strip() for s in _SENTENCE.split(text) if len(_WORD.findall(s)) >= 3],
+        words=_WORD.findall(text),
+        text=text,
+    )
+
+
+def _band(value: float, low: float, high: float, tolerance: float) -> float:
+    """1.0 inside [low, high], falling linearly to 0 at tolerance outside it."""
+    if value < low:
+        return max(0.0, 1 - (low - value) / tolerance)
+    if value > high:
+        return max(0.0, 1 - (value - high) / tolerance)
+    return 1.0
+
+
+def _ratio(part: int, whole: int) -> float:
+    return part / whole if whole else 0.0
+
+
+# --- Scorers ---
+
+def score_completeness(features: ResumeFeatures) -> float:
+    """Weighted share of sections with real content, plus contact details."""
+    score = CONTACT_WEIGHT if features.has_contact else 0
+    for name, weight in SECTION_WEIGHTS.items():
+        words = len(_WORD.findall(features.sections.get(name, "")))
+        if words >= 5:
+            score += weight
+        elif words:
+            score += weight / 2
+    return score * 100 / (sum(SECTION_WEIGHTS.values()) + CONTACT_WEIGHT)
+
+
+def score_structure(features: ResumeFeatures) -> float:
+    """Recognized headings, bullet use, line length and contact details up top."""
+    body_lines = max(1, len(features.lines) - features.heading_count)
+    return (
+        35 * min(features.heading_count / 4, 1.0)
+        + 25 * min(_ratio(len(features.bullets), body_lines) / 0.4, 1.0)
+        + 20 * (1 - _ratio(sum(len(line) > 120 for line in features.lines), len(features.lines)))
+        + 10 * features.has_contact
+        + 10 * (features.duplicate_headings == 0)
+    )
+
+
+def score_clarity(features: ResumeFeatures) -> float:
+    """Sentence length, filler phrases, overall length and run-on lines."""
+    word_count = len(features.words)
+    if not word_count:
+        return 0.0
+    lengths = [len(_WORD.findall(s)) for s in features.sentences] or [word_count]
+    average = sum(lengths) / len(lengths)
+    filler_per_100 = len(FILLER.findall(features.text)) * 100 / word_count
+    return (
+        40 * _band(average, 6, 22, 15)
+        + 25 * max(0.0, 1 - filler_per_100 / 3)
+        + 20 * _band(word_count, 200, 900, 600)
+        + 15 * (1 - _ratio(sum(n > 35 for n in lengths), len(lengths)))
+    )
+
+
+def score_grammar(features: ResumeFeatures) -> float:
+    """Mechanical errors per 100 words, plus the misspelling rate when a spell checker is available."""
+    word_count = len(features.words)
+    if not word_count:
+        return 0.0
+    issues = sum(len(pattern.findall(features.text)) for pattern in _MECHANICAL)
+    score = 100 - 8 * issues * 100 / word_count
+    checker = spell_checker()
+    if checker is not None:
+        # Lowercase dictionary-style words only: names, acronyms and tools are capitalized
+        candidates = [w for w in features.words if w.islower() and len(w) >= 4 and "'" not in w]
+        if candidates:
+            score -= 300 * len(checker.unknown(candidates)) / len(candidates)
+    return score
+
+
+def score_keywords(features: ResumeFeatures) -> float:
+    """Action-verb bullets, quantified achievements and the size of the skills list."""
+    bullets = features.bullets or features.sentences
+    starts = [line.split(maxsplit=1)[0].lower().strip(",.:") for line in bullets if line.split()]
+    skills = [item for item in re.split(r"[,;|\n•]", features.sections.get("Skills", "")) if item.strip()]
+    return (
+        40 * min(_ratio(sum(s in ACTION_VERBS for s in starts), len(starts)) / 0.6, 1.0)
+        + 30 * min(_ratio(sum(bool(_NUMBER.search(b)) for b in bullets), len(bullets)) / 0.4, 1.0)
+        + 30 * min(len(skills) / 12, 1.0)
+    )
+
+
+# Criterion name -> scorer over ResumeFeatures (0-100, clamped by score_locally)
+SCORERS: Dict[str, Callable[[ResumeFeatures], float]] = {
+    "Completeness of Sections": score_completeness,
+    "Structure & Formatting": score_structure,
+    "Clarity & Conciseness": score_clarity,
+    "Grammar & Spelling": score_grammar,
+    "Keyword Optimization": score_keywords,
+}
+
+# Criteria whose local scores are used even when Gemini is available
+DETERMINISTIC_CRITERIA: List[str] = [
+    "Completeness of Sections",
+    "Structure & Formatting",
+    "Clarity & Conciseness",
+]
+
+
+# --- Spell Checking ---
+
+_checker: Any = None
+_checker_loaded = False
+_checker_lock = threading.Lock()
+
+
+def spell_checker() -> Optional[Any]:
+    """
+    Return a shared pyspellchecker instance, or None when it is not
+    installed or LOCAL_SPELLCHECK is off. Loaded on first use.
+    """
+    global _checker, _checker_loaded
+    if not config.LOCAL_SPELLCHECK:
+        return None
+    with _checker_lock:
+        if not _checker_loaded:
+            try:
+                from spellchecker import SpellChecker
+                _checker = SpellChecker()
+            except ImportError:  # spell checking is optional
+                _checker = None
+            _checker_loaded = True
+        return _checker
+
+
+# --- Public API ---
+
+def local_criteria(mode: Optional[str] = None) -> List[str]:
+    """
+    Criteria scored locally in a scoring mode.
+
+    Args:
+        mode: "hybrid", "fast" or "llm" (defaults to config.QUALITY_SCORING_MODE)
+
+    Returns:
+        list: Criterion names, in config.QUALITY_CRITERIA order
+    """
+    mode = mode or config.QUALITY_SCORING_MODE
+    if mode == "llm":
+        return []
+    if mode == "fast":
+        local = set(SCORERS)
+    else:
+        local = set(DETERMINISTIC_CRITERIA)
+        if spell_checker() is not None:
+            local.add("Grammar & Spelling")
+    return [criterion for criterion in config.QUALITY_CRITERIA if criterion in local]
+
+
+def score_locally(text: str, criteria: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    Score a resume without any Gemini request.
+
+    Args:
+        text: Resume text
+        criteria: Criteria to score (defaults to every criterion with a scorer)
+
+    Returns:
+        dict: Criterion name mapped to a 0-100 score
+    """
+    if criteria is None:
+        criteria = [criterion for criterion in config.QUALITY_CRITERIA if criterion in SCORERS]
+    features = extract_features(text)
+    return {
+        criterion: int(round(max(0.0, min(SCORERS[criterion](features), 100.0))))
+        for criterion in criteria if criterion in SCORERS
+    }
@@ -0,0 +1,442 @@
+"""
+Resume-to-job-description matching without LLM calls.
+Extracted resume texts are indexed as a sparse TF-IDF matrix (one row per
+resume), so every resume is scored against a job description with a single
+sparse matrix-vector product. Resumes can be added or replaced at any time;
+the vocabulary and document frequencies are updated in place.
+
+With MATCH_EMBEDDING_MODEL set and sentence-transformers installed, scores
+blend in cosine similarity of locally computed embeddings.
+
+Usage:
+    python matching.py resumes/ --jd job.txt --top 10
+"""
+
+import math
+import re
+import sys
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+import config
+
+# Words plus the punctuation that matters in skill names (c++, c#, node.js, ci/cd)
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9]")
+# Bigrams never span list separators or sentence ends ("python, kafka" is not a phrase)
+_PHRASE_BREAK = re.compile(r"[,;:|()\n\u2022]|\.(?:\s|$)")
+
+STOP_WORDS = frozenset("""
+a about above after again all also am an and any are as at be been being below
+between both but by can could did do does doing down during each etc few for from
+further had has have having he her here hers him his how i if in into is it its
+just me more most my no nor not now of off on once only or other our out over own
+per same she should so some such than that the their them then there these they
+this those through to too under until up very via was we were what when where which
+while who whom why will with within would you your yours
+ability able experience strong work working years year team plus including etc
+responsibilities requirements preferred required role job candidate looking using
+know knowledge must need needs seeking ideal join help good great excellent
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase word tokens without stop words: unigrams, then bigrams of words
+    that are adjacent in the text within one phrase.
+    """
+    unigrams: List[str] = []
+    bigrams: List[str] = []
+    for phrase in _PHRASE_BREAK.split(text.lower()):
+        words = _TOKEN.findall(phrase)
+        kept = [w not in STOP_WORDS and not w.isdigit() for w in words]
+        unigrams.extend(w for w, keep in zip(words, kept) if keep)
+        bigrams.extend(
+            f"{words[i]} {words[i + 1]}" for i in range(len(words) - 1) if kept[i] and kept[i + 1]
+        )
+    return unigrams + bigrams
+
+
+@dataclass
+class Match:
+    """One resume's score against a job description."""
+    doc_id: str
+    score: float
+    missing: List[str] = field(default_factory=list)
+
+
+@dataclass
+class KeywordGap:
+    """Job description keywords absent from a resume, overall and per section."""
+    missing: List[str]
+    by_section: Dict[str, List[str]]
+
+
+class MatchIndex:
+    """
+    Incrementally updated TF-IDF index over resume texts.
+
+    Term counts are kept as a CSR matrix (resumes x vocabulary). New rows are
+    buffered and stacked onto it in one step before the next query, and the
+    weighted, row-normalized matrix used for scoring is rebuilt lazily after
+    updates, so adding n resumes costs O(n) rather than O(n^2).
+
+    With max_docs set, the oldest-added resumes are evicted in batches once
+    the index grows past it, and vocabulary no remaining resume uses is
+    dropped, so a long-running app's index stays bounded.
+
+    Args:
+        embedder: Optional callable mapping a list of texts to an (n, d) array
+        embedding_weight: Share of the final score taken from embeddings
+        max_docs: Resumes kept in the index (0 = no limit)
+    """
+
+    def __init__(self, embedder: Optional[Any] = None, embedding_weight: float = 0.5,
+                 max_docs: int = 0) -> None:
+        self.max_docs = max_docs
+        self.vocabulary: Dict[str, int] = {}
+        self.doc_ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._counts = sparse.csr_matrix((0, 0), dtype=np.float64)
+        self._pending: List[sparse.csr_matrix] = []
+        self._df = np.zeros(0, dtype=np.int64)
+        self._weighted: Optional[sparse.csr_matrix] = None
+        self._embedder = embedder
+        self.embedding_weight = embedding_weight if embedder else 0.0
+        self._embeddings = np.zeros((0, 0), dtype=np.float32)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._rows
+
+    # --- Updates ---
+
+    def _live(self, column: Optional[int]) -> bool:
+        """Whether a vocabulary column is used by any indexed resume (replacements and
+        evictions leave unused columns behind until the next compaction)."""
+        return column is not None and column < len(self._df) and self._df[column] > 0
+
+    def _count_row(self, text: str, grow: bool) -> sparse.csr_matrix:
+        """
+        Term counts for one text. With grow set, unknown terms extend the
+        vocabulary; without it, terms no indexed resume uses are skipped.
+        """
+        counts: Dict[int, int] = {}
+        for term in tokenize(text):
+            column = self.vocabulary.get(term)
+            if not grow and not self._live(column):
+                continue
+            if column is None:
+                column = self.vocabulary[term] = len(self.vocabulary)
+            counts[column] = counts.get(column, 0) + 1
+        columns = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        return sparse.csr_matrix(
+            (values, columns, np.array([0, len(columns)])), shape=(1, len(self.vocabulary))
+        )
+
+    def _flush(self) -> None:
+        """Stack buffered rows onto the count matrix, widened to the current vocabulary."""
+        width = len(self.vocabulary)
+        if self._counts.shape[1] < width:
+            self._counts.resize((self._counts.shape[0], width))
+        if self._pending:
+            for row in self._pending:
+                row.resize((1, width))
+            self._counts = sparse.vstack([self._counts] + self._pending, format="csr")
+            self._pending = []
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Add a resume, or replace the indexed text of an existing doc_id."""
+        with self._lock:
+            row = self._count_row(text, grow=True)
+            width = len(self.vocabulary)
+            self._df = np.concatenate([self._df, np.zeros(width - len(self._df), dtype=np.int64)])
+            replaced = doc_id in self._rows
+            if replaced:
+                self._flush()
+                index = self._rows[doc_id]
+                self._df[self._counts[index].indices] -= 1
+                self._counts = sparse.vstack(
+                    [self._counts[:index], row, self._counts[index + 1:]], format="csr"
+                )
+            else:
+                self._rows[doc_id] = len(self.doc_ids)
+                self.doc_ids.append(doc_id)
+                self._pending.append(row)
+            self._df[row.indices] += 1
+            if self._embedder:
+                vector = _normalize(np.asarray(self._embedder([text]), dtype=np.float32))
+                if doc_id in self._rows and self._rows[doc_id] < len(self._embeddings):
+                    self._embeddings[self._rows[doc_id]] = vector[0]
+                else:
+                    self._embeddings = np.vstack([self._embeddings.reshape(-1, vector.shape[1]), vector])
+            if self.max_docs and len(self.doc_ids) > self.max_docs:
+                # Evict a tenth beyond the limit at once, so rebuilds stay rare
+                self._evict(len(self.doc_ids) - self.max_docs + self.max_docs // 10)
+            elif replaced:
+                self._compact()
+            self._weighted = None
+
+    def _evict(self, count: int) -> None:
+        """Drop the count oldest rows, then compact the vocabulary if much of it is unused."""
+        self._flush()
+        removed = self._counts[:count]
+        self._df[:removed.shape[1]] -= np.bincount(removed.indices, minlength=removed.shape[1])
+        self._counts = self._counts[count:]
+        self._embeddings = self._embeddings[count:] if len(self._embeddings) else self._embeddings
+        self.doc_ids = self.doc_ids[count:]
+        self._rows = {doc_id: row for row, doc_id in enumerate(self.doc_ids)}
+        self._compact()
+
+    def _compact(self) -> None:
+        """Drop vocabulary columns no resume uses once they are a quarter of it (rows must be flushed)."""
+        live = np.flatnonzero(self._df)
+        if len(live) < 0.75 * len(self.vocabulary):
+            terms = np.empty(len(self.vocabulary), dtype=object)
+            for term, column in self.vocabulary.items():
+                terms[column] = term
+            self.vocabulary = {term: column for column, term in enumerate(terms[live])}
+            self._counts = sparse.csr_matrix(self._counts[:, live])
+            self._df = self._df[live]
+
+    def add_many(self, docs: Iterable[Tuple[str, str]]) -> None:
+        """Add (doc_id, text) pairs."""
+        for doc_id, text in docs:
+            self.add(doc_id, text)
+
+    # --- Scoring ---
+
+    def _idf(self) -> np.ndarray:
+        # Smoothed so that terms present in every resume still count a little
+        return np.log((1 + len(self.doc_ids)) / (1 + self._df)) + 1.0
+
+    def _weigh(self, counts: sparse.csr_matrix, idf: np.ndarray) -> sparse.csr_matrix:
+        """Sublinear TF times IDF, with each row scaled to unit length."""
+        weighted = counts.copy()
+        weighted.data = 1.0 + np.log(weighted.data)
+        weighted = sparse.csr_matrix(weighted.multiply(idf[:weighted.shape[1]]))
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.csr_matrix(sparse.diags(1.0 / norms) @ weighted)
+
+    def _matrix(self) -> sparse.csr_matrix:
+        if self._weighted is None:
+            self._flush()
+            self._weighted = self._weigh(self._counts, self._idf())
+        return self._weighted
+
+    def query_vectors(self, texts: List[str]) -> sparse.csr_matrix:
+        """Weighted vectors for job descriptions; terms no resume contains are ignored."""
+        rows = [self._count_row(text, grow=False) for text in texts]
+        counts = sparse.vstack(rows, format="csr") if rows else sparse.csr_matrix((0, len(self.vocabulary)))
+        return self._weigh(counts, self._idf())
+
+    def score_matrix(self, jd_texts: List[str]) -> np.ndarray:
+        """
+        Cosine similarity of every resume against every job description.
+
+        Returns:
+            np.ndarray: (resumes, job descriptions) array of scores in [0, 1]
+        """
+        with self._lock:
+            return self._score_matrix(jd_texts)
+
+    def _score_matrix(self, jd_texts: List[str]) -> np.ndarray:
+        """score_matrix for callers that hold the lock."""
+        if not self.doc_ids:
+            return np.zeros((0, len(jd_texts)))
+        scores = (self._matrix() @ self.query_vectors(jd_texts).T).toarray()
+        if self.embedding_weight:
+            queries = _normalize(np.asarray(self._embedder(jd_texts), dtype=np.float32))
+            dense = np.clip(self._embeddings @ queries.T, 0.0, 1.0)
+            scores = (1 - self.embedding_weight) * scores + self.embedding_weight * dense
+        return scores
+
+    def score(self, jd_text: str) -> np.ndarray:
+        """Scores of every resume (in doc_ids order) against one job description."""
+        return self.score_matrix([jd_text])[:, 0]
+
+    def score_doc(self, doc_id: str, jd_text: str) -> float:
+        """
+        Score of one indexed resume against a job description.
+
+        Raises:
+            KeyError: If doc_id is not indexed (never added, or evicted)
+        """
+        with self._lock:
+            # Row numbers change on add and eviction, so look up and score under one lock
+            row = self._rows.get(doc_id)
+            if row is None:
+                raise KeyError(f"Resume {doc_id!r} is not in the match index")
+            return float(self._score_matrix([jd_text])[row, 0])
+
+    def rank(self, jd_text: str, top_k: int = 10, texts: Optional[Dict[str, str]] = None) -> List[Match]:
+        """
+        Best-matching resumes for a job description.
+
+        Args:
+            jd_text: Job description
+            top_k: Number of results (0 for all)
+            texts: doc_id -> resume text; when given, each match lists the
+                job keywords that resume is missing
+
+        Returns:
+            list: Match objects, best first
+        """
+        with self._lock:
+            scores = self._score_matrix([jd_text])[:, 0]
+            doc_ids = list(self.doc_ids)
+        order = np.argsort(-scores, kind="stable")
+        if top_k:
+            order = order[:top_k]
+        matches = [Match(doc_ids[i], round(float(scores[i]), 4)) for i in order]
+        if texts:
+            keywords = self.jd_keywords(jd_text)
+            for match in matches:
+                present = set(tokenize(texts[match.doc_id]))
+                match.missing = [k for k in keywords if k not in present]
+        return matches
+
+    # --- Keyword gaps ---
+
+    def jd_keywords(self, jd_text: str, top_n: int = 20) -> List[str]:
+        """
+        The job description's most distinctive terms, by TF-IDF weight.
+
+        Words no indexed resume contains get the highest IDF, since they are
+        exactly the skills candidates tend to lack. Bigrams are only kept when
+        some resume uses them, which keeps phrases like "machine learning" and
+        drops accidental pairs like "python kafka".
+        """
+        counts: Dict[str, int] = {}
+        for term in tokenize(jd_text):
+            if " " in term and not self._live(self.vocabulary.get(term)):
+                continue
+            counts[term] = counts.get(term, 0) + 1
+        n = len(self.doc_ids)
+        weights = {}
+        for term, count in counts.items():
+            column = self.vocabulary.get(term)
+            df = self._df[column] if self._live(column) else 0
+            weights[term] = (1 + math.log(count)) * (math.log((1 + n) / (1 + df)) + 1)
+        ranked = sorted(weights, key=lambda t: (-weights[t], t))
+        # A bigram already covers its words; skip words that only appear inside a kept bigram
+        kept: List[str] = []
+        for term in ranked:
+            if " " not in term and any(term in k.split(" ") for k in kept if " " in k):
+                continue
+            kept.append(term)
+            if len(kept) == top_n:
+                break
+        return kept
+
+    def keyword_gap(self, resume_text: str, jd_text: str, top_n: int = 20) -> KeywordGap:
+        """
+        Job description keywords missing from a resume, overall and per section.
+
+        Args:
+            resume_text: Extracted resume text
+            jd_text: Job description
+            top_n: How many of the JD's top keywords to check
+
+        Returns:
+            KeywordGap: missing lists, in JD keyword order; by_section only
+                covers sections the resume has
+        """
+        from resume_ai import NO_DATA
+        from section_parser import DEFAULT_MATCHER
+
+        keywords = self.jd_keywords(jd_text, top_n)
+        present = set(tokenize(resume_text))
+        sections = DEFAULT_MATCHER.parse(resume_text, NO_DATA)
+        by_section = {}
+        for name, content in sections.items():
+            if content != NO_DATA:
+                terms = set(tokenize(content))
+                by_section[name] = [k for k in keywords if k not in terms]
+        return KeywordGap([k for k in keywords if k not in present], by_section)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def load_embedder(model_name: str) -> Optional[Any]:
+    """
+    Local sentence-transformers encoder, or None if unset or not installed.
+
+    Returns:
+        callable: texts -> (n, d) array
+    """
+    if not model_name:
+        return None
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return None
+    model = SentenceTransformer(model_name)
+    return lambda texts: model.encode(texts, normalize_embeddings=True)
+
+
+_index: Optional[MatchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_match_index() -> MatchIndex:
+    """Return the process-wide index configured in config.py."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = MatchIndex(
+                embedder=load_embedder(config.MATCH_EMBEDDING_MODEL),
+                embedding_weight=config.MATCH_EMBEDDING_WEIGHT,
+                max_docs=config.MATCH_INDEX_MAX_DOCS,
+            )
+        return _index
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Rank resumes on disk against one or more job descriptions."""
+    import argparse
+    import json
+
+    from batch import discover_inputs, extract_file
+
+    parser = argparse.ArgumentParser(description="Rank resumes against job descriptions.")
+    parser.add_argument("sources", nargs="+", help="Resume files, directories, or manifest files")
+    parser.add_argument("--jd", action="append", required=True, help="Job description text file (repeatable)")
+    parser.add_argument("--top", type=int, default=10, help="Results per job description (0 = all)")
+    args = parser.parse_args(argv)
+
+    index = get_match_index()
+    texts: Dict[str, str] = {}
+    for path in discover_inputs(args.sources):
+        path, text, error, _ = extract_file(path)
+        if error is not None:
+            print(f"[error] {path}: {error}", file=sys.stderr)
+            continue
+        texts[path] = text
+        index.add(path, text)
+
+    for jd_path in args.jd:
+        with open(jd_path, encoding="utf-8") as f:
+            jd_text = f.read()
+        matches = index.rank(jd_text, top_k=args.top, texts=texts)
+        print(json.dumps({
+            "jd": jd_path,
+            "matches": [{"file": m.doc_id, "score": m.score, "missing": m.missing} for m in matches],
+        }, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+Memory accounting for multi-user deployments.
+Tracks the approximate bytes each Streamlit session holds (uploaded file
+buffers until they are released, extracted text, job descriptions), expires
+sessions that have gone idle, and exposes per-session and process totals as
+metrics next to the process's resident set size.
+
+Results themselves live in the SQLite stores (response_cache.py,
+upload_store.py, jobs.py), which are bounded by TTL and entry limits, so the
+session ledger only needs to cover what is held in memory.
+
+Usage:
+    ledger = get_session_ledger()
+    ledger.record(session_id, "upload", uploaded_file.size)
+    ledger.release(session_id, "upload")
+
+    python memory.py    # print RSS and ledger totals as JSON
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+import config
+import metrics
+
+
+def rss_bytes() -> int:
+    """Resident set size of this process (0 where it cannot be read)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    # ru_maxrss is the peak, in KB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class SessionLedger:
+    """
+    Bytes held per session and item name, with idle expiry.
+
+    Sessions that have not recorded anything for idle_seconds are dropped on
+    the next update, so sessions that end without saying so (closed tabs)
+    do not accumulate.
+
+    Args:
+        idle_seconds: Forget a session after this long without updates
+    """
+
+    def __init__(self, idle_seconds: float) -> None:
+        self.idle_seconds = idle_seconds
+        self._items: Dict[str, Dict[str, int]] = {}
+        self._seen: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.idle_seconds
+        for session_id in [s for s, seen in self._seen.items() if seen < cutoff]:
+            self._items.pop(session_id, None)
+            del self._seen[session_id]
+
+    def record(self, session_id: str, name: str, nbytes: int) -> None:
+        """Set the size of one item held by a session (replacing any earlier size)."""
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            self._items.setdefault(session_id, {})[name] = nbytes
+            self._seen[session_id] = now
+
+    def release(self, session_id: str, name: str) -> None:
+        """Mark an item as no longer held by a session."""
+        with self._lock:
+            self._items.get(session_id, {}).pop(name, None)
+
+    def forget(self, session_id: str) -> None:
+        """Drop everything recorded for a session."""
+        with self._lock:
+            self._items.pop(session_id, None)
+            self._seen.pop(session_id, None)
+
+    def session_bytes(self, session_id: str) -> int:
+        """Total bytes recorded for one session."""
+        with self._lock:
+            return sum(self._items.get(session_id, {}).values())
+
+    def snapshot(self) -> Dict[str, int]:
+        """Live session count, total bytes across sessions and the largest session."""
+        with self._lock:
+            self._expire(time.time())
+            totals = [sum(items.values()) for items in self._items.values()]
+        return {
+            "sessions": len(totals),
+            "session_bytes": sum(totals),
+            "largest_session_bytes": max(totals, default=0),
+        }
+
+
+_ledger: Optional[SessionLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_session_ledger() -> SessionLedger:
+    """Return the process-wide ledger, registering its metrics on first use."""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = SessionLedger(config.SESSION_IDLE_SECONDS)
+            ledger = _ledger
+            metrics.REGISTRY.register(metrics.Gauge(
+                "app_sessions", "Sessions holding data in memory",
+                callback=lambda: {(): ledger.snapshot()["sessions"]}))
+            metrics.REGISTRY.register(metrics.Gauge(
+                "app_session_bytes", "Approximate bytes held by sessions, total and largest",
+                callback=lambda: {
+                    (("scope", "total"),): ledger.snapshot()["session_bytes"],
+                    (("scope", "largest"),): ledger.snapshot()["largest_session_bytes"],
+                }))
+        return _ledger
+
+
+metrics.REGISTRY.register(metrics.Gauge(
+    "process_resident_memory_bytes", "Resident set size of this process",
+    callback=lambda: {(): rss_bytes()}))
+
+
+def main() -> int:
+    """Print current memory usage."""
+    print(json.dumps(dict(get_session_ledger().snapshot(), rss_bytes=rss_bytes()), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
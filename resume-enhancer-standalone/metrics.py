@@ -0,0 +1,365 @@
+"""
+In-process metrics: per-stage latency histograms, LLM token usage, cache hit
+and error counters, exposed in Prometheus text format on a local HTTP port.
+When the opentelemetry package is installed and TRACING_ENABLED is set, every
+timed stage also opens a span, nested under a per-resume span.
+
+Usage:
+    with metrics.timed("extract"):
+        text = extract_resume_text(...)
+
+    @metrics.instrument("render_latex")
+    def generate_latex(sections): ...
+
+    metrics.start_metrics_server(9464)   # GET http://localhost:9464/metrics
+"""
+
+import contextlib
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import config
+
+try:
+    from opentelemetry import trace as _otel_trace
+except ImportError:  # tracing is optional
+    _otel_trace = None
+
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+SIZE_BUCKETS: Tuple[float, ...] = (
+    1e3, 1e4, 5e4, 1e5, 5e5, 1e6, 5e6, 1e7, 5e7,
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help_text = help_text
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = _labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(_labels(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(key)} {value:g}" for key, value in items]
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {_format_labels(key) or "total": value for key, value in self._values.items()}
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels."""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        # Per label set: [count per bucket..., +Inf count, sum]
+        self._values: Dict[Labels, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = _labels(labels)
+        with self._lock:
+            row = self._values.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[index] += 1
+            row[-2] += 1
+            row[-1] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(row)) for key, row in self._values.items()]
+        lines = []
+        for key, row in items:
+            for bound, count in zip(self.buckets, row):
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {count:g}")
+            lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {row[-2]:g}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {row[-1]:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {row[-2]:g}")
+        return lines
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                _format_labels(key) or "total": {
+                    "count": row[-2],
+                    "mean": row[-1] / row[-2] if row[-2] else 0.0,
+                }
+                for key, row in self._values.items()
+            }
+
+
+class Gauge:
+    """
+    Point-in-time value with labels. Either set() explicitly, or give a
+    callback returning {labels dict as tuple: value} that is read at render time.
+    """
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, help_text: str,
+                 callback: Optional[Callable[[], Dict[Labels, float]]] = None) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.callback = callback
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels: Any) -> None:
+        with self._lock:
+            self._values[_labels(labels)] = value
+
+    def _items(self) -> List[Tuple[Labels, float]]:
+        if self.callback is not None:
+            return list(self.callback().items())
+        with self._lock:
+            return list(self._values.items())
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(key)} {value:g}" for key, value in self._items()]
+
+    def snapshot(self) -> Dict[str, float]:
+        return {_format_labels(key) or "total": value for key, value in self._items()}
+
+
+class Registry:
+    """Holds every metric so they can be rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Any) -> Any:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-serializable summary of every metric."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "resume_stage_seconds", "Time spent in each pipeline stage"))
+STAGE_ERRORS = REGISTRY.register(Counter(
+    "resume_stage_errors_total", "Stage failures by exception type"))
+UPLOAD_BYTES = REGISTRY.register(Histogram(
+    "resume_upload_bytes", "Size of uploaded resume files", buckets=SIZE_BUCKETS))
+LLM_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "llm_request_seconds", "Gemini round-trip time per attempt"))
+LLM_TOKENS = REGISTRY.register(Counter(
+    "llm_tokens_total", "Gemini tokens by stage and direction (prompt or response)"))
+LLM_RETRIES = REGISTRY.register(Counter(
+    "llm_retries_total", "Gemini attempts that failed and were retried"))
+CACHE_LOOKUPS = REGISTRY.register(Counter(
+    "response_cache_lookups_total", "Response cache lookups by kind and result (hit or miss)"))
+EXTRACT_SECONDS_SAVED = REGISTRY.register(Counter(
+    "resume_extract_seconds_saved_total", "Extraction time avoided by reusing stored uploads"))
+LLM_QUEUE_SECONDS = REGISTRY.register(Histogram(
+    "llm_queue_seconds", "Time Gemini requests waited for a slot, by lane"))
+LLM_DROPPED = REGISTRY.register(Counter(
+    "llm_requests_dropped_total", "Gemini requests dropped at their queue deadline, by lane"))
+OCR_PAGES = REGISTRY.register(Counter(
+    "resume_ocr_pages_total", "Scanned PDF pages by result (cached, recognized or timeout)"))
+OCR_POOL_RESTARTS = REGISTRY.register(Counter(
+    "resume_ocr_pool_restarts_total", "OCR pools terminated because a page overran its timeout"))
+PREFETCH_JOBS = REGISTRY.register(Counter(
+    "prefetch_jobs_total",
+    "Speculative stage jobs by outcome (submitted, skipped, hit, partial, failed, cancelled or wasted)"))
+
+
+# --- Timing ---
+
+_stage: contextvars.ContextVar = contextvars.ContextVar("metrics_stage", default="unknown")
+
+
+def current_stage() -> str:
+    """Name of the innermost timed stage in this thread or task."""
+    return _stage.get()
+
+
+def _tracer() -> Any:
+    if _otel_trace is None or not config.TRACING_ENABLED:
+        return None
+    return _otel_trace.get_tracer("resume-enhancer")
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes: Any) -> Iterator[None]:
+    """
+    Open an OpenTelemetry span if tracing is enabled; otherwise do nothing.
+
+    Args:
+        name: Span name (e.g. "resume")
+        **attributes: Span attributes (e.g. file name, fingerprint)
+    """
+    tracer = _tracer()
+    if tracer is None:
+        yield
+        return
+    with tracer.start_as_current_span(name, attributes=attributes):
+        yield
+
+
+@contextlib.contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """
+    Time a block as one pipeline stage.
+
+    Records resume_stage_seconds, counts exceptions in resume_stage_errors_total
+    (re-raising them), makes the stage visible to current_stage() so LLM token
+    usage is attributed to it, and opens a span when tracing is enabled.
+    """
+    token = _stage.set(stage)
+    started = time.perf_counter()
+    try:
+        with span(stage):
+            yield
+    except BaseException as e:
+        if not isinstance(e, GeneratorExit):
+            STAGE_ERRORS.inc(stage=stage, error=type(e).__name__)
+        raise
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - started, stage=stage)
+        _stage.reset(token)
+
+
+def instrument(stage: str) -> Callable:
+    """Decorator form of timed() for plain and async functions."""
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with timed(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with timed(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_usage(response: Any) -> None:
+    """Count prompt/response tokens from a Gemini response's usage_metadata."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    stage = current_stage()
+    prompt_tokens = getattr(usage, "prompt_token_count", 0) or 0
+    response_tokens = getattr(usage, "candidates_token_count", 0) or 0
+    if prompt_tokens:
+        LLM_TOKENS.inc(prompt_tokens, stage=stage, direction="prompt")
+    if response_tokens:
+        LLM_TOKENS.inc(response_tokens, stage=stage, direction="response")
+
+
+# --- Endpoint ---
+
+def _handler_class() -> type:
+    """Build the request handler; http.server is only imported when the endpoint is enabled."""
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = REGISTRY.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return MetricsHandler
+
+
+_server: Any = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: Optional[int] = None, host: str = "127.0.0.1") -> Optional[int]:
+    """
+    Serve /metrics from a daemon thread. Safe to call on every Streamlit rerun.
+
+    Args:
+        port: Port to listen on (defaults to config.METRICS_PORT; 0 disables)
+        host: Interface to bind
+
+    Returns:
+        int: The bound port, or None if disabled or the port is taken
+    """
+    global _server
+    port = config.METRICS_PORT if port is None else port
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None:
+            from http.server import ThreadingHTTPServer
+
+            try:
+                _server = ThreadingHTTPServer((host, port), _handler_class())
+            except OSError:
+                return None
+            threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+        return _server.server_address[1]
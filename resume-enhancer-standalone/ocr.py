@@ -0,0 +1,284 @@
+"""
+OCR fallback for scanned (image-only) PDFs.
+Pages are rasterized with PyMuPDF at OCR_DPI and recognized with Tesseract,
+through pytesseract or PyMuPDF's own OCR support, in a process pool of its
+own. The pool size and the number of documents OCRed at once are bounded,
+and a page that overruns OCR_PAGE_TIMEOUT_SECONDS is given up on: pytesseract
+stops Tesseract itself, and a pool worker stuck on a page (PyMuPDF OCR has
+no timeout) is terminated along with its pool. So scanned uploads cannot
+starve regular text extraction or later documents. Recognized text is cached on disk by a hash of the
+rendered page, so a page is only OCRed once.
+
+Tesseract is optional: without it, image-only PDFs are reported as before.
+"""
+
+import atexit
+import hashlib
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import List, Optional, Tuple
+
+import config
+import metrics
+from text_normalize import PAGE_BREAK
+
+ENGINES = ("tesseract", "pymupdf")
+
+
+class OCRUnavailableError(ValueError):
+    """Raised when a PDF needs OCR but no engine is installed or OCR_ENGINE is "none"."""
+
+
+class OCRBusyError(ValueError):
+    """Raised when OCR_MAX_DOCUMENTS scanned PDFs are already being read."""
+
+
+def _has_engine(name: str) -> bool:
+    if name == "tesseract":
+        try:
+            import pytesseract  # noqa: F401
+        except ImportError:  # OCR is optional
+            return False
+        return shutil.which("tesseract") is not None
+    try:
+        import fitz  # PyMuPDF
+
+        return bool(fitz.get_tessdata())
+    except Exception:  # raised when no tessdata directory is found
+        return False
+
+
+_engine: Optional[str] = None
+_engine_checked = False
+_engine_lock = threading.Lock()
+
+
+def find_engine() -> Optional[str]:
+    """
+    Locate the configured OCR engine (checked once per process).
+
+    Returns:
+        str: "tesseract" (pytesseract) or "pymupdf", or None if neither is
+            installed or OCR_ENGINE is "none"
+    """
+    global _engine, _engine_checked
+    with _engine_lock:
+        if not _engine_checked:
+            choice = config.OCR_ENGINE
+            candidates = () if choice == "none" else ENGINES if choice == "auto" else (choice,)
+            _engine = next((name for name in candidates if _has_engine(name)), None)
+            _engine_checked = True
+        return _engine
+
+
+def _recognize(engine: str, png: bytes, language: str, timeout: float) -> str:
+    """OCR one rendered page (runs in a worker process)."""
+    if engine == "tesseract":
+        import io
+
+        import pytesseract
+        from PIL import Image
+
+        return pytesseract.image_to_string(Image.open(io.BytesIO(png)), lang=language, timeout=timeout)
+    import fitz  # PyMuPDF
+
+    pdf = fitz.Pixmap(png).pdfocr_tobytes(language=language)
+    with fitz.open(stream=pdf, filetype="pdf") as doc:
+        return doc.load_page(0).get_text()
+
+
+def render_pages(data: bytes, max_pages: int, dpi: int) -> List[bytes]:
+    """
+    Rasterize the leading pages of a PDF to grayscale PNGs.
+
+    Args:
+        data: PDF file contents
+        max_pages: Page budget (0 for no limit)
+        dpi: Rendering resolution
+
+    Returns:
+        list: PNG bytes per page, in order
+    """
+    import fitz  # PyMuPDF
+
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        limit = min(doc.page_count, max_pages) if max_pages else doc.page_count
+        return [doc.load_page(number).get_pixmap(dpi=dpi, colorspace=fitz.csGRAY).tobytes("png")
+                for number in range(limit)]
+
+
+def page_key(engine: str, png: bytes) -> str:
+    """Cache key for a rendered page: engine, language and page pixels."""
+    digest = hashlib.sha256(f"{engine}\x00{config.OCR_LANGUAGE}\x00".encode("utf-8"))
+    digest.update(png)
+    return digest.hexdigest()
+
+
+def _cache_path(key: str) -> str:
+    return os.path.join(config.OCR_CACHE_DIR, f"{key}.txt")
+
+
+def _cached(key: str) -> Optional[str]:
+    if not config.OCR_CACHE_DIR:
+        return None
+    try:
+        with open(_cache_path(key), encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _remember(key: str, text: str) -> None:
+    if not config.OCR_CACHE_DIR:
+        return
+    os.makedirs(config.OCR_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{_cache_path(key)}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, _cache_path(key))
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_slots: Optional[threading.BoundedSemaphore] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Return the shared OCR pool, starting it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=config.OCR_WORKERS)
+            atexit.register(shutdown_pool)
+        return _pool
+
+
+def _get_slots() -> threading.BoundedSemaphore:
+    global _slots
+    with _pool_lock:
+        if _slots is None:
+            _slots = threading.BoundedSemaphore(max(1, config.OCR_MAX_DOCUMENTS))
+        return _slots
+
+
+def shutdown_pool() -> None:
+    """Stop the OCR pool (see pdf_extract.shutdown_pool)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+def _kill_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Terminate a pool whose worker is stuck on a page past its timeout, since a
+    running task cannot be cancelled. The next submit starts a fresh pool;
+    other documents' pages that were in it are run again there.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    for process in list((pool._processes or {}).values()):  # no public API stops a running task
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+    metrics.OCR_POOL_RESTARTS.inc()
+
+
+def _recognize_pages(engine: str, pages: List[Tuple[int, bytes]], workers: int,
+                     deadline: float) -> List[Tuple[int, Optional[str]]]:
+    """
+    OCR pages in the pool, or in-process with one worker; None marks a page
+    that timed out. PyMuPDF OCR has no timeout of its own, so its pages always
+    run in the pool, where an overrunning worker can be terminated.
+    """
+    page_timeout = config.OCR_PAGE_TIMEOUT_SECONDS
+    if workers <= 1 and engine == "tesseract":
+        results: List[Tuple[int, Optional[str]]] = []
+        for number, png in pages:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                results.append((number, None))
+                continue
+            try:
+                results.append((number, _recognize(engine, png, config.OCR_LANGUAGE, min(page_timeout, remaining))))
+            except RuntimeError:  # pytesseract's timeout
+                results.append((number, None))
+        return results
+
+    def submit(png: bytes) -> Tuple[ProcessPoolExecutor, Future]:
+        pool = _get_pool()
+        return pool, pool.submit(_recognize, engine, png, config.OCR_LANGUAGE, page_timeout)
+
+    futures = [(number, png, *submit(png)) for number, png in pages]
+    results = []
+    for number, png, pool, future in futures:
+        for attempt in range(2):
+            try:
+                timeout = max(0.0, min(page_timeout, deadline - time.monotonic()))
+                results.append((number, future.result(timeout=timeout)))
+            except FutureTimeoutError:
+                if not future.cancel():
+                    _kill_pool(pool)
+                results.append((number, None))
+            except BrokenExecutor:
+                # Another page's timeout terminated the pool: run this one again in a fresh pool
+                if attempt:
+                    raise
+                pool, future = submit(png)
+                continue
+            except RuntimeError:  # pytesseract's timeout inside the worker
+                results.append((number, None))
+            break
+    return results
+
+
+def ocr_pdf_text(data: bytes, workers: Optional[int] = None) -> str:
+    """
+    Read a scanned PDF with OCR.
+
+    Args:
+        data: PDF file contents
+        workers: OCR worker processes (defaults to config.OCR_WORKERS;
+            1 recognizes pages in this process)
+
+    Returns:
+        str: Recognized text with pages separated by form feeds, stripped
+
+    Raises:
+        OCRUnavailableError: If no OCR engine is available
+        OCRBusyError: If too many scanned PDFs are being read already
+        ValueError: If no text was recognized within the budgets
+    """
+    engine = find_engine()
+    if engine is None:
+        raise OCRUnavailableError("PDF contains only images and OCR is not available (install Tesseract)")
+    workers = config.OCR_WORKERS if workers is None else workers
+    slots = _get_slots()
+    if not slots.acquire(blocking=False):
+        raise OCRBusyError("Too many scanned PDFs are being read right now, please try again shortly")
+    try:
+        with metrics.timed("ocr"):
+            deadline = time.monotonic() + config.OCR_TIMEOUT_SECONDS
+            pngs = render_pages(data, config.OCR_MAX_PAGES, config.OCR_DPI)
+            keys = [page_key(engine, png) for png in pngs]
+            texts: List[Optional[str]] = [_cached(key) for key in keys]
+            metrics.OCR_PAGES.inc(sum(text is not None for text in texts), result="cached")
+            missing = [(number, pngs[number]) for number, text in enumerate(texts) if text is None]
+            for number, text in _recognize_pages(engine, missing, workers, deadline):
+                metrics.OCR_PAGES.inc(result="timeout" if text is None else "recognized")
+                if text is not None:
+                    _remember(keys[number], text)
+                    texts[number] = text
+    finally:
+        slots.release()
+
+    text = PAGE_BREAK.join(page or "" for page in texts).strip()
+    if not text:
+        raise ValueError("No text could be recognized in this scanned PDF")
+    return text
@@ -0,0 +1,190 @@
+"""
+Optional local LaTeX-to-PDF build.
+Runs tectonic or pdflatex in a bounded worker pool, never with shell escape,
+and caches compiled PDFs on disk by a hash of the engine and source, so the
+same resume is only compiled once.
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import config
+import metrics
+
+ENGINES = ("tectonic", "pdflatex")
+
+
+class PDFBuildError(RuntimeError):
+    """Raised when no LaTeX engine is available or compilation fails."""
+
+
+def find_engine() -> Optional[str]:
+    """
+    Locate the configured LaTeX engine.
+
+    Returns:
+        str: Path to the engine binary, or None if none is installed or
+            PDF_BUILD_ENGINE is "none"
+    """
+    choice = config.PDF_BUILD_ENGINE
+    if choice == "none":
+        return None
+    candidates = ENGINES if choice == "auto" else (choice,)
+    for name in candidates:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def _command(engine: str, workdir: str) -> List[str]:
+    if os.path.basename(engine).startswith("tectonic"):
+        return [engine, "--outdir", workdir, "--chatter", "minimal", "resume.tex"]
+    # pdflatex needs two runs only for references; resumes have none
+    return [engine, "-interaction=nonstopmode", "-halt-on-error", "-no-shell-escape",
+            "-output-directory", workdir, "resume.tex"]
+
+
+def _compile(engine: str, latex: str, timeout: float) -> bytes:
+    """Compile one document in a scratch directory and return the PDF bytes."""
+    with tempfile.TemporaryDirectory(prefix="resume-pdf-") as workdir:
+        with open(os.path.join(workdir, "resume.tex"), "w", encoding="utf-8") as f:
+            f.write(latex)
+        try:
+            result = subprocess.run(
+                _command(engine, workdir), cwd=workdir, capture_output=True,
+                timeout=timeout, stdin=subprocess.DEVNULL,
+            )
+        except subprocess.TimeoutExpired:
+            raise PDFBuildError(f"LaTeX build timed out after {timeout:.0f}s")
+        pdf_path = os.path.join(workdir, "resume.pdf")
+        if result.returncode != 0 or not os.path.exists(pdf_path):
+            log = (result.stdout + result.stderr).decode("utf-8", "replace")
+            raise PDFBuildError("LaTeX build failed:\n" + "\n".join(log.splitlines()[-15:]))
+        with open(pdf_path, "rb") as f:
+            return f.read()
+
+
+class PDFBuilder:
+    """
+    Compiles LaTeX to PDF with a disk cache and at most `workers` builds at once.
+
+    Each build is its own compiler process; the pool only bounds how many run
+    concurrently. Identical sources submitted while a build is running share
+    its result.
+
+    Args:
+        engine: Path to tectonic or pdflatex
+        cache_dir: Directory for cached PDFs ("" disables the cache)
+        workers: Maximum concurrent builds
+        timeout: Seconds before a build is abandoned
+    """
+
+    def __init__(self, engine: str, cache_dir: str, workers: int, timeout: float) -> None:
+        self.engine = engine
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="pdf-build")
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def cache_key(self, latex: str) -> str:
+        digest = hashlib.sha256(os.path.basename(self.engine).encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(latex.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+
+    def _build(self, key: str, latex: str) -> bytes:
+        try:
+            with metrics.timed("pdf_build"):
+                pdf = _compile(self.engine, latex, self.timeout)
+            if self.cache_dir:
+                tmp_path = f"{self._cache_path(key)}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(pdf)
+                os.replace(tmp_path, self._cache_path(key))
+            return pdf
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def submit(self, latex: str) -> Future:
+        """
+        Start (or join) a build and return a Future for the PDF bytes.
+
+        A cached PDF is returned as an already-completed Future.
+        """
+        key = self.cache_key(latex)
+        if self.cache_dir and os.path.exists(self._cache_path(key)):
+            future: Future = Future()
+            with open(self._cache_path(key), "rb") as f:
+                future.set_result(f.read())
+            metrics.CACHE_LOOKUPS.inc(kind="pdf", result="hit")
+            return future
+        metrics.CACHE_LOOKUPS.inc(kind="pdf", result="miss")
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._pool.submit(self._build, key, latex)
+                self._inflight[key] = future
+            return future
+
+    def build(self, latex: str) -> bytes:
+        """Compile latex and wait for the PDF bytes."""
+        return self.submit(latex).result()
+
+
+_builder: Optional[PDFBuilder] = None
+_builder_lock = threading.Lock()
+
+
+def get_pdf_builder() -> Optional[PDFBuilder]:
+    """
+    Return the process-wide PDF builder configured in config.py.
+
+    Returns:
+        PDFBuilder: The builder, or None when no LaTeX engine is available
+    """
+    global _builder
+    with _builder_lock:
+        if _builder is None:
+            engine = find_engine()
+            if engine is None:
+                return None
+            _builder = PDFBuilder(
+                engine,
+                cache_dir=config.PDF_BUILD_CACHE_DIR,
+                workers=config.PDF_BUILD_WORKERS,
+                timeout=config.PDF_BUILD_TIMEOUT_SECONDS,
+            )
+        return _builder
+
+
+def build_pdf(latex: str) -> bytes:
+    """
+    Compile a LaTeX document to PDF with the configured engine.
+
+    Args:
+        latex: Complete LaTeX source (e.g. from resume_render.generate_latex)
+
+    Returns:
+        bytes: PDF file contents
+
+    Raises:
+        PDFBuildError: If no engine is installed or the build fails
+    """
+    builder = get_pdf_builder()
+    if builder is None:
+        raise PDFBuildError("No LaTeX engine found; install tectonic or pdflatex")
+    return builder.build(latex)
@@ -0,0 +1,152 @@
+"""
+PDF text extraction engine.
+Opens each document once and extracts pages either lazily (a generator with
+early exit) or in parallel across worker processes that each open the same
+buffer. Page texts are collected in a list and joined once, separated by
+form feeds so later stages can tell pages apart.
+
+PyMuPDF is imported inside the functions that open documents, so importing
+this module (and everything that depends on it) stays cheap.
+"""
+
+import atexit
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional
+
+import config
+from text_normalize import PAGE_BREAK
+
+EMPTY_PDF_MESSAGE = "PDF appears to be empty or contains only images"
+
+
+def iter_pdf_pages(
+    data: bytes,
+    max_pages: Optional[int] = None,
+    empty_page_budget: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    Lazily yield the text of each page.
+
+    Args:
+        data: PDF file contents
+        max_pages: Stop after this many pages (None or 0 for no limit)
+        empty_page_budget: Raise as soon as this many leading pages have no
+            text, instead of reading the whole document first
+
+    Yields:
+        str: Text of each page, in order
+
+    Raises:
+        ValueError: If the leading pages exhaust empty_page_budget
+    """
+    import fitz  # PyMuPDF
+
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        limit = min(doc.page_count, max_pages) if max_pages else doc.page_count
+        yield from _iter_doc_pages(doc, limit, empty_page_budget)
+
+
+def _iter_doc_pages(doc: "fitz.Document", limit: int, empty_page_budget: Optional[int]) -> Iterator[str]:
+    """Yield the text of the first limit pages of an open document."""
+    seen_text = False
+    for number in range(limit):
+        text = doc.load_page(number).get_text()
+        if not seen_text:
+            seen_text = bool(text.strip())
+            if not seen_text and empty_page_budget and number + 1 >= empty_page_budget:
+                raise ValueError(EMPTY_PDF_MESSAGE)
+        yield text
+
+
+def _extract_page_range(data: bytes, start: int, stop: int) -> List[str]:
+    """Extract pages [start, stop) in a worker process."""
+    import fitz  # PyMuPDF
+
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return [doc.load_page(number).get_text() for number in range(start, stop)]
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Return the shared page-extraction pool, starting it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=config.PDF_EXTRACT_WORKERS)
+            atexit.register(shutdown_pool)
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """
+    Stop the page-extraction pool. Call this explicitly before a
+    multiprocessing child exits, since its exit handler joins child
+    processes before atexit hooks run.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+def extract_pdf_text(
+    data: bytes,
+    max_pages: Optional[int] = None,
+    workers: Optional[int] = None,
+    empty_page_budget: Optional[int] = None,
+) -> str:
+    """
+    Extract text from a PDF held in memory.
+
+    Documents with at least config.PDF_PARALLEL_MIN_PAGES pages are split into
+    contiguous page ranges and extracted in parallel; smaller ones are read
+    sequentially, which avoids pickling the buffer to other processes.
+
+    Args:
+        data: PDF file contents
+        max_pages: Page budget (defaults to config.PDF_MAX_PAGES; 0 for no limit)
+        workers: Worker processes to use (defaults to config.PDF_EXTRACT_WORKERS;
+            1 forces sequential extraction)
+        empty_page_budget: Leading empty pages tolerated before giving up
+            (defaults to config.PDF_EMPTY_PAGE_BUDGET)
+
+    Returns:
+        str: Extracted text, stripped
+
+    Raises:
+        ValueError: If no text could be extracted
+    """
+    max_pages = config.PDF_MAX_PAGES if max_pages is None else max_pages
+    workers = config.PDF_EXTRACT_WORKERS if workers is None else workers
+    if empty_page_budget is None:
+        empty_page_budget = config.PDF_EMPTY_PAGE_BUDGET
+
+    import fitz  # PyMuPDF
+
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        page_count = min(doc.page_count, max_pages) if max_pages else doc.page_count
+        if workers <= 1 or page_count < config.PDF_PARALLEL_MIN_PAGES:
+            head = page_count
+        else:
+            # Read the leading pages here so image-only scans fail before fan-out
+            head = min(empty_page_budget or 1, page_count)
+        pages = list(_iter_doc_pages(doc, head, empty_page_budget))
+
+    if head < page_count:
+        chunk = -(-(page_count - head) // workers)
+        futures = [
+            _get_pool().submit(_extract_page_range, data, start, min(start + chunk, page_count))
+            for start in range(head, page_count, chunk)
+        ]
+        for future in futures:
+            pages.extend(future.result())
+
+    text = PAGE_BREAK.join(pages).strip()
+    if not text:
+        raise ValueError(EMPTY_PDF_MESSAGE)
+    return text
@@ -0,0 +1,284 @@
+"""
+Persistent, content-addressed cache for Gemini responses.
+Entries are keyed on a hash of (model, prompt version, resume text), so
+identical resumes share one LLM call across sessions, restarts, and processes.
+Only trailing whitespace is ignored in the text: line breaks change the prompt
+(and how sections are parsed), so they are part of the key.
+
+Usage:
+    python response_cache.py stats
+    python response_cache.py clear
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import config
+
+# Expiry and LRU eviction run once per this many writes, not on every write
+EVICT_EVERY = 64
+
+
+def _key_text(text: str) -> str:
+    """Text as it is keyed: trailing whitespace of lines and the text dropped, everything else kept."""
+    return "\n".join(line.rstrip() for line in text.splitlines()).strip("\n")
+
+
+def make_cache_key(kind: str, model: str, prompt_version: str, text: str) -> str:
+    """
+    Build a content-addressed cache key.
+
+    Args:
+        kind: Response type (e.g. "enhance", "scores", "summary")
+        model: Gemini model name
+        prompt_version: Version of the prompt template used
+        text: Resume text the prompt was built from
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for part in (kind, model, prompt_version, _key_text(text)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """Base class for response cache backends. Stores JSON-serializable values or bytes."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # get() runs on pool workers and job threads at once, so counters change under a lock
+        self._stats_lock = threading.Lock()
+
+    def _count(self, hits: int = 0, misses: int = 0, evictions: int = 0) -> None:
+        with self._stats_lock:
+            self.hits += hits
+            self.misses += misses
+            self.evictions += evictions
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, kind: str, model: str, prompt_version: str) -> None:
+        """Store a value along with the metadata used for invalidation."""
+        raise NotImplementedError
+
+    def invalidate(self, kind: Optional[str] = None, model: Optional[str] = None) -> int:
+        """Remove entries matching kind and/or model (all entries if neither is given)."""
+        raise NotImplementedError
+
+    def prune_stale(self, model: str, prompt_versions: Dict[str, str]) -> int:
+        """Remove entries produced by another model or an outdated prompt version."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters plus backend-specific details."""
+        with self._stats_lock:
+            hits, misses, evictions = self.hits, self.misses, self.evictions
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "evictions": evictions,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class NullResponseCache(ResponseCache):
+    """Cache backend that stores nothing. Used when caching is disabled."""
+
+    def get(self, key: str) -> Optional[Any]:
+        self._count(misses=1)
+        return None
+
+    def set(self, key: str, value: Any, kind: str, model: str, prompt_version: str) -> None:
+        pass
+
+    def invalidate(self, kind: Optional[str] = None, model: Optional[str] = None) -> int:
+        return 0
+
+    def prune_stale(self, model: str, prompt_versions: Dict[str, str]) -> int:
+        return 0
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    SQLite-backed cache with TTL expiry and LRU eviction.
+
+    The database runs in WAL mode, so several app replicas and batch workers on
+    the same host can share one file. Each thread gets its own connection.
+    Eviction runs every EVICT_EVERY writes, so the table may briefly hold that
+    many entries over max_entries (per process).
+    """
+
+    def __init__(self, path: str, ttl_seconds: int, max_entries: int) -> None:
+        super().__init__()
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " kind TEXT NOT NULL,"
+                " model TEXT NOT NULL,"
+                " prompt_version TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " created REAL NOT NULL,"
+                " accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_created ON responses (created)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA cache_size=-{config.SQLITE_CACHE_KB}")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._count(misses=1)
+                return None
+            value, created = row
+            if self.ttl_seconds > 0 and now - created > self.ttl_seconds:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._count(misses=1, evictions=1)
+                return None
+            conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        self._count(hits=1)
+        return value if isinstance(value, bytes) else json.loads(value)
+
+    def set(self, key: str, value: Any, kind: str, model: str, prompt_version: str) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, kind, model, prompt_version, value, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, kind, model, prompt_version,
+                 value if isinstance(value, bytes) else json.dumps(value), now, now),
+            )
+            with self._writes_lock:
+                self._writes += 1
+                due = self._writes % EVICT_EVERY == 1
+            if due:
+                self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries, then the least recently used ones over max_entries."""
+        if self.ttl_seconds > 0:
+            cur = conn.execute(
+                "DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,)
+            )
+            self._count(evictions=cur.rowcount)
+        if self.max_entries > 0:
+            cur = conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._count(evictions=cur.rowcount)
+
+    def invalidate(self, kind: Optional[str] = None, model: Optional[str] = None) -> int:
+        clauses, params = [], []
+        if kind is not None:
+            clauses.append("kind = ?")
+            params.append(kind)
+        if model is not None:
+            clauses.append("model = ?")
+            params.append(model)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            return conn.execute(f"DELETE FROM responses{where}", params).rowcount
+
+    def prune_stale(self, model: str, prompt_versions: Dict[str, str]) -> int:
+        removed = 0
+        with self._connect() as conn:
+            removed += conn.execute(
+                "DELETE FROM responses WHERE model != ?", (model,)
+            ).rowcount
+            for kind, version in prompt_versions.items():
+                removed += conn.execute(
+                    "DELETE FROM responses WHERE kind = ? AND prompt_version != ?",
+                    (kind, version),
+                ).rowcount
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        with self._connect() as conn:
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM responses"
+            ).fetchone()
+        stats.update({"backend": "sqlite", "path": self.path, "entries": entries, "bytes": size})
+        return stats
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Return the process-wide response cache configured in config.py.
+
+    Returns:
+        ResponseCache: SQLite cache, or a no-op cache when disabled
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            if config.RESPONSE_CACHE_BACKEND == "sqlite":
+                _cache = SQLiteResponseCache(
+                    config.RESPONSE_CACHE_PATH,
+                    ttl_seconds=config.RESPONSE_CACHE_TTL_SECONDS,
+                    max_entries=config.RESPONSE_CACHE_MAX_ENTRIES,
+                )
+            else:
+                _cache = NullResponseCache()
+        return _cache
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Inspect or clear the configured response cache."""
+    args = sys.argv[1:] if argv is None else argv
+    command = args[0] if args else "stats"
+    cache = get_response_cache()
+    if command == "stats":
+        print(json.dumps(cache.stats(), indent=2))
+    elif command == "clear":
+        print(f"Removed {cache.invalidate()} entries")
+    else:
+        print(f"Unknown command: {command} (expected 'stats' or 'clear')", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,943 @@
+"""
+Gemini-powered resume analysis helpers.
+Shared by the Streamlit app and the batch CLI, so nothing here touches Streamlit:
+failures are raised to the caller instead of being rendered.
+"""
+
+import asyncio
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import config
+import local_scoring
+import metrics
+from chunking import apply_token_budget, chunk_resume
+from llm_client import get_client
+from response_cache import get_response_cache, make_cache_key
+from scheduler import propagate
+from section_parser import DEFAULT_MATCHER, match_heading
+
+if TYPE_CHECKING:  # resume_model is imported on first use, to keep startup fast
+    from resume_model import Resume
+
+# Bump a version whenever its prompt or parser changes; cached responses built
+# from older versions are then ignored and pruned.
+PROMPT_VERSIONS: Dict[str, str] = {
+    "enhance": "1",
+    "section": "1",
+    "scores": "1",
+    "subjective_scores": "1",
+    "summary": "1",
+    "analysis": "1",
+}
+
+NO_DATA = "No relevant data found"
+DEFAULT_CORRECTION = "General improvements applied to grammar, structure, and clarity"
+
+
+@dataclass
+class ResumeAnalysis:
+    """Typed result of the combined "analyze all" request."""
+    sections: Dict[str, str]
+    corrections: List[str]
+    scores: Dict[str, int]
+    summary: str
+
+    def to_resume(self, resume_text: str = "") -> "Resume":
+        """Typed form, with contact details from the original text when given."""
+        from resume_model import Resume, Scores, parse_contact
+
+        return Resume.from_sections(self.sections, self.corrections, contact=parse_contact(resume_text),
+                                    scores=Scores(dict(self.scores)), summary=self.summary)
+
+
+# JSON schema for the combined request. Sections and scores are arrays of
+# name/value pairs so that names with spaces stay valid schema identifiers.
+ANALYSIS_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "sections": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string", "enum": list(config.RESUME_SECTIONS)},
+                    "content": {"type": "string"},
+                },
+                "required": ["name", "content"],
+            },
+        },
+        "corrections": {"type": "array", "items": {"type": "string"}},
+        "scores": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "criterion": {"type": "string", "enum": list(config.QUALITY_CRITERIA)},
+                    "score": {"type": "integer"},
+                },
+                "required": ["criterion", "score"],
+            },
+        },
+        "summary": {"type": "string"},
+    },
+    "required": ["sections", "corrections", "scores", "summary"],
+}
+
+
+# --- Response Parsing ---
+
+class SectionStreamParser:
+    """
+    Incremental section parser for resume text that arrives in chunks.
+
+    feed() returns each section as soon as the next heading (or close())
+    proves it is complete, so a caller can render sections while the rest of
+    the response is still being generated.
+    """
+
+    def __init__(self) -> None:
+        self.sections = {section: NO_DATA for section in config.RESUME_SECTIONS}
+        self._current: Optional[str] = None
+        self._collected: List[str] = []
+        self._partial = ""
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """Consume a chunk of text and return the sections it completed."""
+        lines = (self._partial + chunk).split('\n')
+        self._partial = lines.pop()
+        completed: List[Tuple[str, str]] = []
+        for line in lines:
+            completed.extend(self.feed_line(line))
+        return completed
+
+    def feed_line(self, line: str) -> List[Tuple[str, str]]:
+        """Consume one complete line and return the section it completed, if any."""
+        line = line.strip()
+        if not line:
+            return []
+
+        heading = match_heading(line)
+        if heading:
+            completed = self._flush()
+            self._current, inline = heading
+            if inline:
+                self._collected.append(inline)
+            return completed
+        if self._current:
+            self._collected.append(line)
+        return []
+
+    def close(self) -> List[Tuple[str, str]]:
+        """Flush any buffered text and return the final completed section."""
+        completed = self.feed_line(self._partial) if self._partial else []
+        self._partial = ""
+        return completed + self._flush()
+
+    def _flush(self) -> List[Tuple[str, str]]:
+        if not (self._current and self._collected):
+            return []
+        content = '\n'.join(self._collected)
+        if self.sections[self._current] != NO_DATA:
+            content = self.sections[self._current] + '\n' + content
+        self.sections[self._current] = content
+        self._collected = []
+        return [(self._current, content)]
+
+
+def parse_sections(text: str) -> Dict[str, str]:
+    """Parse improved resume text into sections."""
+    return DEFAULT_MATCHER.parse(text, NO_DATA)
+
+
+def parse_corrections(text: str) -> List[str]:
+    """Extract corrections from AI response."""
+    lines = text.split('\n')
+    corrections = []
+    capture = False
+
+    for line in lines:
+        if "corrections" in line.lower() or "changes" in line.lower():
+            capture = True
+            continue
+        if capture:
+            if line.startswith("-") or line.startswith("*") or line.startswith("•"):
+                corrections.append(line.lstrip("-*• ").strip())
+            elif line.strip() == "":
+                if corrections:  # Stop if we have corrections and hit empty line
+                    break
+            elif line.strip():
+                corrections.append(line.strip())
+
+    return corrections if corrections else [DEFAULT_CORRECTION]
+
+
+def parse_scores(text: str) -> Dict[str, int]:
+    """Parse "Criterion: score" lines into a dict of scores clamped to 0-100."""
+    scores = {}
+    for line in text.splitlines():
+        parts = line.split(":")
+        if len(parts) == 2:
+            label = parts[0].strip()
+            try:
+                score = int(parts[1].strip().replace('%', '').split()[0])
+                scores[label] = max(0, min(score, 100))
+            except (ValueError, IndexError):
+                pass
+    return scores
+
+
+def split_enhancement_response(response_text: str) -> Tuple[str, str]:
+    """Split an enhancement response into (improved resume, corrections text)."""
+    if "CORRECTIONS" in response_text.upper():
+        parts = re.split(r'CORRECTIONS?\s*(?:MADE)?:', response_text, flags=re.IGNORECASE)
+        improved_resume = parts[0].replace("IMPROVED RESUME:", "").strip()
+        corrections_text = parts[1].strip() if len(parts) > 1 else ""
+    else:
+        improved_resume = response_text.strip()
+        corrections_text = ""
+    return improved_resume, corrections_text
+
+
+_CORRECTIONS_HEADING = re.compile(r'CORRECTIONS?\s*(?:MADE)?:', re.IGNORECASE)
+
+
+class EnhancementStreamParser:
+    """
+    Incremental parser for a streamed enhancement response.
+
+    Resume lines go through a SectionStreamParser until the CORRECTIONS MADE
+    heading appears; everything after it is buffered and parsed with
+    parse_corrections() once the stream ends.
+    """
+
+    def __init__(self) -> None:
+        self.section_parser = SectionStreamParser()
+        self._in_corrections = False
+        self._corrections: List[str] = []
+        self._partial = ""
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """Consume a chunk of the response and return the sections it completed."""
+        if self._in_corrections:
+            self._corrections.append(chunk)
+            return []
+        lines = (self._partial + chunk).split('\n')
+        self._partial = lines.pop()
+        completed: List[Tuple[str, str]] = []
+        for index, line in enumerate(lines):
+            match = _CORRECTIONS_HEADING.search(line)
+            if match:
+                completed.extend(self.section_parser.feed_line(line[:match.start()]))
+                completed.extend(self.section_parser.close())
+                self._in_corrections = True
+                rest = [line[match.end():]] + lines[index + 1:] + [self._partial]
+                self._corrections.append('\n'.join(rest))
+                self._partial = ""
+                break
+            completed.extend(self.section_parser.feed_line(line))
+        return completed
+
+    def close(self) -> List[Tuple[str, str]]:
+        """Flush buffered text and return any sections completed by the end of the stream."""
+        if self._in_corrections:
+            return []
+        completed = self.feed(self._partial + '\n') if self._partial else []
+        self._partial = ""
+        if self._in_corrections:
+            return completed
+        return completed + self.section_parser.close()
+
+    def result(self) -> Tuple[Dict[str, str], List[str]]:
+        """Return (sections, corrections) once the stream has been closed."""
+        return self.section_parser.sections, parse_corrections(''.join(self._corrections).strip())
+
+
+def parse_analysis(response_text: str) -> ResumeAnalysis:
+    """
+    Parse the JSON body of a combined analysis response.
+
+    Args:
+        response_text: JSON matching ANALYSIS_SCHEMA
+
+    Returns:
+        ResumeAnalysis: Sections padded to config.RESUME_SECTIONS and scores
+            clamped to 0-100
+
+    Raises:
+        ValueError: If the response is not valid JSON of the expected shape
+    """
+    body = response_text.strip()
+    if body.startswith("```"):
+        body = body.strip("`")
+        body = body[body.find("{"):]
+    try:
+        data = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Analysis response is not valid JSON: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError("Analysis response is not a JSON object")
+
+    sections = {section: NO_DATA for section in config.RESUME_SECTIONS}
+    for item in data.get("sections") or []:
+        name, content = item.get("name"), (item.get("content") or "").strip()
+        if name in sections and content:
+            sections[name] = content
+
+    scores = {}
+    for item in data.get("scores") or []:
+        criterion = item.get("criterion")
+        try:
+            scores[criterion] = max(0, min(int(item.get("score")), 100))
+        except (TypeError, ValueError):
+            continue
+
+    corrections = [c.strip() for c in data.get("corrections") or [] if c and c.strip()]
+    return ResumeAnalysis(
+        sections=sections,
+        corrections=corrections or [DEFAULT_CORRECTION],
+        scores=scores,
+        summary=(data.get("summary") or "").strip(),
+    )
+
+
+# --- Prompts ---
+
+def build_quality_prompt(text: str, criteria: Optional[List[str]] = None) -> str:
+    """Build the quality-scoring prompt for the given criteria (default: all of them)."""
+    criteria = config.QUALITY_CRITERIA if criteria is None else criteria
+    return (
+        f"Evaluate the following resume based on these {len(criteria)} criteria. "
+        "Return ONLY scores (0 to 100) for each in this exact format:\n\n"
+        + "".join(f"{criterion}: [score]\n" for criterion in criteria)
+        + "\nResume:\n" + text
+    )
+
+
+def llm_criteria() -> List[str]:
+    """Criteria left to Gemini in the configured scoring mode."""
+    local = local_scoring.local_criteria()
+    return [criterion for criterion in config.QUALITY_CRITERIA if criterion not in local]
+
+
+def build_subjective_quality_prompt(text: str) -> str:
+    """Build the quality-scoring prompt for the criteria that are not scored locally."""
+    return build_quality_prompt(text, llm_criteria())
+
+
+def build_summary_prompt(text: str) -> str:
+    """Build the summary prompt."""
+    return (
+        "Summarize the following resume in 2-3 concise paragraphs. "
+        "Highlight key skills, experience, education, and notable achievements. "
+        "Be specific and professional:\n\n" + text
+    )
+
+
+_ENHANCE_STEPS = (
+    "1. Fixing all grammar and spelling errors\n"
+    "2. Improving clarity and conciseness\n"
+    "3. Enhancing word choice and professional tone\n"
+    "4. Optimizing structure and formatting\n"
+    "5. Adding impactful action verbs where appropriate\n\n"
+)
+_ENHANCE_FORMAT = (
+    "IMPROVED RESUME:\n"
+    "[Enhanced resume organized into sections: Objective, Education, Experience, Skills, Projects, Certifications, Extracurricular Activities, Declaration]\n\n"
+    "CORRECTIONS MADE:\n"
+    "- Correction 1\n"
+    "- Correction 2\n"
+    "...\n"
+)
+
+
+def build_enhance_prompt(resume_text: str) -> str:
+    """Build the enhancement prompt."""
+    return (
+        "You are an expert resume writer. Enhance the following resume by:\n"
+        + _ENHANCE_STEPS
+        + "Return your response in this EXACT format:\n\n"
+        + _ENHANCE_FORMAT
+        + "\nOriginal Resume:\n" + resume_text
+    )
+
+
+def section_text(name: str, content: str) -> str:
+    """Text a single section is cached and prompted under: its heading, then its content."""
+    return f"{name}\n{content}"
+
+
+def build_section_prompt(text: str) -> str:
+    """Build the prompt enhancing one section (see section_text)."""
+    return (
+        "You are an expert resume writer. Enhance the following resume section by:\n"
+        + _ENHANCE_STEPS
+        + "Keep to the facts in this section. Return ONLY the improved content of the "
+        "section, without its heading, explanations or a list of corrections.\n\n"
+        "Original Section:\n" + text
+    )
+
+
+# Delimiters for packing several resumes into one request; ids are short
+# tags assigned by the caller (see bulk.py)
+BULK_RESUME_START = "=== RESUME {} ==="
+BULK_RESULT_START = "=== RESULT {} ==="
+BULK_END = "=== END {} ==="
+_BULK_RESULT = re.compile(r"^=== RESULT (\S+) ===[ \t]*$(.*?)^=== END \1 ===[ \t]*$", re.MULTILINE | re.DOTALL)
+
+
+def build_bulk_enhance_prompt(items: List[Tuple[str, str]]) -> str:
+    """
+    Build one enhancement prompt covering several resumes.
+
+    Args:
+        items: (id, resume text) pairs; ids must not contain whitespace
+
+    Returns:
+        str: Prompt asking for one delimited result per id
+    """
+    resumes = "".join(
+        f"{BULK_RESUME_START.format(item_id)}\n{text}\n{BULK_END.format(item_id)}\n\n"
+        for item_id, text in items
+    )
+    return (
+        f"You are an expert resume writer. Below are {len(items)} independent resumes, each "
+        "between its own RESUME and END markers. Enhance EACH resume separately by:\n"
+        + _ENHANCE_STEPS
+        + "For every resume, return its result between markers carrying the same id, "
+        "in this EXACT format:\n\n"
+        + BULK_RESULT_START.format("<id>") + "\n"
+        + _ENHANCE_FORMAT
+        + BULK_END.format("<id>") + "\n\n"
+        "Never mix content between resumes.\n\n"
+        "Original Resumes:\n\n" + resumes
+    )
+
+
+def split_bulk_response(response_text: str) -> Dict[str, List[Any]]:
+    """
+    Split a bulk enhancement response into per-resume results.
+
+    Args:
+        response_text: Response to a build_bulk_enhance_prompt() prompt
+
+    Returns:
+        dict: id mapped to a [sections, corrections] pair. Ids whose block is
+            missing, unterminated or has no recognizable section are left out,
+            so the caller can retry them.
+    """
+    results = {}
+    for m in _BULK_RESULT.finditer(response_text):
+        improved_resume, corrections_text = split_enhancement_response(m.group(2))
+        sections = parse_sections(improved_resume)
+        if any(content != NO_DATA for content in sections.values()):
+            results[m.group(1)] = [sections, parse_corrections(corrections_text)]
+    return results
+
+
+def build_analysis_prompt(resume_text: str) -> str:
+    """Build the combined enhancement, scoring and summary prompt."""
+    return (
+        "You are an expert resume writer and reviewer. For the resume below, return a "
+        "single JSON object with:\n"
+        "- sections: the enhanced resume, one entry per section "
+        f"({', '.join(config.RESUME_SECTIONS)}); fix grammar and spelling, improve "
+        "clarity, tone and structure, and use impactful action verbs. Omit sections "
+        "with no relevant content.\n"
+        "- corrections: a short list of the changes you made.\n"
+        "- scores: a 0-100 score for the ORIGINAL resume on each of: "
+        f"{', '.join(config.QUALITY_CRITERIA)}.\n"
+        "- summary: 2-3 concise, professional paragraphs highlighting key skills, "
+        "experience, education, and notable achievements.\n\n"
+        "Original Resume:\n" + resume_text
+    )
+
+
+# --- Gemini Calls ---
+
+def _parse_enhancement(response_text: str) -> List[Any]:
+    """Parse an enhancement response into a cacheable [sections, corrections] pair."""
+    improved_resume, corrections_text = split_enhancement_response(response_text)
+    return [parse_sections(improved_resume), parse_corrections(corrections_text)]
+
+
+def _parse_section(response_text: str) -> str:
+    """Parse a section response, dropping a repeated heading or a corrections list."""
+    content, _ = split_enhancement_response(response_text.strip().strip("`"))
+    lines = content.split('\n')
+    heading = match_heading(lines[0].strip()) if lines else None
+    if heading:
+        lines = ([heading[1]] if heading[1] else []) + lines[1:]
+    return '\n'.join(lines).strip()
+
+
+# Per response kind: prompt builder, parser producing a JSON-serializable value,
+# and optional generation config.
+_PROMPTS: Dict[str, Callable[[str], str]] = {
+    "enhance": build_enhance_prompt,
+    "section": build_section_prompt,
+    "scores": build_quality_prompt,
+    "subjective_scores": build_subjective_quality_prompt,
+    "summary": build_summary_prompt,
+    "analysis": build_analysis_prompt,
+}
+_PARSERS: Dict[str, Callable[[str], Any]] = {
+    "enhance": _parse_enhancement,
+    "section": _parse_section,
+    "scores": parse_scores,
+    "subjective_scores": parse_scores,
+    "summary": str.strip,
+    "analysis": lambda response_text: asdict(parse_analysis(response_text)),
+}
+
+
+def _pack_enhancement(value: List[Any]) -> bytes:
+    from resume_model import Resume
+
+    return Resume.from_sections(value[0], value[1]).pack()
+
+
+def _unpack_enhancement(data: bytes) -> List[Any]:
+    from resume_model import Resume
+
+    resume = Resume.unpack(data)
+    return [resume.sections_dict(), resume.corrections]
+
+
+def _pack_analysis(value: Dict[str, Any]) -> bytes:
+    return ResumeAnalysis(**value).to_resume().pack()
+
+
+def _unpack_analysis(data: bytes) -> Dict[str, Any]:
+    from resume_model import Resume
+
+    resume = Resume.unpack(data)
+    return {"sections": resume.sections_dict(), "corrections": resume.corrections,
+            "scores": resume.scores.values, "summary": resume.summary}
+
+
+# Kinds cached as packed resume_model.Resume bytes instead of JSON. Entries
+# written as JSON before are still read as they are.
+_CODECS: Dict[str, Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+    "enhance": (_pack_enhancement, _unpack_enhancement),
+    "analysis": (_pack_analysis, _unpack_analysis),
+}
+_GENERATION_CONFIGS: Dict[str, Dict[str, Any]] = {
+    "analysis": {
+        "response_mime_type": "application/json",
+        "response_schema": ANALYSIS_SCHEMA,
+    },
+}
+
+
+def _generate(prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+    """Send a prompt through the shared client and return the response text."""
+    return get_client().generate_content(prompt, generation_config=generation_config).text
+
+
+async def _generate_async(prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+    """Asyncio version of _generate."""
+    response = await get_client().generate_content_async(prompt, generation_config=generation_config)
+    return response.text
+
+
+_pruned = False
+
+
+def _lookup(kind: str, text: str) -> Any:
+    """
+    Return the cached response for (kind, model, prompt version, text), or None.
+    Entries from other models or prompt versions are pruned the first time the
+    cache is used in this process.
+    """
+    global _pruned
+    cache = get_response_cache()
+    if not _pruned:
+        cache.prune_stale(config.GEMINI_MODEL, PROMPT_VERSIONS)
+        _pruned = True
+    value = cache.get(make_cache_key(kind, config.GEMINI_MODEL, PROMPT_VERSIONS[kind], text))
+    metrics.CACHE_LOOKUPS.inc(kind=kind, result="miss" if value is None else "hit")
+    if isinstance(value, bytes) and kind in _CODECS:
+        return _CODECS[kind][1](value)
+    return value
+
+
+def _store(kind: str, text: str, value: Any) -> None:
+    """
+    Write a value into the response cache under the key for (kind, text).
+    Enhancements also seed one entry per section they improved, so a later
+    incremental run reuses them (see incremental.py).
+    """
+    key = make_cache_key(kind, config.GEMINI_MODEL, PROMPT_VERSIONS[kind], text)
+    stored = _CODECS[kind][0](value) if kind in _CODECS else value
+    get_response_cache().set(key, stored, kind=kind, model=config.GEMINI_MODEL,
+                             prompt_version=PROMPT_VERSIONS[kind])
+    if kind == "enhance":
+        improved = value[0]
+        for name, content in parse_sections(text).items():
+            if content != NO_DATA and improved.get(name, NO_DATA) != NO_DATA:
+                _store("section", section_text(name, content), improved[name])
+
+
+def cached_enhancement(resume_text: str) -> Optional[Tuple[Dict[str, str], List[str]]]:
+    """Return the cached (sections, corrections) for an already budgeted text, or None."""
+    value = _lookup("enhance", resume_text)
+    return None if value is None else (value[0], value[1])
+
+
+def store_enhancement(resume_text: str, sections: Dict[str, str], corrections: List[str]) -> None:
+    """Cache an enhancement obtained outside enhance_resume (e.g. from a bulk request)."""
+    _store("enhance", resume_text, [sections, corrections])
+
+
+def cached_section(name: str, content: str) -> Optional[str]:
+    """Return the cached improvement of one section, or None."""
+    return _lookup("section", section_text(name, content))
+
+
+def enhance_section(name: str, content: str) -> str:
+    """
+    Enhance a single resume section.
+
+    Args:
+        name: Canonical section name (one of config.RESUME_SECTIONS)
+        content: The section's current content
+
+    Returns:
+        str: Improved content, without the heading
+
+    Raises:
+        Exception: If the Gemini request fails
+    """
+    return _run("section", section_text(name, content))
+
+
+async def enhance_section_async(name: str, content: str) -> str:
+    """Asyncio version of enhance_section."""
+    return await _run_async("section", section_text(name, content))
+
+
+def _run(kind: str, text: str) -> Any:
+    """Return the parsed response for kind, calling Gemini only on a cache miss."""
+    with metrics.timed(kind):
+        value = _lookup(kind, text)
+        if value is None:
+            value = _PARSERS[kind](_generate(_PROMPTS[kind](text), _GENERATION_CONFIGS.get(kind)))
+            _store(kind, text, value)
+    return value
+
+
+async def _run_async(kind: str, text: str) -> Any:
+    """Asyncio version of _run."""
+    with metrics.timed(kind):
+        value = _lookup(kind, text)
+        if value is None:
+            response_text = await _generate_async(_PROMPTS[kind](text), _GENERATION_CONFIGS.get(kind))
+            value = _PARSERS[kind](response_text)
+            _store(kind, text, value)
+    return value
+
+
+def merge_enhancements(results: List[Any]) -> Tuple[Dict[str, str], List[str]]:
+    """
+    Merge per-chunk enhancement results into one sections dict.
+
+    Section content from later chunks is appended to earlier content, and
+    corrections are de-duplicated in order.
+
+    Args:
+        results: [sections, corrections] pairs in chunk order
+
+    Returns:
+        tuple: (sections, corrections)
+    """
+    sections = {name: NO_DATA for name in config.RESUME_SECTIONS}
+    corrections: List[str] = []
+    for chunk_sections, chunk_corrections in results:
+        for name, content in chunk_sections.items():
+            if content == NO_DATA:
+                continue
+            sections[name] = content if sections.get(name, NO_DATA) == NO_DATA else f"{sections[name]}\n{content}"
+        corrections.extend(c for c in chunk_corrections if c not in corrections)
+    if len(corrections) > 1 and DEFAULT_CORRECTION in corrections:
+        corrections.remove(DEFAULT_CORRECTION)
+    return sections, corrections
+
+
+def _enhance_chunked(resume_text: str, chunks: List[str]) -> List[Any]:
+    """Enhance chunks concurrently and cache the merged result for the full text."""
+    value = _lookup("enhance", resume_text)
+    if value is None:
+        with ThreadPoolExecutor(max_workers=min(len(chunks), config.LLM_MAX_CONCURRENCY)) as pool:
+            results = list(pool.map(propagate(lambda chunk: _run("enhance", chunk)), chunks))
+        value = list(merge_enhancements(results))
+        _store("enhance", resume_text, value)
+    return value
+
+
+async def _enhance_chunked_async(resume_text: str, chunks: List[str]) -> List[Any]:
+    """Asyncio version of _enhance_chunked."""
+    value = _lookup("enhance", resume_text)
+    if value is None:
+        results = await asyncio.gather(*(_run_async("enhance", chunk) for chunk in chunks))
+        value = list(merge_enhancements(results))
+        _store("enhance", resume_text, value)
+    return value
+
+
+def _seed_from_analysis(resume_text: str, value: Dict[str, Any]) -> ResumeAnalysis:
+    """Populate the per-kind cache entries from a combined analysis."""
+    analysis = ResumeAnalysis(**value)
+    _store("enhance", resume_text, [analysis.sections, analysis.corrections])
+    _store("scores", resume_text, analysis.scores)
+    _store("summary", resume_text, analysis.summary)
+    analysis.scores = _merge_scores(resume_text, analysis.scores)
+    return analysis
+
+
+def _merge_scores(text: str, llm_scores: Optional[Dict[str, int]]) -> Dict[str, int]:
+    """
+    Combine Gemini scores with local ones for the configured scoring mode.
+
+    Locally scored criteria always use the local score; a criterion Gemini
+    did not return falls back to its local heuristic.
+    """
+    local = local_scoring.local_criteria()
+    if not local and llm_scores is not None:
+        return llm_scores
+    with metrics.timed("scores_local"):
+        computed = local_scoring.score_locally(text)
+    llm_scores = llm_scores or {}
+    scores = {}
+    for criterion in config.QUALITY_CRITERIA:
+        if criterion in llm_scores and criterion not in local:
+            scores[criterion] = llm_scores[criterion]
+        elif criterion in computed:
+            scores[criterion] = computed[criterion]
+    return scores
+
+
+def _llm_scores(text: str) -> Optional[Dict[str, int]]:
+    """
+    Gemini scores for the criteria the scoring mode leaves to Gemini.
+
+    Full scores cached by an earlier analysis are reused; otherwise only the
+    remaining criteria are requested. Returns None when every criterion is
+    scored locally.
+    """
+    if not llm_criteria():
+        return None
+    if not local_scoring.local_criteria():
+        return _run("scores", text)
+    cached = _lookup("scores", text)
+    return cached if cached is not None else _run("subjective_scores", text)
+
+
+async def _llm_scores_async(text: str) -> Optional[Dict[str, int]]:
+    """Asyncio version of _llm_scores."""
+    if not llm_criteria():
+        return None
+    if not local_scoring.local_criteria():
+        return await _run_async("scores", text)
+    cached = _lookup("scores", text)
+    return cached if cached is not None else await _run_async("subjective_scores", text)
+
+
+def get_quality_scores(text: str) -> Dict[str, int]:
+    """
+    Evaluate resume quality.
+
+    Depending on config.QUALITY_SCORING_MODE, criteria that local analysis
+    can compute are scored without Gemini ("hybrid"), every criterion is
+    ("fast", no request at all), or Gemini scores all of them ("llm").
+
+    Args:
+        text: Resume text
+
+    Returns:
+        dict: Criterion name mapped to a 0-100 score
+
+    Raises:
+        ResumeTooLongError: If the text exceeds the token ceiling and the policy is "refuse"
+        Exception: If the Gemini request fails
+    """
+    text, _ = apply_token_budget(text)
+    return _merge_scores(text, _llm_scores(text))
+
+
+def get_resume_summary(text: str) -> str:
+    """
+    Generate AI summary of resume.
+
+    Args:
+        text: Resume text
+
+    Returns:
+        str: Summary paragraphs
+
+    Raises:
+        ResumeTooLongError: If the text exceeds the token ceiling and the policy is "refuse"
+        Exception: If the Gemini request fails
+    """
+    text, _ = apply_token_budget(text)
+    return _run("summary", text)
+
+
+def enhance_resume(resume_text: str) -> Tuple[Dict[str, str], List[str]]:
+    """
+    Enhance resume using AI.
+
+    Resumes longer than config.CHUNK_TOKENS are split on section boundaries
+    and the chunks are enhanced concurrently, then merged.
+
+    Args:
+        resume_text: Original resume text
+
+    Returns:
+        tuple: (sections, corrections)
+
+    Raises:
+        ResumeTooLongError: If the text exceeds the token ceiling and the policy is "refuse"
+        Exception: If the Gemini request fails
+    """
+    resume_text, _ = apply_token_budget(resume_text)
+    chunks = chunk_resume(resume_text)
+    if len(chunks) > 1:
+        sections, corrections = _enhance_chunked(resume_text, chunks)
+    else:
+        sections, corrections = _run("enhance", resume_text)
+    return sections, corrections
+
+
+def enhance_resume_model(resume_text: str) -> "Resume":
+    """
+    enhance_resume, returned as a typed Resume.
+
+    Args:
+        resume_text: Original resume text
+
+    Returns:
+        Resume: Improved sections and corrections, with contact details from
+            the original text
+    """
+    from resume_model import Resume, parse_contact
+
+    return Resume.from_sections(*enhance_resume(resume_text), contact=parse_contact(resume_text))
+
+
+def analyze_resume(resume_text: str) -> ResumeAnalysis:
+    """
+    Enhance, score and summarize a resume with a single structured Gemini request.
+
+    The resume is sent once instead of three times. The parsed result also
+    populates the enhance, scores and summary cache entries, so the individual
+    helpers return instantly for the same text afterwards. Resumes too long
+    for one chunk fall back to the individual (chunked) requests.
+
+    Args:
+        resume_text: Original resume text
+
+    Returns:
+        ResumeAnalysis: Sections, corrections, scores and summary
+
+    Raises:
+        ResumeTooLongError: If the text exceeds the token ceiling and the policy is "refuse"
+        Exception: If the Gemini request fails or returns malformed JSON
+    """
+    resume_text, _ = apply_token_budget(resume_text)
+    if len(chunk_resume(resume_text)) > 1:
+        sections, corrections = enhance_resume(resume_text)
+        return ResumeAnalysis(sections, corrections, get_quality_scores(resume_text),
+                              get_resume_summary(resume_text))
+    return _seed_from_analysis(resume_text, _run("analysis", resume_text))
+
+
+def stream_enhance_resume(resume_text: str) -> Iterator[Tuple[Any, ...]]:
+    """
+    Enhance resume using AI, yielding each section as soon as it is complete.
+
+    Yields ``("section", name, content)`` for every finished section, then a
+    final ``("done", sections, corrections)`` carrying the same result that
+    enhance_resume() returns. A cached result is replayed immediately, as is
+    the merged result for resumes long enough to be enhanced in chunks.
+
+    Args:
+        resume_text: Original resume text
+
+    Yields:
+        tuple: Section events followed by one done event
+
+    Raises:
+        ResumeTooLongError: If the text exceeds the token ceiling and the policy is "refuse"
+        Exception: If the Gemini request fails
+    """
+    resume_text, _ = apply_token_budget(resume_text)
+    cached = _lookup("enhance", resume_text)
+    if cached is None and len(chunk_resume(resume_text)) > 1:
+        cached = enhance_resume(resume_text)
+    if cached is not None:
+        sections, corrections = cached
+        for name in config.RESUME_SECTIONS:
+            if sections.get(name, NO_DATA) != NO_DATA:
+                yield ("section", name, sections[name])
+        yield ("done", sections, corrections)
+        return
+
+    parser = EnhancementStreamParser()
+    with metrics.timed("enhance_stream"):
+        for chunk in get_client().generate_content_stream(build_enhance_prompt(resume_text)):
+            for name, content in parser.feed(chunk):
+                yield ("section", name, content)
+        for name, content in parser.close():
+            yield ("section", name, content)
+    sections, corrections = parser.result()
+    _store("enhance", resume_text, [sections, corrections])
+    yield ("done", sections, corrections)
+
+
+# --- Async Variants (used by the batch CLI) ---
+
+async def get_quality_scores_async(text: str) -> Dict[str, int]:
+    """Asyncio version of get_quality_scores."""
+    text, _ = apply_token_budget(text)
+    return _merge_scores(text, await _llm_scores_async(text))
+
+
+async def get_resume_summary_async(text: str) -> str:
+    """Asyncio version of get_resume_summary."""
+    text, _ = apply_token_budget(text)
+    return await _run_async("summary", text)
+
+
+async def enhance_resume_async(resume_text: str) -> Tuple[Dict[str, str], List[str]]:
+    """Asyncio version of enhance_resume."""
+    resume_text, _ = apply_token_budget(resume_text)
+    chunks = chunk_resume(resume_text)
+    if len(chunks) > 1:
+        sections, corrections = await _enhance_chunked_async(resume_text, chunks)
+    else:
+        sections, corrections = await _run_async("enhance", resume_text)
+    return sections, corrections
+
+
+async def enhance_resume_model_async(resume_text: str) -> "Resume":
+    """Asyncio version of enhance_resume_model."""
+    from resume_model import Resume, parse_contact
+
+    return Resume.from_sections(*await enhance_resume_async(resume_text), contact=parse_contact(resume_text))
+
+
+async def analyze_resume_async(resume_text: str) -> ResumeAnalysis:
+    """Asyncio version of analyze_resume."""
+    resume_text, _ = apply_token_budget(resume_text)
+    if len(chunk_resume(resume_text)) > 1:
+        (sections, corrections), scores, summary = await asyncio.gather(
+            enhance_resume_async(resume_text),
+            get_quality_scores_async(resume_text),
+            get_resume_summary_async(resume_text),
+        )
+        return ResumeAnalysis(sections, corrections, scores, summary)
+    return _seed_from_analysis(resume_text, await _run_async("analysis", resume_text))
@@ -0,0 +1,479 @@
+"""
+Typed resume model with a compact binary form and a columnar export.
+A Resume holds contact details, sections split into entries and bullets,
+corrections, scores and a summary, instead of loose section dicts with
+"No relevant data found" sentinels. Sections render back to exactly the text
+they were parsed from, so the model can stand in for the dicts in caches.
+
+pack() stores a resume as positional arrays (no field names, section and
+criterion names as indexes into config), serialized with msgpack when it is
+installed and as JSON otherwise, then zlib-compressed. write_parquet() writes
+one row per resume, with a nested column of entries, for analytics over
+large corpora (needs pyarrow).
+
+Usage:
+    resume = parse_resume(text)
+    resume = Resume.from_sections(sections, corrections)
+    data = resume.pack(); Resume.unpack(data).sections_dict()
+    python resume_model.py export results.jsonl corpus.parquet
+"""
+
+import json
+import re
+import sys
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import config
+from section_parser import DEFAULT_MATCHER
+
+# msgpack is optional (JSON is used instead) and loaded on first pack/unpack
+# rather than with this module (see _msgpack)
+msgpack: Any = None
+_msgpack_checked = False
+
+NO_DATA = "No relevant data found"  # matches resume_ai.NO_DATA
+MODEL_VERSION = 1
+
+_MSGPACK, _JSON = b"M", b"J"
+_MARKER = re.compile(r"^[ \t]*(?:[-*•▪●–>]|\d{1,2}[.)])[ \t]+")
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE = re.compile(r"\+?\d[\d ()-]{7,}\d")
+_LINK = re.compile(r"(?:https?://|www\.)\S+|\b(?:linkedin\.com|github\.com)/\S+", re.IGNORECASE)
+_NAME = re.compile(r"^[A-Za-z][A-Za-z.'-]*(?: [A-Za-z][A-Za-z.'-]*){1,4}$")
+_WORD = re.compile(r"[A-Za-z][A-Za-z'-]*")
+
+
+def _msgpack() -> Any:
+    """The msgpack module, imported on first use; None when it is not installed."""
+    global msgpack, _msgpack_checked
+    if not _msgpack_checked:
+        try:
+            import msgpack as module
+        except ImportError:
+            module = None
+        msgpack, _msgpack_checked = module, True
+    return msgpack
+
+
+def codec() -> str:
+    """Name of the format pack() writes: "msgpack" or "json"."""
+    return "json" if _msgpack() is None else "msgpack"
+
+
+@dataclass(slots=True)
+class Bullet:
+    """One line of an entry after its heading; marker is "" for a plain line."""
+    text: str
+    marker: str = "- "
+
+
+@dataclass(slots=True)
+class Entry:
+    """
+    A block within a section, such as one job or one degree.
+
+    Attributes:
+        heading: First line when it is not a bullet ("" otherwise)
+        bullets: Following lines in order
+        gap: Whether a blank line separates it from the previous entry
+    """
+    heading: str = ""
+    bullets: List[Bullet] = field(default_factory=list)
+    gap: bool = False
+
+
+@dataclass(slots=True)
+class Section:
+    """
+    One resume section.
+
+    Attributes:
+        name: Canonical section name (one of config.RESUME_SECTIONS)
+        entries: Content split into entries and bullets
+        raw: Original content when the entries cannot reproduce it exactly
+            (e.g. several blank lines in a row), else None
+    """
+    name: str
+    entries: List[Entry] = field(default_factory=list)
+    raw: Optional[str] = None
+
+    @classmethod
+    def parse(cls, name: str, content: str) -> "Section":
+        """Split section content into entries; see render_entries for the inverse."""
+        entries = parse_entries(content)
+        return cls(name, entries, None if render_entries(entries) == content else content)
+
+    @property
+    def text(self) -> str:
+        """Section content as text."""
+        return self.raw if self.raw is not None else render_entries(self.entries)
+
+
+@dataclass(slots=True)
+class ContactInfo:
+    """Contact details found at the top of the original resume."""
+    name: str = ""
+    email: str = ""
+    phone: str = ""
+    links: List[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Scores:
+    """Quality scores (0-100) per criterion."""
+    values: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def overall(self) -> Optional[float]:
+        """Average score, or None when nothing was scored."""
+        return round(sum(self.values.values()) / len(self.values), 1) if self.values else None
+
+
+@dataclass(slots=True)
+class Resume:
+    """
+    A resume and what was learned about it.
+
+    Attributes:
+        sections: Sections with content, in config.RESUME_SECTIONS order
+        corrections: Changes made by an enhancement
+        contact: Contact details from the original text
+        scores: Quality scores
+        summary: Professional summary
+        source: File name or path it came from
+    """
+    sections: List[Section] = field(default_factory=list)
+    corrections: List[str] = field(default_factory=list)
+    contact: ContactInfo = field(default_factory=ContactInfo)
+    scores: Scores = field(default_factory=Scores)
+    summary: str = ""
+    source: str = ""
+
+    @classmethod
+    def from_sections(cls, sections: Dict[str, str], corrections: Iterable[str] = (), **fields: Any) -> "Resume":
+        """
+        Build a resume from a sections dict as returned by enhance_resume.
+
+        Args:
+            sections: Section name mapped to content (NO_DATA where absent)
+            corrections: Corrections list
+            **fields: contact, scores, summary or source
+
+        Returns:
+            Resume: Sections with content, in config.RESUME_SECTIONS order
+        """
+        order = {name: index for index, name in enumerate(config.RESUME_SECTIONS)}
+        names = sorted((name for name, content in sections.items() if content != NO_DATA),
+                       key=lambda name: order.get(name, len(order)))
+        return cls([Section.parse(name, sections[name]) for name in names], list(corrections), **fields)
+
+    def section(self, name: str) -> Optional[Section]:
+        """Return the named section, or None if the resume has none."""
+        return next((section for section in self.sections if section.name == name), None)
+
+    def sections_dict(self) -> Dict[str, str]:
+        """Sections in the dict form used by resume_ai (NO_DATA where absent)."""
+        sections = {name: NO_DATA for name in config.RESUME_SECTIONS}
+        sections.update((section.name, section.text) for section in self.sections)
+        return sections
+
+    def pack(self) -> bytes:
+        """Serialize to compact bytes (see unpack)."""
+        body = _to_arrays(self)
+        packer = _msgpack()
+        if packer is not None:
+            return _MSGPACK + zlib.compress(packer.packb(body, use_bin_type=True), 1)
+        return _JSON + zlib.compress(json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 1)
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "Resume":
+        """
+        Deserialize bytes produced by pack().
+
+        Raises:
+            ValueError: If the data is not a packed resume, or was packed with
+                msgpack and msgpack is not installed
+        """
+        header, body = bytes(data[:1]), zlib.decompress(data[1:])
+        if header == _JSON:
+            return _from_arrays(json.loads(body))
+        if header == _MSGPACK:
+            unpacker = _msgpack()
+            if unpacker is None:
+                raise ValueError("This resume was packed with msgpack, which is not installed")
+            return _from_arrays(unpacker.unpackb(body, raw=False))
+        raise ValueError("Not a packed resume")
+
+
+# --- Parsing ---
+
+def parse_entries(content: str) -> List[Entry]:
+    """
+    Split section content into entries.
+
+    A new entry starts after a blank line, and at a plain line that follows
+    a bullet. The first line of an entry is its heading unless it is itself
+    a bullet.
+    """
+    entries: List[Entry] = []
+    gap = False
+    for line in content.split("\n"):
+        if not line.strip():
+            gap = True
+            continue
+        match = _MARKER.match(line)
+        marker = match.group(0) if match else ""
+        text = line[len(marker):]
+        current = entries[-1] if entries else None
+        if current is None or gap or (not marker and current.bullets and current.bullets[-1].marker):
+            entries.append(Entry(heading="" if marker else text, gap=gap and current is not None))
+            if marker:
+                entries[-1].bullets.append(Bullet(text, marker))
+        else:
+            current.bullets.append(Bullet(text, marker))
+        gap = False
+    return entries
+
+
+def render_entries(entries: List[Entry]) -> str:
+    """Join entries back into section text."""
+    lines: List[str] = []
+    for entry in entries:
+        if entry.gap:
+            lines.append("")
+        if entry.heading:
+            lines.append(entry.heading)
+        lines.extend(bullet.marker + bullet.text for bullet in entry.bullets)
+    return "\n".join(lines)
+
+
+def parse_contact(text: str) -> ContactInfo:
+    """
+    Find contact details in the first lines of a resume.
+
+    Args:
+        text: Original resume text
+
+    Returns:
+        ContactInfo: Name (a short line of words before any contact detail),
+            email, phone and profile links; missing fields are empty
+    """
+    lines = [line.strip() for line in text.splitlines() if line.strip()][:10]
+    head = "\n".join(lines)
+    email, phone = _EMAIL.search(head), _PHONE.search(head)
+    links = [link.rstrip(".,;)") for link in _LINK.findall(head)]
+    name = next((line for line in lines[:3] if _NAME.match(line) and not DEFAULT_MATCHER.match(line)), "")
+    return ContactInfo(name=name, email=email.group(0) if email else "",
+                       phone=phone.group(0).strip() if phone else "", links=links)
+
+
+def parse_resume(text: str, source: str = "") -> Resume:
+    """
+    Build the model for an extracted resume.
+
+    Args:
+        text: Extracted (normalized) resume text
+        source: File name or path it came from
+
+    Returns:
+        Resume: Sections and contact details; no corrections or scores yet
+    """
+    return Resume.from_sections(DEFAULT_MATCHER.parse(text, NO_DATA), contact=parse_contact(text), source=source)
+
+
+# --- Compact Serialization ---
+
+def _name_code(name: str, names: List[str]) -> Any:
+    """Index of a known name, or the name itself."""
+    return names.index(name) if name in names else name
+
+
+def _name(code: Any, names: List[str]) -> str:
+    return names[code] if isinstance(code, int) else code
+
+
+def _to_arrays(resume: Resume) -> List[Any]:
+    """Positional form of a resume; a section's raw text replaces its entries."""
+    sections = [
+        [_name_code(section.name, config.RESUME_SECTIONS),
+         section.raw if section.raw is not None else
+         [[entry.heading, entry.gap, [[bullet.marker, bullet.text] for bullet in entry.bullets]]
+          for entry in section.entries]]
+        for section in resume.sections
+    ]
+    contact = resume.contact
+    scores = [[_name_code(criterion, config.QUALITY_CRITERIA), score]
+              for criterion, score in resume.scores.values.items()]
+    return [MODEL_VERSION, resume.source, [contact.name, contact.email, contact.phone, contact.links],
+            sections, resume.corrections, scores, resume.summary]
+
+
+def _from_arrays(body: List[Any]) -> Resume:
+    version, source, contact, sections, corrections, scores, summary = body
+    if version != MODEL_VERSION:
+        raise ValueError(f"Unsupported resume model version: {version}")
+    parsed = []
+    for code, content in sections:
+        name = _name(code, config.RESUME_SECTIONS)
+        if isinstance(content, str):
+            parsed.append(Section(name, parse_entries(content), content))
+        else:
+            parsed.append(Section(name, [Entry(heading, [Bullet(text, marker) for marker, text in bullets], gap)
+                                         for heading, gap, bullets in content]))
+    return Resume(
+        sections=parsed,
+        corrections=list(corrections),
+        contact=ContactInfo(*contact[:3], links=list(contact[3])),
+        scores=Scores({_name(code, config.QUALITY_CRITERIA): score for code, score in scores}),
+        summary=summary,
+        source=source,
+    )
+
+
+# --- Columnar Export ---
+
+def score_column(criterion: str) -> str:
+    """Column name for a criterion, e.g. "score_grammar_spelling"."""
+    return "score_" + re.sub(r"[^a-z0-9]+", "_", criterion.lower()).strip("_")
+
+
+def arrow_schema() -> Any:
+    """Arrow schema of write_parquet rows (one column per configured criterion)."""
+    import pyarrow as pa
+
+    entry = pa.struct([("section", pa.string()), ("heading", pa.string()), ("bullets", pa.list_(pa.string()))])
+    return pa.schema(
+        [
+            ("source", pa.string()),
+            ("name", pa.string()),
+            ("email", pa.string()),
+            ("phone", pa.string()),
+            ("links", pa.list_(pa.string())),
+            ("sections", pa.list_(pa.string())),
+            ("entry_count", pa.int32()),
+            ("bullet_count", pa.int32()),
+            ("word_count", pa.int32()),
+            ("correction_count", pa.int32()),
+            ("overall_score", pa.float64()),
+        ]
+        + [(score_column(criterion), pa.int8()) for criterion in config.QUALITY_CRITERIA]
+        + [("summary", pa.string()), ("entries", pa.list_(entry))]
+    )
+
+
+def resume_row(resume: Resume) -> Dict[str, Any]:
+    """Flat row for one resume, matching arrow_schema()."""
+    entries = [entry for section in resume.sections for entry in section.entries]
+    row = {
+        "source": resume.source,
+        "name": resume.contact.name,
+        "email": resume.contact.email,
+        "phone": resume.contact.phone,
+        "links": resume.contact.links,
+        "sections": [section.name for section in resume.sections],
+        "entry_count": len(entries),
+        "bullet_count": sum(bullet.marker != "" for entry in entries for bullet in entry.bullets),
+        "word_count": sum(len(_WORD.findall(section.text)) for section in resume.sections),
+        "correction_count": len(resume.corrections),
+        "overall_score": resume.scores.overall,
+        "summary": resume.summary,
+        "entries": [
+            {"section": section.name, "heading": entry.heading, "bullets": [bullet.text for bullet in entry.bullets]}
+            for section in resume.sections for entry in section.entries
+        ],
+    }
+    for criterion in config.QUALITY_CRITERIA:
+        row[score_column(criterion)] = resume.scores.values.get(criterion)
+    return row
+
+
+def _batches(resumes: Iterable[Resume], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for resume in resumes:
+        batch.append(resume_row(resume))
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def to_arrow(resumes: Iterable[Resume]) -> Any:
+    """Arrow table with one row per resume (needs pyarrow)."""
+    import pyarrow as pa
+
+    return pa.Table.from_pylist([resume_row(resume) for resume in resumes], schema=arrow_schema())
+
+
+def write_parquet(resumes: Iterable[Resume], path: str, batch_size: int = 1000) -> int:
+    """
+    Stream resumes into a Parquet file, batch_size rows at a time.
+
+    Args:
+        resumes: Resumes to write (any iterable, consumed once)
+        path: Output file
+        batch_size: Rows held in memory per row group
+
+    Returns:
+        int: Rows written
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = arrow_schema()
+    rows = 0
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for batch in _batches(resumes, batch_size):
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            rows += len(batch)
+    return rows
+
+
+def from_record(record: Dict[str, Any]) -> Resume:
+    """Resume for one batch.py JSONL record."""
+    return Resume.from_sections(
+        record.get("sections") or {},
+        record.get("corrections") or [],
+        contact=ContactInfo(**record["contact"]) if record.get("contact") else ContactInfo(),
+        scores=Scores(record.get("scores") or {}),
+        summary=record.get("summary", ""),
+        source=record.get("file", ""),
+    )
+
+
+def read_records(path: str) -> Iterator[Resume]:
+    """Successful records of a batch.py JSONL file, as resumes."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                if record.get("status") == "ok":
+                    yield from_record(record)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point: export batch results to Parquet."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export batch.py results to Parquet")
+    parser.add_argument("command", choices=["export"])
+    parser.add_argument("input", help="JSONL file written by batch.py")
+    parser.add_argument("output", help="Parquet file to write")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+    try:
+        rows = write_parquet(read_records(args.input), args.output, args.batch_size)
+    except ImportError:
+        print("Parquet export needs pyarrow: pip install pyarrow", file=sys.stderr)
+        return 1
+    print(json.dumps({"rows": rows, "output": args.output}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
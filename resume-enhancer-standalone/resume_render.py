@@ -0,0 +1,249 @@
+"""
+Rendering of enhanced resume sections to LaTeX, Markdown, HTML and DOCX.
+Kept free of Streamlit so the batch CLI and benchmarks can render too.
+
+Documents are filled from templates compiled at import time. Inline
+**bold** markup is split out before escaping, so each format escapes plain
+text in a single table-driven pass and only then adds its own bold markup.
+"""
+
+import html
+import io
+import re
+from string import Template
+from typing import Callable, Dict, List, Union
+
+import config
+import metrics
+
+NO_DATA = "No relevant data found"
+
+# Sections rendered as a paragraph; every other section becomes a bullet list
+PARAGRAPH_SECTIONS = {"Objective", "Declaration"}
+
+_BOLD = re.compile(r"\*{2,3}(.+?)\*{2,3}")
+_BULLET = re.compile(r"^[*-][ \t]+", re.MULTILINE)
+
+# --- Escaping ---
+
+_LATEX_ESCAPES: Dict[str, str] = {
+    "\\": r"\textbackslash{}",
+    "&": r"\&", "%": r"\%", "$": r"\$", "#": r"\#", "_": r"\_",
+    "{": r"\{", "}": r"\}", "~": r"\textasciitilde{}", "^": r"\^{}",
+}
+# One scan over the text; the engine skips runs of ordinary characters in C,
+# which is several times faster than str.translate with multi-character values
+_LATEX_SPECIAL = re.compile("[" + re.escape("".join(_LATEX_ESCAPES)) + "]")
+
+
+def _latex_escape_match(match: "re.Match") -> str:
+    return _LATEX_ESCAPES[match.group()]
+
+
+def escape_latex(text: str) -> str:
+    """Escape special LaTeX characters in one pass."""
+    return _LATEX_SPECIAL.sub(_latex_escape_match, text)
+
+
+def render_inline(text: str, escape: Callable[[str], str], bold: str) -> str:
+    """
+    Escape text for a target format while keeping **bold** markup.
+
+    Args:
+        text: Plain text that may contain **bold** or ***bold*** spans
+        escape: Escaper for the target format
+        bold: Format string applied to each escaped bold span (e.g. "<b>{}</b>")
+
+    Returns:
+        str: Escaped text with bold spans converted
+    """
+    parts: List[str] = []
+    last = 0
+    for match in _BOLD.finditer(text):
+        parts.append(escape(text[last:match.start()]))
+        parts.append(bold.format(escape(match.group(1))))
+        last = match.end()
+    parts.append(escape(text[last:]))
+    return "".join(parts)
+
+
+def convert_bold_markdown_to_latex(text: str) -> str:
+    """Convert markdown bold syntax to LaTeX bold commands, escaping the rest."""
+    return render_inline(text, escape_latex, r"\textbf{{{}}}")
+
+
+def _clean_content(content: str) -> str:
+    """Section content as non-empty, stripped lines with list markers removed."""
+    return _BULLET.sub("", "\n".join(filter(None, map(str.strip, content.split("\n")))))
+
+
+def _filled_sections(sections: Dict[str, str]) -> List[tuple]:
+    """(name, content) for sections that have content, in config order."""
+    return [
+        (name, sections[name]) for name in config.RESUME_SECTIONS
+        if sections.get(name, "").strip() and sections[name] != NO_DATA
+    ]
+
+
+# --- Templates ---
+
+LATEX_DOCUMENT = Template(
+    "\\documentclass[11pt]{article}\n"
+    "\\usepackage[margin=0.75in]{geometry}\n"
+    "\\usepackage[utf8]{inputenc}\n"
+    "\\usepackage{enumitem}\n"
+    "\\usepackage{titlesec}\n"
+    "\\usepackage{hyperref}\n"
+    "\\titleformat{\\section}{\\large\\bfseries}{}{0em}{}\n"
+    "\\setlist[itemize]{leftmargin=*, itemsep=2pt}\n\n"
+    "\\title{\\textbf{$title}}\n"
+    "\\author{}\n"
+    "\\date{}\n\n"
+    "\\begin{document}\n"
+    "\\maketitle\n\n"
+    "$body"
+    "\\end{document}"
+)
+LATEX_LIST_SECTION = Template("\\section*{$title}\n\\begin{itemize}\n$items\n\\end{itemize}\n")
+LATEX_TEXT_SECTION = Template("\\section*{$title}\n$text\n")
+
+HTML_DOCUMENT = Template(
+    "<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n"
+    "<title>$title</title>\n"
+    "<style>body{font-family:Georgia,serif;max-width:48em;margin:2em auto;line-height:1.4}"
+    "h2{border-bottom:1px solid #ccc}</style>\n"
+    "</head>\n<body>\n<h1>$title</h1>\n$body</body>\n</html>\n"
+)
+HTML_LIST_SECTION = Template("<h2>$title</h2>\n<ul>\n$items\n</ul>\n")
+HTML_TEXT_SECTION = Template("<h2>$title</h2>\n<p>$text</p>\n")
+
+DOCUMENT_TITLE = "Enhanced Resume"
+
+
+# --- Renderers ---
+
+class Renderer:
+    """
+    One output format.
+
+    Attributes:
+        name: Registry key (e.g. "latex")
+        label: Human-readable name for download buttons
+        extension: File extension without the dot
+        mime: MIME type for downloads
+    """
+
+    name = ""
+    label = ""
+    extension = ""
+    mime = "text/plain"
+
+    def render(self, sections: Dict[str, str]) -> Union[str, bytes]:
+        raise NotImplementedError
+
+
+class LatexRenderer(Renderer):
+    name, label, extension, mime = "latex", "LaTeX", "tex", "text/plain"
+
+    def render(self, sections: Dict[str, str]) -> str:
+        blocks = []
+        for title, content in _filled_sections(sections):
+            # Bold spans never cross lines, so the whole section converts in one pass
+            text = convert_bold_markdown_to_latex(_clean_content(content))
+            if title in PARAGRAPH_SECTIONS:
+                blocks.append(LATEX_TEXT_SECTION.substitute(title=escape_latex(title), text=text))
+            else:
+                items = "  \\item " + text.replace("\n", "\n  \\item ")
+                blocks.append(LATEX_LIST_SECTION.substitute(title=escape_latex(title), items=items))
+        return LATEX_DOCUMENT.substitute(title=DOCUMENT_TITLE, body="".join(blocks))
+
+
+class MarkdownRenderer(Renderer):
+    name, label, extension, mime = "markdown", "Markdown", "md", "text/markdown"
+
+    def render(self, sections: Dict[str, str]) -> str:
+        parts = [f"# {DOCUMENT_TITLE}\n\n"]
+        parts.extend(f"## {title}\n\n{content}\n\n" for title, content in _filled_sections(sections))
+        return "".join(parts)
+
+
+class HtmlRenderer(Renderer):
+    name, label, extension, mime = "html", "HTML", "html", "text/html"
+
+    def render(self, sections: Dict[str, str]) -> str:
+        blocks = []
+        for title, content in _filled_sections(sections):
+            text = render_inline(_clean_content(content), html.escape, "<strong>{}</strong>")
+            if title in PARAGRAPH_SECTIONS:
+                blocks.append(HTML_TEXT_SECTION.substitute(title=html.escape(title), text=text.replace("\n", "<br>\n")))
+            else:
+                items = "<li>" + text.replace("\n", "</li>\n<li>") + "</li>"
+                blocks.append(HTML_LIST_SECTION.substitute(title=html.escape(title), items=items))
+        return HTML_DOCUMENT.substitute(title=DOCUMENT_TITLE, body="".join(blocks))
+
+
+class DocxRenderer(Renderer):
+    name, label, extension = "docx", "Word", "docx"
+    mime = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+    def render(self, sections: Dict[str, str]) -> bytes:
+        import docx  # python-docx; imported here so text formats don't pay for it
+
+        document = docx.Document()
+        document.add_heading(DOCUMENT_TITLE, level=0)
+        for title, content in _filled_sections(sections):
+            document.add_heading(title, level=1)
+            style = None if title in PARAGRAPH_SECTIONS else "List Bullet"
+            for line in _clean_content(content).split("\n"):
+                paragraph = document.add_paragraph(style=style)
+                last = 0
+                for match in _BOLD.finditer(line):
+                    paragraph.add_run(line[last:match.start()])
+                    paragraph.add_run(match.group(1)).bold = True
+                    last = match.end()
+                paragraph.add_run(line[last:])
+        buffer = io.BytesIO()
+        document.save(buffer)
+        return buffer.getvalue()
+
+
+RENDERERS: Dict[str, Renderer] = {}
+
+
+def register_renderer(renderer: Renderer) -> Renderer:
+    """Add or replace an output format in the registry."""
+    RENDERERS[renderer.name] = renderer
+    return renderer
+
+
+for _renderer in (LatexRenderer(), MarkdownRenderer(), HtmlRenderer(), DocxRenderer()):
+    register_renderer(_renderer)
+
+
+def render(sections: Dict[str, str], fmt: str) -> Union[str, bytes]:
+    """
+    Render sections in a registered format.
+
+    Args:
+        sections: Section name mapped to content
+        fmt: Registry key ("latex", "markdown", "html", "docx", ...)
+
+    Returns:
+        str or bytes: The document (bytes for binary formats such as DOCX)
+
+    Raises:
+        KeyError: If the format is not registered
+    """
+    renderer = RENDERERS[fmt]
+    with metrics.timed(f"render_{fmt}"):
+        return renderer.render(sections)
+
+
+def generate_latex(sections: Dict[str, str]) -> str:
+    """Generate LaTeX document from sections."""
+    return render(sections, "latex")
+
+
+def generate_markdown(sections: Dict[str, str]) -> str:
+    """Generate Markdown document from sections."""
+    return render(sections, "markdown")
@@ -1,20 +1,25 @@
 """
 Utility functions for extracting text from resume files.
-Supports PDF and DOCX formats.
+Supports PDF and DOCX formats. Free of Streamlit, so the batch CLI and job
+workers can use it; UI callers pass an error callback such as st.error.
 """
 
-import fitz  # PyMuPDF
-import docx
-from typing import BinaryIO, Optional
-import streamlit as st
+import hashlib
+from typing import BinaryIO, Callable, Optional
+import metrics
+from docx_extract import extract_docx_text
+from pdf_extract import EMPTY_PDF_MESSAGE, extract_pdf_text
 
 
-def extract_text_from_pdf(file: BinaryIO) -> str:
+@metrics.instrument("extract_pdf")
+def extract_text_from_pdf(file: BinaryIO, workers: Optional[int] = None) -> str:
     """
-    Extract text content from a PDF file.
+    Extract text content from a PDF file, falling back to OCR for scanned
+    PDFs when Tesseract is available (see ocr.py).
     
     Args:
         file: Binary file object (PDF)
+        workers: Worker processes for large PDFs and OCR (default from config; 1 = sequential)
         
     Returns:
         str: Extracted text content
@@ -22,21 +27,22 @@ def extract_text_from_pdf(file: BinaryIO) -> str:
     Raises:
         Exception: If PDF extraction fails
     """
+    data = file.read()
     try:
-        doc = fitz.open(stream=file.read(), filetype="pdf")
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        doc.close()
-        
-        if not text.strip():
-            raise ValueError("PDF appears to be empty or contains only images")
-            
-        return text.strip()
+        try:
+            return extract_pdf_text(data, workers=workers)
+        except ValueError as e:
+            if str(e) != EMPTY_PDF_MESSAGE:
+                raise
+        # Image-only (scanned) PDF: fall back to OCR
+        from ocr import ocr_pdf_text
+
+        return ocr_pdf_text(data, workers=workers)
     except Exception as e:
         raise Exception(f"Failed to extract text from PDF: {str(e)}")
 
 
+@metrics.instrument("extract_docx")
 def extract_text_from_docx(file: BinaryIO) -> str:
     """
     Extract text content from a DOCX file.
@@ -51,8 +57,7 @@ def extract_text_from_docx(file: BinaryIO) -> str:
         Exception: If DOCX extraction fails
     """
     try:
-        doc = docx.Document(file)
-        text = "\n".join([para.text for para in doc.paragraphs])
+        text = extract_docx_text(file)
         
         if not text.strip():
             raise ValueError("DOCX appears to be empty")
@@ -85,27 +90,71 @@ def validate_file_size(file: BinaryIO, max_size_bytes: int) -> tuple[bool, str]:
     return True, ""
 
 
-def extract_resume_text(file: BinaryIO, filename: str) -> Optional[str]:
+def file_digest(file: BinaryIO, chunk_size: int = 1 << 20) -> str:
     """
-    Extract text from resume file with error handling.
+    Hash file contents for upload deduplication.
+    
+    Args:
+        file: Binary file object; its position is reset afterwards
+        chunk_size: Bytes hashed per read
+        
+    Returns:
+        str: Hex SHA-256 digest of the contents
+    """
+    file.seek(0)
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: file.read(chunk_size), b""):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def extract_text(file: BinaryIO, filename: str) -> str:
+    """
+    Extract text from a resume file, choosing the extractor by extension.
     
     Args:
         file: Binary file object
         filename: Name of the file
         
     Returns:
-        str: Extracted text, or None if extraction fails
+        str: Extracted text content
+        
+    Raises:
+        ValueError: If the format is not supported
+        Exception: If extraction fails
     """
     ext = filename.split('.')[-1].lower()
+    if ext == "pdf":
+        return extract_text_from_pdf(file)
+    elif ext == "docx":
+        return extract_text_from_docx(file)
+    raise ValueError(f"Unsupported file format: {ext}")
+
+
+def extract_resume_text(
+    file: BinaryIO,
+    filename: str,
+    on_error: Optional[Callable[[str], None]] = None,
+) -> Optional[str]:
+    """
+    Extract text from resume file with error handling.
     
+    Args:
+        file: Binary file object
+        filename: Name of the file
+        on_error: Called with a user-facing message when extraction fails
+            (e.g. st.error)
+        
+    Returns:
+        str: Extracted text, or None if extraction fails
+    """
     try:
-        if ext == "pdf":
-            return extract_text_from_pdf(file)
-        elif ext == "docx":
-            return extract_text_from_docx(file)
-        else:
-            st.error(f"Unsupported file format: {ext}")
-            return None
+        return extract_text(file, filename)
+    except ValueError as e:
+        message = str(e)
     except Exception as e:
-        st.error(f"Error extracting text: {str(e)}")
-        return None
+        message = f"Error extracting text: {str(e)}"
+    if on_error:
+        on_error(message)
+    return None
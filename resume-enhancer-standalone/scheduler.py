@@ -0,0 +1,316 @@
+"""
+Fair scheduling of Gemini requests between tenants.
+Every request made through llm_client waits here for one of the client's
+in-flight slots. Waiting requests are served interactive lane first, and
+round-robin between tenants within a lane, so one tenant's bulk run cannot
+starve other users. A few slots are kept for interactive requests only, so
+they never wait behind a full set of batch requests. Requests that cannot
+start before their deadline are dropped instead of being served late.
+
+The tenant, lane and deadline come from the caller's context (a contextvar,
+like metrics stages), so the Gemini helpers need no extra arguments:
+
+    with request_context(tenant=session_id, lane=INTERACTIVE, on_wait=show_position):
+        resume_ai.enhance_resume(text)
+
+Work whose priority can change while it runs (a prefetched job someone has
+just asked for) passes a lane_source instead, which is asked for the lane as
+each request starts and while it waits.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+
+import metrics
+
+INTERACTIVE, BATCH = "interactive", "batch"
+LANES = (INTERACTIVE, BATCH)
+DEFAULT_TENANT = "default"
+
+
+class RequestDropped(RuntimeError):
+    """Raised when a request is still queued at its deadline."""
+
+
+@dataclass
+class RequestContext:
+    """
+    Who a request is for and how long it may wait.
+
+    Attributes:
+        tenant: Fairness key (a browser session, a batch run)
+        lane: INTERACTIVE or BATCH
+        deadline: time.monotonic() after which a queued request is dropped
+            (None: the lane's default wait limit applies)
+        on_wait: Called with the request's queue position while it waits
+        lane_source: Returns the lane to use instead of lane; may raise to
+            abandon the request before it starts
+    """
+    tenant: str = DEFAULT_TENANT
+    lane: str = INTERACTIVE
+    deadline: Optional[float] = None
+    on_wait: Optional[Callable[[int], None]] = None
+    lane_source: Optional[Callable[[], str]] = None
+
+    def current_lane(self) -> str:
+        """The lane for a request starting now."""
+        lane = self.lane_source() if self.lane_source else self.lane
+        if lane not in LANES:
+            raise ValueError(f"Unknown lane: {lane}")
+        return lane
+
+
+_context: contextvars.ContextVar = contextvars.ContextVar("llm_request", default=RequestContext())
+
+
+def current_request() -> RequestContext:
+    """Request context of this thread or task."""
+    return _context.get()
+
+
+@contextlib.contextmanager
+def request_context(**fields: Any) -> Iterator[RequestContext]:
+    """Set tenant, lane, deadline or on_wait for Gemini requests made inside the block."""
+    if fields.get("lane", INTERACTIVE) not in LANES:
+        raise ValueError(f"Unknown lane: {fields['lane']}")
+    context = RequestContext(**fields)
+    token = _context.set(context)
+    try:
+        yield context
+    finally:
+        _context.reset(token)
+
+
+def propagate(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap fn to run in (a copy of) the caller's context, for thread pools:
+    worker threads do not inherit contextvars the way asyncio tasks do.
+    """
+    context = contextvars.copy_context()
+    return lambda *args: context.copy().run(fn, *args)
+
+
+class _Ticket:
+    """One waiting request."""
+
+    __slots__ = ("tenant", "lane", "deadline", "granted", "dropped", "event", "queued")
+
+    def __init__(self, tenant: str, lane: str, deadline: Optional[float]) -> None:
+        self.tenant = tenant
+        self.lane = lane
+        self.deadline = deadline
+        self.granted = False
+        self.dropped = False
+        self.event = threading.Event()
+        self.queued = time.monotonic()
+
+
+class FairScheduler:
+    """
+    In-flight slots granted by lane priority and per-tenant round-robin.
+
+    Args:
+        capacity: Requests in flight at once
+        interactive_reserved: Slots batch requests may never take
+        fair: False serves all requests in arrival order (for comparison)
+        max_wait: Seconds a request may wait per lane (0 or missing = no limit)
+    """
+
+    def __init__(self, capacity: int, interactive_reserved: int = 0, fair: bool = True,
+                 max_wait: Optional[Dict[str, float]] = None) -> None:
+        self.capacity = max(1, capacity)
+        self.batch_capacity = max(1, self.capacity - max(0, interactive_reserved))
+        self.fair = fair
+        self.max_wait = max_wait or {}
+        self._queues: Dict[str, "OrderedDict[str, Deque[_Ticket]]"] = {lane: OrderedDict() for lane in LANES}
+        self._in_flight = {lane: 0 for lane in LANES}
+        self._lock = threading.Lock()
+
+    # --- Queue bookkeeping (callers hold the lock) ---
+
+    def _key(self, ticket: _Ticket) -> tuple:
+        """Lane and tenant queue a ticket waits in (a single FIFO when not fair)."""
+        return (ticket.lane, ticket.tenant) if self.fair else (INTERACTIVE, DEFAULT_TENANT)
+
+    def _remove(self, ticket: _Ticket) -> None:
+        lane, tenant = self._key(ticket)
+        queue = self._queues[lane].get(tenant)
+        if queue is not None and ticket in queue:
+            queue.remove(ticket)
+            if not queue:
+                del self._queues[lane][tenant]
+
+    def _next(self, lane: str) -> Optional[_Ticket]:
+        """Pop the next live ticket of a lane, rotating its tenant to the back."""
+        tenants = self._queues[lane]
+        now = time.monotonic()
+        while tenants:
+            tenant, queue = next(iter(tenants.items()))
+            ticket = queue.popleft()
+            del tenants[tenant]
+            if queue:
+                tenants[tenant] = queue
+            if ticket.deadline is not None and now > ticket.deadline:
+                ticket.dropped = True
+                ticket.event.set()
+                continue
+            return ticket
+        return None
+
+    def _dispatch(self) -> None:
+        """Grant free slots to waiting tickets."""
+        while sum(self._in_flight.values()) < self.capacity:
+            ticket = self._next(INTERACTIVE)
+            if ticket is None and self._in_flight[BATCH] < self.batch_capacity:
+                ticket = self._next(BATCH)
+            if ticket is None:
+                return
+            ticket.granted = True
+            self._in_flight[ticket.lane] += 1
+            metrics.LLM_QUEUE_SECONDS.observe(time.monotonic() - ticket.queued, lane=ticket.lane)
+            ticket.event.set()
+
+    def _position(self, ticket: _Ticket) -> int:
+        """1-based position: requests that will start before this one, plus one."""
+        lane, tenant = self._key(ticket)
+        own = self._queues[lane].get(tenant)
+        if own is None or ticket not in own:
+            return 0
+        index = own.index(ticket)
+        # Round-robin serves up to index + 1 requests of every tenant in the lane first
+        ahead = sum(min(len(queue), index + 1) for name, queue in self._queues[lane].items() if name != tenant)
+        if lane == BATCH:
+            ahead += sum(len(queue) for queue in self._queues[INTERACTIVE].values())
+        return ahead + index + 1
+
+    # --- Public API ---
+
+    def _enter(self, context: RequestContext) -> _Ticket:
+        lane = context.current_lane()
+        wait = self.max_wait.get(lane, 0)
+        deadline = context.deadline
+        if wait:
+            deadline = min(deadline, time.monotonic() + wait) if deadline else time.monotonic() + wait
+        with self._lock:
+            ticket = _Ticket(context.tenant, lane, deadline)
+            lane, tenant = self._key(ticket)
+            self._queues[lane].setdefault(tenant, deque()).append(ticket)
+            self._dispatch()
+        return ticket
+
+    def _check(self, ticket: _Ticket) -> bool:
+        """True once granted; raises RequestDropped past the deadline."""
+        with self._lock:
+            if not ticket.granted and not ticket.dropped and ticket.deadline is not None \
+                    and time.monotonic() > ticket.deadline:
+                self._remove(ticket)
+                ticket.dropped = True
+            if ticket.dropped:
+                metrics.LLM_DROPPED.inc(lane=ticket.lane)
+                raise RequestDropped("Gemini is busy and this request could not start in time, please try again")
+            return ticket.granted
+
+    def _report(self, ticket: _Ticket, context: RequestContext, last: int) -> int:
+        if context.on_wait is None:
+            return last
+        with self._lock:
+            position = self._position(ticket)
+        if position and position != last:
+            context.on_wait(position)
+        return position
+
+    def _follow(self, ticket: _Ticket, context: RequestContext) -> None:
+        """Move a waiting ticket to the lane its context's lane_source now returns."""
+        if context.lane_source is None:
+            return
+        lane = context.current_lane()
+        with self._lock:
+            if ticket.granted or ticket.dropped or lane == ticket.lane:
+                return
+            self._remove(ticket)
+            ticket.lane = lane
+            queue_lane, tenant = self._key(ticket)
+            self._queues[queue_lane].setdefault(tenant, deque()).append(ticket)
+            self._dispatch()
+
+    def _abandon(self, ticket: _Ticket) -> None:
+        """Undo a wait that ended in an exception: leave the queue, or give back a granted slot."""
+        with self._lock:
+            if ticket.granted:
+                self._in_flight[ticket.lane] = max(0, self._in_flight[ticket.lane] - 1)
+                self._dispatch()
+            else:
+                self._remove(ticket)
+
+    def acquire(self) -> str:
+        """
+        Block until this context's request may start.
+
+        Returns:
+            str: The lane the slot was taken in (pass it to release())
+        """
+        context = current_request()
+        ticket = self._enter(context)
+        position = 0
+        try:
+            while not self._check(ticket):
+                self._follow(ticket, context)
+                position = self._report(ticket, context, position)
+                timeout = 0.5 if ticket.deadline is None else max(0.0, min(0.5, ticket.deadline - time.monotonic()))
+                ticket.event.wait(timeout)
+        except BaseException:
+            # on_wait raised, or the thread was interrupted: no slot may stay taken
+            self._abandon(ticket)
+            raise
+        return ticket.lane
+
+    async def acquire_async(self) -> str:
+        """Wait without blocking the event loop until this context's request may start; returns its lane."""
+        context = current_request()
+        ticket = self._enter(context)
+        position, delay = 0, 0.005
+        try:
+            while not self._check(ticket):
+                self._follow(ticket, context)
+                position = self._report(ticket, context, position)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.1)
+        except BaseException:
+            # Cancelled while queued, or after the slot was granted but before we saw it
+            self._abandon(ticket)
+            raise
+        return ticket.lane
+
+    def release(self, lane: Optional[str] = None) -> None:
+        """Return the slot taken by acquire(); lane is what acquire() returned (default: the context's lane)."""
+        with self._lock:
+            lane = lane or current_request().lane
+            self._in_flight[lane] = max(0, self._in_flight[lane] - 1)
+            self._dispatch()
+
+    @contextlib.contextmanager
+    def slot(self) -> Iterator[None]:
+        """acquire() and release() around a block."""
+        lane = self.acquire()
+        try:
+            yield
+        finally:
+            self.release(lane)
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Queued and in-flight requests per lane, and waiting tenants."""
+        with self._lock:
+            return {
+                lane: {
+                    "queued": sum(len(queue) for queue in self._queues[lane].values()),
+                    "tenants": len(self._queues[lane]),
+                    "in_flight": self._in_flight[lane],
+                }
+                for lane in LANES
+            }
@@ -0,0 +1,156 @@
+"""
+Section heading detection for resume text.
+All headings from config.RESUME_SECTIONS and config.SECTION_ALIASES are
+compiled once into a single anchored regex, so a whole document is classified
+in one pass and body lines that merely mention "skills" or "experience" are
+not mistaken for headings.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import config
+
+# Decoration allowed around a heading: markdown markers and numbering. Dash and
+# bullet prefixes are not, since "- Activities" is more likely a list item.
+_LEAD = r"[ \t]*(?:[#>*_]+[ \t]*|\d{1,2}[.)][ \t]*)*"
+_TRAIL = r"[ \t]*[*_#]*[ \t]*"
+
+
+@dataclass
+class SectionSpan:
+    """One heading occurrence and the body that follows it."""
+    name: str
+    heading_start: int
+    start: int
+    end: int
+    content: str
+
+
+def _key(heading: str) -> str:
+    return " ".join(heading.lower().split())
+
+
+def _trie_pattern(keys: Iterable[str]) -> str:
+    """
+    Compile headings into a regex alternation factored by common prefix, so
+    the engine walks a trie instead of retrying every heading at each line.
+    """
+    trie: Dict[str, Dict] = {}
+    for key in keys:
+        node = trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Dict]) -> str:
+        branches = []
+        for char in sorted(node, key=lambda c: c == ""):  # longest match first
+            if char == "":
+                branches.append("")
+                continue
+            atom = r"[ \t]+" if char == " " else re.escape(char)
+            branches.append(atom + build(node[char]))
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return build(trie)
+
+
+class SectionMatcher:
+    """
+    Compiled heading matcher for a set of canonical sections and their aliases.
+
+    A line is a heading when, ignoring markdown decoration, numbering and case, it
+    consists of a known heading alone or a heading followed by a colon and
+    inline content (e.g. "Skills: Python, SQL").
+
+    Args:
+        sections: Canonical section names
+        aliases: Canonical name mapped to alternative headings
+    """
+
+    def __init__(self, sections: Iterable[str], aliases: Optional[Dict[str, List[str]]] = None) -> None:
+        self.sections = list(sections)
+        self._canonical: Dict[str, str] = {}
+        for name in self.sections:
+            for heading in [name] + list((aliases or {}).get(name, [])):
+                self._canonical.setdefault(_key(heading), name)
+        heading = (
+            rf"{_LEAD}(?P<name>{_trie_pattern(self._canonical)}){_TRAIL}"
+            rf"(?::[ \t]*[*_]*[ \t]*(?P<rest>[^\n]*?))?{_TRAIL}$"
+        )
+        self.pattern = re.compile("^" + heading, re.IGNORECASE | re.MULTILINE)
+        # Document scans start each match at a literal "\n", which lets the
+        # regex engine jump between line starts instead of testing every character
+        self._scan = re.compile(r"\n" + heading, re.IGNORECASE | re.MULTILINE)
+
+    def match(self, line: str) -> Optional[Tuple[str, str]]:
+        """
+        Classify one line.
+
+        Returns:
+            tuple: (canonical section, inline content after a colon) if the
+                line is a heading, otherwise None
+        """
+        m = self.pattern.match(line.strip())
+        if m is None:
+            return None
+        return self._canonical[_key(m.group("name"))], (m.group("rest") or "").strip()
+
+    def find(self, text: str) -> List[SectionSpan]:
+        """
+        Locate every heading in text and the body that follows it.
+
+        Args:
+            text: Resume text
+
+        Returns:
+            list: SectionSpan per heading, in document order. start/end delimit
+                the raw body; content is its non-empty lines, stripped, with
+                any inline content from the heading line first.
+        """
+        # Offsets in "\n" + text: a match's "\n" sits at the heading's own index
+        matches = list(self._scan.finditer("\n" + text))
+        spans = []
+        for index, m in enumerate(matches):
+            start = m.end() - 1
+            end = matches[index + 1].start() if index + 1 < len(matches) else len(text)
+            lines = [m.group("rest") or ""] + text[start:end].split("\n")
+            spans.append(SectionSpan(
+                name=self._canonical[_key(m.group("name"))],
+                heading_start=m.start(),
+                start=start,
+                end=end,
+                content="\n".join(filter(None, map(str.strip, lines))),
+            ))
+        return spans
+
+    def parse(self, text: str, empty: str) -> Dict[str, str]:
+        """
+        Collect section contents into a dict with every canonical section.
+
+        Repeated headings are concatenated; sections without content keep
+        the `empty` placeholder. Text before the first heading is ignored.
+        """
+        collected: Dict[str, List[str]] = {}
+        for span in self.find(text):
+            if span.content:
+                collected.setdefault(span.name, []).append(span.content)
+        return {name: "\n".join(collected[name]) if name in collected else empty
+                for name in self.sections}
+
+
+DEFAULT_MATCHER = SectionMatcher(config.RESUME_SECTIONS, config.SECTION_ALIASES)
+
+
+def match_heading(line: str) -> Optional[Tuple[str, str]]:
+    """Classify one line with the default matcher; see SectionMatcher.match."""
+    return DEFAULT_MATCHER.match(line)
+
+
+def find_sections(text: str) -> List[SectionSpan]:
+    """Locate headings with the default matcher; see SectionMatcher.find."""
+    return DEFAULT_MATCHER.find(text)
@@ -0,0 +1,163 @@
+"""
+Text normalization applied between extraction and any LLM call.
+Strips repeated per-page headers/footers and page numbers, joins hyphenated
+line breaks, unifies bullet glyphs and collapses whitespace, then fingerprints
+the canonical text so caches treat re-exports of the same resume as identical.
+"""
+
+import hashlib
+import math
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Set, Tuple
+
+# Page separator emitted by pdf_extract between pages
+PAGE_BREAK = "\f"
+
+# Lines at each end of a page that are checked for repeated boilerplate
+_BOILERPLATE_ZONE = 3
+
+_ZERO_WIDTH = dict.fromkeys(map(ord, "\u200b\u200c\u200d\u2060\ufeff"))
+_BULLET = re.compile(r"^[\u2022\u25cf\u25aa\u25a0\u25e6\u2023\u2043\u2013\u2014\u00b7\u27a2\u2713\u2714\u25ba\u25b8\u2219]\s*")
+_PAGE_NUMBER = re.compile(r"^(?:page\s*)?[-–(\[]?\s*\d+\s*(?:(?:of|/)\s*\d+)?\s*[-–)\]]?$", re.IGNORECASE)
+_HYPHEN_BREAK = re.compile(r"(\w)-\n([a-z])")
+_SPACES = re.compile(r"[ \t\u00a0\u2000-\u200a\u202f\u205f\u3000]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+@dataclass
+class NormalizedText:
+    """Canonical resume text plus what normalization removed."""
+    text: str
+    fingerprint: str
+    original_chars: int
+    boilerplate_lines: int
+
+    @property
+    def chars_saved(self) -> int:
+        return self.original_chars - len(self.text)
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, estimate_tokens_for_chars(self.original_chars) - estimate_tokens(self.text))
+
+
+def estimate_tokens_for_chars(chars: int) -> int:
+    """Rough Gemini token estimate for a character count (about 4 chars per token)."""
+    return math.ceil(chars / 4)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough Gemini token estimate for a text."""
+    return estimate_tokens_for_chars(len(text))
+
+
+def fingerprint(text: str) -> str:
+    """
+    Stable content fingerprint (session keys, match index ids, upload records).
+
+    Whitespace differences are ignored, so callers may pass either raw or
+    normalized text for the same resume.
+    """
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+def _boilerplate_key(line: str) -> str:
+    """Key for spotting repeated header/footer lines, ignoring page numbers."""
+    return re.sub(r"\d+", "#", " ".join(line.lower().split()))
+
+
+def _zone(lines: List[str]) -> List[int]:
+    """Indexes of the first and last few non-empty lines of a page."""
+    filled = [index for index, line in enumerate(lines) if line.strip()]
+    return sorted(set(filled[:_BOILERPLATE_ZONE] + filled[-_BOILERPLATE_ZONE:]))
+
+
+def _page_numbers(pages: List[List[str]], threshold: int) -> Set[Tuple[int, int]]:
+    """
+    (page, line index) of page numbers: number-only lines in the same header or
+    footer slot on at least threshold pages, counting up from page to page.
+    A year or phone number that happens to sit at the end of a page does not
+    repeat that way, so it is kept.
+    """
+    slots: Dict[Tuple[str, int], List[Tuple[int, int, int]]] = {}
+    for page, lines in enumerate(pages):
+        filled = [index for index, line in enumerate(lines) if line.strip()]
+        positions = [(("head", slot), index) for slot, index in enumerate(filled[:_BOILERPLATE_ZONE])]
+        positions += [(("tail", slot), index) for slot, index in enumerate(reversed(filled[-_BOILERPLATE_ZONE:]))]
+        for position, index in positions:
+            stripped = lines[index].strip()
+            if _PAGE_NUMBER.match(stripped):
+                number = int(re.search(r"\d+", stripped).group())
+                slots.setdefault(position, []).append((page, index, number))
+    found = set()
+    for entries in slots.values():
+        numbers = [number for _, _, number in entries]
+        if len(entries) >= threshold and all(a < b for a, b in zip(numbers, numbers[1:])):
+            found.update((page, index) for page, index, _ in entries)
+    return found
+
+
+def _strip_boilerplate(pages: List[List[str]]) -> int:
+    """
+    Remove page numbers and lines repeated in the header/footer zone of at
+    least half the pages, keeping the first copy of each repeated line (often
+    the candidate's name). Single pages are left alone. Mutates pages in place
+    and returns lines removed.
+    """
+    if len(pages) < 2:
+        return 0
+    zones = [_zone(lines) for lines in pages]
+    threshold = max(2, math.ceil(len(pages) / 2))
+    counts: Counter = Counter()
+    for lines, zone in zip(pages, zones):
+        counts.update({_boilerplate_key(lines[index]) for index in zone})
+    repeated = {key for key, count in counts.items() if count >= threshold}
+    numbers = _page_numbers(pages, threshold)
+
+    removed = 0
+    seen = set()
+    for page, (lines, zone) in enumerate(zip(pages, zones)):
+        for index in reversed(zone):
+            stripped = lines[index].strip()
+            key = _boilerplate_key(stripped)
+            if (page, index) in numbers or (key in repeated and key in seen):
+                del lines[index]
+                removed += 1
+        seen.update(key for key in (_boilerplate_key(line) for line in lines) if key in repeated)
+    return removed
+
+
+def normalize_resume_text(raw: str) -> NormalizedText:
+    """
+    Produce the canonical text sent to Gemini and used for cache keys.
+
+    Args:
+        raw: Extracted text; PDF pages separated by PAGE_BREAK
+
+    Returns:
+        NormalizedText: Canonical text, its fingerprint and savings stats
+    """
+    text = unicodedata.normalize("NFKC", raw).translate(_ZERO_WIDTH)
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    pages = [page.split("\n") for page in text.split(PAGE_BREAK)]
+    boilerplate = _strip_boilerplate(pages)
+
+    lines = []
+    for page in pages:
+        for line in page:
+            line = _SPACES.sub(" ", line).strip()
+            lines.append(_BULLET.sub("- ", line) if line else "")
+    text = "\n".join(lines)
+    text = _HYPHEN_BREAK.sub(r"\1\2", text)
+    text = _BLANK_LINES.sub("\n\n", text).strip()
+
+    return NormalizedText(
+        text=text,
+        fingerprint=fingerprint(text),
+        original_chars=len(raw),
+        boilerplate_lines=boilerplate,
+    )
@@ -0,0 +1,209 @@
+"""
+Content-addressed store of extracted resume text.
+Entries are keyed on a SHA-256 of the uploaded file's bytes, so reruns and
+duplicate uploads (in any session, replica or batch run) reuse the first
+extraction instead of parsing the file again. Each entry remembers how long
+that extraction took, which is what every later hit saves.
+
+Downstream Gemini results are already content-addressed by the extracted
+text (see response_cache.py and jobs.py), so a hit here also makes them a
+direct lookup.
+
+Usage:
+    python upload_store.py stats
+    python upload_store.py clear
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import config
+import metrics
+from text_normalize import NormalizedText
+
+
+def make_record(filename: str, normalized: NormalizedText, text: str, truncated: bool,
+                extract_seconds: float) -> Dict[str, Any]:
+    """
+    Build the stored form of one extraction.
+
+    Args:
+        filename: Original file name
+        normalized: Normalization result for the extracted text
+        text: Normalized text after the token budget
+        truncated: Whether the token budget cut the text
+        extract_seconds: Time spent extracting and normalizing
+
+    Returns:
+        dict: JSON-serializable record for UploadStore.put
+    """
+    return {
+        "filename": filename,
+        "text": text,
+        "truncated": truncated,
+        "normalization": {
+            "fingerprint": normalized.fingerprint,
+            "chars_saved": normalized.chars_saved,
+            "tokens_saved": normalized.tokens_saved,
+            "boilerplate_lines": normalized.boilerplate_lines,
+        },
+        "extract_seconds": round(extract_seconds, 4),
+    }
+
+
+class UploadStore:
+    """
+    SQLite table of extraction results per file hash, with TTL expiry.
+
+    Args:
+        path: Database file
+        ttl_seconds: Entries unused for this long are dropped (0 = keep forever)
+        max_entries: Least recently used entries beyond this are dropped (0 = no limit)
+    """
+
+    def __init__(self, path: str, ttl_seconds: int, max_entries: int = 0) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS uploads ("
+                " digest TEXT PRIMARY KEY,"
+                " filename TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " record TEXT NOT NULL,"
+                " extract_seconds REAL NOT NULL,"
+                " hits INTEGER NOT NULL DEFAULT 0,"
+                " seconds_saved REAL NOT NULL DEFAULT 0,"
+                " created REAL NOT NULL,"
+                " accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS uploads_accessed ON uploads (accessed)")
+            self._expire(conn, time.time())
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA cache_size=-{config.SQLITE_CACHE_KB}")
+            self._local.conn = conn
+        return conn
+
+    def _expire(self, conn: sqlite3.Connection, now: float) -> None:
+        """Delete entries unused for ttl_seconds (resume text should not outlive its TTL)."""
+        if self.ttl_seconds > 0:
+            conn.execute("DELETE FROM uploads WHERE accessed < ?", (now - self.ttl_seconds,))
+
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an earlier extraction of the same file.
+
+        A hit is counted, and credited with the original extraction time.
+        Entries past their TTL are misses, and are deleted on the way.
+
+        Returns:
+            dict: The stored record (filename, text, truncated, normalization,
+                extract_seconds), or None on a miss
+        """
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT record, extract_seconds, accessed FROM uploads WHERE digest = ?", (digest,)
+            ).fetchone()
+            if row is not None and self.ttl_seconds > 0 and row[2] < now - self.ttl_seconds:
+                conn.execute("DELETE FROM uploads WHERE digest = ?", (digest,))
+                row = None
+            if row is not None:
+                conn.execute(
+                    "UPDATE uploads SET hits = hits + 1, seconds_saved = seconds_saved + ?,"
+                    " accessed = ? WHERE digest = ?", (row[1], now, digest),
+                )
+        if row is None:
+            metrics.CACHE_LOOKUPS.inc(kind="upload", result="miss")
+            return None
+        metrics.CACHE_LOOKUPS.inc(kind="upload", result="hit")
+        metrics.EXTRACT_SECONDS_SAVED.inc(row[1])
+        return json.loads(row[0])
+
+    def put(self, digest: str, size: int, record: Dict[str, Any]) -> None:
+        """
+        Store an extraction result; record must include filename and extract_seconds.
+        Expired entries are dropped, then entries over max_entries, least
+        recently used first.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO uploads (digest, filename, size, record, extract_seconds,"
+                " created, accessed) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (digest, record["filename"], size, json.dumps(record), record["extract_seconds"], now, now),
+            )
+            self._expire(conn, now)
+            if self.max_entries > 0:
+                conn.execute(
+                    "DELETE FROM uploads WHERE digest IN ("
+                    " SELECT digest FROM uploads ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def clear(self) -> int:
+        """Remove every entry; returns the number removed."""
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM uploads").rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count, hit count and total extraction time saved by hits."""
+        with self._connect() as conn:
+            entries, size, hits, saved = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hits), 0),"
+                " COALESCE(SUM(seconds_saved), 0) FROM uploads"
+            ).fetchone()
+        return {
+            "path": self.path,
+            "entries": entries,
+            "upload_bytes": size,
+            "hits": hits,
+            "extract_seconds_saved": round(saved, 3),
+        }
+
+
+_store: Optional[UploadStore] = None
+_store_lock = threading.Lock()
+
+
+def get_upload_store() -> UploadStore:
+    """Return the process-wide upload store configured in config.py."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = UploadStore(config.UPLOAD_STORE_PATH, ttl_seconds=config.UPLOAD_STORE_TTL_SECONDS,
+                                 max_entries=config.UPLOAD_STORE_MAX_ENTRIES)
+        return _store
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Inspect or clear the configured upload store."""
+    args = sys.argv[1:] if argv is None else argv
+    command = args[0] if args else "stats"
+    store = get_upload_store()
+    if command == "stats":
+        print(json.dumps(store.stats(), indent=2))
+    elif command == "clear":
+        print(f"Removed {store.clear()} entries")
+    else:
+        print(f"Unknown command: {command} (expected 'stats' or 'clear')", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())